@@ -0,0 +1,234 @@
+"""
+Analytics Services for Workforce Management System
+Vectorized roster repricing for what-if rate simulations
+"""
+
+from typing import List, Dict, Any, Iterable, Optional
+import pandas as pd
+import numpy as np
+
+from pay_services import (
+    CENTS_PER_DOLLAR, HOLIDAY_DAY, MINUTES_PER_HOUR, SLEEPOVER_ALLOWANCE_CENTS, RateSchedule, rate_timeline, to_cents
+)
+from scheduling_services import MINUTES_PER_DAY
+
+# Roster fields needed to reprice an entry
+PRICING_FIELDS = [
+    "id", "date", "start_time", "end_time", "staff_id", "staff_name",
+    "is_sleepover", "is_public_holiday", "manual_shift_type", "manual_hourly_rate",
+    "manual_sleepover", "wake_hours", "total_pay", "total_pay_cents"
+]
+
+# Rate table keys in shift type code order
+SHIFT_TYPE_RATES = ["weekday_day", "weekday_evening", "weekday_night", "saturday", "sunday", "public_holiday"]
+SLEEPOVER_SHIFT_TYPE = "sleepover"
+
+
+def _time_minutes(times: pd.Series) -> np.ndarray:
+    """Minutes past midnight for a column of HH:MM strings"""
+    times = times.astype(str)
+    return times.str.slice(0, 2).astype(int).to_numpy() * 60 + times.str.slice(3, 5).astype(int).to_numpy()
+
+
+def _pay_cents(minutes: np.ndarray, rate_cents: np.ndarray) -> np.ndarray:
+    """Vectorized pay_cents: pay for whole minutes at hourly cent rates, rounded half up"""
+    return (minutes * rate_cents + MINUTES_PER_HOUR // 2) // MINUTES_PER_HOUR
+
+
+def _flag(frame: pd.DataFrame, column: str) -> np.ndarray:
+    return frame[column].fillna(False).astype(bool).to_numpy()
+
+
+def classify_shift_types(frame: pd.DataFrame) -> np.ndarray:
+    """Shift type codes (indexes into SHIFT_TYPE_RATES) for every roster row
+    
+    Same rules as determine_shift_type, evaluated for all rows at once; a
+    manual shift type overrides them and unknown manual types count as
+    weekday day shifts.
+    """
+    weekday = pd.to_datetime(frame["date"], format="%Y-%m-%d").dt.weekday.to_numpy()
+    start = _time_minutes(frame["start_time"])
+    end = _time_minutes(frame["end_time"])
+    end = np.where(end <= start, end + 24 * 60, end)
+    start_hour = start // 60
+    
+    automatic = np.select(
+        [
+            _flag(frame, "is_public_holiday"),
+            weekday == 5,
+            weekday == 6,
+            (start_hour < 6) | (end > 24 * 60),
+            (start_hour >= 20) | (end > 20 * 60),
+        ],
+        [5, 3, 4, 2, 1],
+        default=0
+    )
+    
+    manual = frame["manual_shift_type"].fillna("").astype(str)
+    manual_codes = manual.map({name: code for code, name in enumerate(SHIFT_TYPE_RATES)}).fillna(0).astype(int).to_numpy()
+    return np.where(manual.to_numpy() != "", manual_codes, automatic)
+
+
+def segmented_pay_cents(
+    frame: pd.DataFrame,
+    rates: Dict[str, float],
+    next_day_public_holiday: np.ndarray
+) -> np.ndarray:
+    """Vectorized segmented_base_pay: each part of every shift at the rate of its SCHADS band
+    
+    Shifts are split at midnight and each piece is costed band by band on
+    the day timelines of RateTimeline, then rounded to the cent once.
+    """
+    timeline = rate_timeline(rates)
+    weekday = pd.to_datetime(frame["date"], format="%Y-%m-%d").dt.weekday.to_numpy()
+    start = _time_minutes(frame["start_time"])
+    end = _time_minutes(frame["end_time"])
+    end = np.where(end <= start, end + MINUTES_PER_DAY, end)
+    
+    pieces = [
+        (np.where(_flag(frame, "is_public_holiday"), HOLIDAY_DAY, weekday), start, np.minimum(end, MINUTES_PER_DAY)),
+        (np.where(next_day_public_holiday, HOLIDAY_DAY, (weekday + 1) % 7), 0, end - MINUTES_PER_DAY),
+    ]
+    cost = np.zeros(len(frame), dtype=np.int64)
+    for day_codes, piece_start, piece_end in pieces:
+        for day, boundaries in enumerate(timeline.boundaries):
+            on_day = day_codes == day
+            band_ends = boundaries[1:] + [MINUTES_PER_DAY]
+            for band_start, band_end, rate_cents in zip(boundaries, band_ends, timeline.rates[day]):
+                overlap = np.minimum(piece_end, band_end) - np.maximum(piece_start, band_start)
+                cost += np.where(on_day, np.maximum(overlap, 0), 0) * rate_cents
+    return _pay_cents(cost, 1)
+
+
+def reprice_roster(
+    frame: pd.DataFrame,
+    rates: Dict[str, float],
+    segmented: bool = False,
+    holiday_dates: Iterable[str] = ()
+) -> pd.DataFrame:
+    """Price every roster row against a rate table, mirroring calculate_pay
+    
+    With ``segmented`` (SCHADS pay mode) ordinary shifts without manual
+    overrides are split across rate bands; ``holiday_dates`` tells overnight
+    shifts whether they run into a public holiday.
+    Returns the shift type label and simulated pay in integer cents per row.
+    """
+    codes = classify_shift_types(frame)
+    rate_table = np.array([to_cents(rates[name]) for name in SHIFT_TYPE_RATES], dtype=np.int64)
+    
+    manual_rate = pd.to_numeric(frame["manual_hourly_rate"], errors="coerce").fillna(0).to_numpy()
+    manual_rate = np.round(manual_rate * CENTS_PER_DOLLAR).astype(np.int64)
+    hourly_rate = np.where(manual_rate > 0, manual_rate, rate_table[codes])
+    
+    start = _time_minutes(frame["start_time"])
+    end = _time_minutes(frame["end_time"])
+    minutes = (np.where(end <= start, end + 24 * 60, end) - start).astype(np.int64)
+    
+    sleepover = np.where(
+        frame["manual_sleepover"].notna().to_numpy(),
+        _flag(frame, "manual_sleepover"),
+        _flag(frame, "is_sleepover")
+    )
+    wake_hours = pd.to_numeric(frame["wake_hours"], errors="coerce").fillna(0).to_numpy()
+    extra_wake_minutes = np.maximum(np.round(wake_hours * MINUTES_PER_HOUR).astype(np.int64) - 2 * MINUTES_PER_HOUR, 0)
+    
+    ordinary_pay = _pay_cents(minutes, hourly_rate)
+    if segmented:
+        next_day = (pd.to_datetime(frame["date"], format="%Y-%m-%d") + pd.Timedelta(days=1)).dt.strftime("%Y-%m-%d")
+        banded = (manual_rate <= 0) & (frame["manual_shift_type"].fillna("").astype(str).to_numpy() == "")
+        ordinary_pay = np.where(
+            banded,
+            segmented_pay_cents(frame, rates, next_day.isin(set(holiday_dates)).to_numpy()),
+            ordinary_pay
+        )
+    
+    pay = np.where(
+        sleepover,
+        SLEEPOVER_ALLOWANCE_CENTS + _pay_cents(extra_wake_minutes, hourly_rate),
+        ordinary_pay
+    )
+    labels = np.array(SHIFT_TYPE_RATES, dtype=object)[codes]
+    labels = np.where(sleepover, SLEEPOVER_SHIFT_TYPE, labels)
+    return pd.DataFrame({"shift_type": labels, "simulated_pay": pay}, index=frame.index)
+
+
+def _delta_rows(frame: pd.DataFrame, key: str) -> List[Dict[str, Any]]:
+    grouped = frame.groupby(key, sort=True).agg(
+        shifts=("current_pay", "size"),
+        current_pay=("current_pay", "sum"),
+        simulated_pay=("simulated_pay", "sum")
+    )
+    grouped["delta"] = grouped["simulated_pay"] - grouped["current_pay"]
+    grouped[["current_pay", "simulated_pay", "delta"]] /= CENTS_PER_DOLLAR
+    return grouped.reset_index().to_dict("records")
+
+
+def reprice_rate_versions(
+    frame: pd.DataFrame,
+    rate_schedule: RateSchedule,
+    rates: Dict[str, float],
+    segmented: bool = False,
+    holiday_dates: Iterable[str] = ()
+) -> pd.DataFrame:
+    """reprice_roster with each row's rate table version overlaid with ``rates``"""
+    versions = np.searchsorted(
+        np.array(rate_schedule.effective_dates, dtype=object), frame["date"].astype(str).to_numpy(), side="right"
+    )
+    return pd.concat([
+        reprice_roster(frame[versions == version], {**rate_schedule.rate_tables[version], **rates}, segmented, holiday_dates)
+        for version in np.unique(versions)
+    ]).reindex(frame.index)
+
+
+def simulate_rate_change(
+    entries: Iterable[Dict[str, Any]],
+    rates: Dict[str, float],
+    segmented: bool = False,
+    holiday_dates: Iterable[str] = (),
+    rate_schedule: Optional[RateSchedule] = None
+) -> Dict[str, Any]:
+    """Compare stored roster pay with pay under a candidate rate table
+    
+    Nothing is written; deltas are broken down per staff member, shift type
+    and month. ``segmented`` and ``holiday_dates`` are as for reprice_roster.
+    With a ``rate_schedule``, ``rates`` only overrides the table version in
+    force on each entry's date; without one it is the whole table.
+    """
+    frame = pd.DataFrame.from_records(list(entries), columns=PRICING_FIELDS)
+    if frame.empty:
+        return {
+            "entries": 0, "current_pay": 0.0, "simulated_pay": 0.0, "delta": 0.0, "delta_percent": None,
+            "by_staff": [], "by_shift_type": [], "by_month": []
+        }
+    
+    if rate_schedule is None:
+        frame = frame.join(reprice_roster(frame, rates, segmented, holiday_dates))
+    else:
+        frame = frame.join(reprice_rate_versions(frame, rate_schedule, rates, segmented, holiday_dates))
+    # Stored cents, or the dollar total of entries priced before cents were kept
+    stored_dollars = pd.to_numeric(frame["total_pay"], errors="coerce").fillna(0.0)
+    frame["current_pay"] = pd.to_numeric(frame["total_pay_cents"], errors="coerce").fillna(
+        np.round(stored_dollars * CENTS_PER_DOLLAR)
+    ).astype(np.int64)
+    frame["month"] = frame["date"].astype(str).str.slice(0, 7)
+    frame["staff_id"] = frame["staff_id"].fillna("unassigned")
+    frame["staff_name"] = frame["staff_name"].fillna("Unassigned")
+    
+    current_total = int(frame["current_pay"].sum())
+    simulated_total = int(frame["simulated_pay"].sum())
+    
+    staff_names = frame.groupby("staff_id")["staff_name"].last()
+    by_staff = _delta_rows(frame, "staff_id")
+    for row in by_staff:
+        row["staff_name"] = staff_names[row["staff_id"]]
+    
+    return {
+        "entries": len(frame),
+        "current_pay": current_total / CENTS_PER_DOLLAR,
+        "simulated_pay": simulated_total / CENTS_PER_DOLLAR,
+        "delta": (simulated_total - current_total) / CENTS_PER_DOLLAR,
+        "delta_percent": round((simulated_total - current_total) / current_total * 100, 2) if current_total else None,
+        "by_staff": by_staff,
+        "by_shift_type": _delta_rows(frame, "shift_type"),
+        "by_month": _delta_rows(frame, "month")
+    }
@@ -0,0 +1,273 @@
+"""
+Assignment Services for Workforce Management System
+Automatic staff assignment for unfilled shifts
+"""
+
+from typing import List, Optional, Dict, Any, Callable, Tuple
+import time
+
+from scheduling_services import (
+    MINUTES_PER_HOUR,
+    MIN_REST_GAP_HOURS,
+    WEEKLY_ORDINARY_HOURS_CAP,
+    StaffIntervalIndex,
+    ShiftInterval,
+    entry_interval,
+    cap_minutes,
+    display_hours,
+    iso_week_key,
+    ordinary_minutes,
+    _is_sleepover,
+)
+
+# Overtime is paid at time and a half, so each overtime hour costs half the
+# shift's hourly pay on top of what the shift already costs
+OVERTIME_PREMIUM = 0.5
+
+# Dollars of cost one unit of hours imbalance (sum of squared staff hours) is worth
+BALANCE_WEIGHT = 1.0
+
+# Availability callback: (staff_id, start minute, end minute) -> can work
+AvailabilityCheck = Callable[[str, int, int], bool]
+
+
+class ShiftAssignmentSolver:
+    """Fill unassigned shifts with greedy placement followed by local search
+    
+    Every assignment respects availability and preferred weekly maximums,
+    never double-books, keeps the minimum rest gap (except next to
+    sleepovers) and, unless overtime is allowed, keeps each ISO week within
+    the hours cap. Among feasible staff the solver picks whoever adds the
+    least cost: overtime premium plus the growth in the sum of squared
+    hours, which spreads hours evenly. Time is tracked in whole minutes and
+    only converted to hours for costs and results.
+    """
+    
+    def __init__(
+        self,
+        staff: List[Dict[str, Any]],
+        assigned_entries: List[Dict[str, Any]],
+        balance_from: str,
+        balance_to: str,
+        min_rest_hours: float = MIN_REST_GAP_HOURS,
+        weekly_hours_cap: float = WEEKLY_ORDINARY_HOURS_CAP,
+        allow_overtime: bool = False,
+        availability: Optional[AvailabilityCheck] = None,
+        weekly_hours_caps: Optional[Dict[str, float]] = None,
+        time_limit_seconds: float = 2.0
+    ):
+        self.staff_names = {member["id"]: member.get("name") for member in staff}
+        self.min_rest_minutes = cap_minutes(min_rest_hours)
+        self.weekly_minutes_cap = cap_minutes(weekly_hours_cap)
+        self.allow_overtime = allow_overtime
+        self.availability = availability
+        self.weekly_minutes_caps = {
+            staff_id: cap_minutes(hours_cap) for staff_id, hours_cap in (weekly_hours_caps or {}).items()
+        }
+        self.time_limit_seconds = time_limit_seconds
+        
+        self.index = StaffIntervalIndex()
+        self.sleepovers: Dict[str, bool] = {}
+        self.minutes: Dict[str, int] = {staff_id: 0 for staff_id in self.staff_names}
+        self.weekly_minutes: Dict[Tuple[str, str], int] = {}
+        
+        # Shifts already assigned shape each person's timeline and weekly
+        # hours; only those inside the balance window count towards balance
+        for entry in assigned_entries:
+            staff_id = entry.get("staff_id")
+            if not staff_id:
+                continue
+            interval = entry_interval(entry)
+            self.index.add(staff_id, interval)
+            self.sleepovers[entry["id"]] = _is_sleepover(entry)
+            minutes = ordinary_minutes(entry, interval)
+            week_key = (staff_id, iso_week_key(entry["date"]))
+            self.weekly_minutes[week_key] = self.weekly_minutes.get(week_key, 0) + minutes
+            if staff_id in self.minutes and balance_from <= entry["date"] <= balance_to:
+                self.minutes[staff_id] += minutes
+    
+    def solve(self, open_entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Assign staff to the given unassigned entries without writing anything"""
+        started = time.perf_counter()
+        shifts = [self._prepare(entry) for entry in open_entries]
+        shifts.sort(key=lambda shift: shift["interval"])
+        
+        assignments: Dict[str, str] = {}
+        unfilled = []
+        
+        # Greedy pass in time order: cheapest feasible person for each shift
+        for shift in shifts:
+            best = None
+            for staff_id in self.staff_names:
+                if not self._feasible(staff_id, shift):
+                    continue
+                cost = self._added_cost(staff_id, shift)
+                if best is None or cost < best[0]:
+                    best = (cost, staff_id)
+            if best is None:
+                unfilled.append(shift)
+                continue
+            self._assign(best[1], shift)
+            assignments[shift["id"]] = best[1]
+        
+        greedy_seconds = time.perf_counter() - started
+        
+        # Local search: move shifts to people with fewer hours while that
+        # lowers the total cost and the time budget lasts
+        moves = 0
+        improved = True
+        deadline = started + self.time_limit_seconds
+        by_id = {shift["id"]: shift for shift in shifts}
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            for entry_id, current in list(assignments.items()):
+                if time.perf_counter() >= deadline:
+                    break
+                shift = by_id[entry_id]
+                self._unassign(current, shift)
+                current_cost = self._added_cost(current, shift)
+                best = (current_cost, current)
+                for staff_id in sorted(self.staff_names, key=self.minutes.get):
+                    # Only people with fewer hours can improve the balance
+                    if self.minutes[staff_id] >= self.minutes[current]:
+                        break
+                    if not self._feasible(staff_id, shift):
+                        continue
+                    cost = self._added_cost(staff_id, shift)
+                    if cost < best[0] - 1e-9:
+                        best = (cost, staff_id)
+                self._assign(best[1], shift)
+                if best[1] != current:
+                    assignments[entry_id] = best[1]
+                    moves += 1
+                    improved = True
+        
+        staff_minutes = list(self.minutes.values())
+        return {
+            "assignments": [
+                {
+                    "entry_id": shift["id"],
+                    "date": shift["entry"]["date"],
+                    "start_time": shift["entry"]["start_time"],
+                    "end_time": shift["entry"]["end_time"],
+                    "staff_id": assignments[shift["id"]],
+                    "staff_name": self.staff_names[assignments[shift["id"]]]
+                }
+                for shift in shifts if shift["id"] in assignments
+            ],
+            "unfilled": [
+                {
+                    "entry_id": shift["id"],
+                    "date": shift["entry"]["date"],
+                    "start_time": shift["entry"]["start_time"],
+                    "end_time": shift["entry"]["end_time"],
+                    "reason": "No available staff without overlap, short rest gap or hours cap breach"
+                }
+                for shift in unfilled
+            ],
+            "staff_hours": {
+                staff_id: display_hours(minutes) for staff_id, minutes in sorted(self.minutes.items(), key=lambda item: -item[1])
+            },
+            "stats": {
+                "open_shifts": len(shifts),
+                "assigned": len(assignments),
+                "unfilled": len(unfilled),
+                "local_search_moves": moves,
+                "min_staff_hours": display_hours(min(staff_minutes)) if staff_minutes else 0,
+                "max_staff_hours": display_hours(max(staff_minutes)) if staff_minutes else 0,
+                "overtime_hours": display_hours(self._overtime_minutes()),
+                "greedy_seconds": round(greedy_seconds, 3),
+                "solve_seconds": round(time.perf_counter() - started, 3)
+            }
+        }
+    
+    def _prepare(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        interval = entry_interval(entry)
+        worked = entry.get("hours_worked") or (interval.end - interval.start) / MINUTES_PER_HOUR
+        return {
+            "id": entry["id"],
+            "entry": entry,
+            "interval": interval,
+            "minutes": ordinary_minutes(entry, interval),
+            "week": iso_week_key(entry["date"]),
+            "sleepover": _is_sleepover(entry),
+            "hourly_pay": (entry.get("total_pay") or 0) / worked if worked else 0.0
+        }
+    
+    def place(self, staff_id: str, entry: Dict[str, Any]) -> Optional[str]:
+        """Apply a chosen assignment under the same constraints as ``solve``
+        
+        Returns why the staff member cannot take the shift, or None once the
+        assignment is recorded, so later placements are checked against it.
+        """
+        if staff_id not in self.staff_names:
+            return "Staff member not found or inactive"
+        shift = self._prepare(entry)
+        reason = self._infeasibility(staff_id, shift)
+        if reason is None:
+            self._assign(staff_id, shift)
+        return reason
+    
+    def _feasible(self, staff_id: str, shift: Dict[str, Any]) -> bool:
+        return self._infeasibility(staff_id, shift) is None
+    
+    def _infeasibility(self, staff_id: str, shift: Dict[str, Any]) -> Optional[str]:
+        interval: ShiftInterval = shift["interval"]
+        
+        if self.availability and not self.availability(staff_id, interval.start, interval.end):
+            return "Staff member is unavailable or on leave"
+        
+        week_minutes = self.weekly_minutes.get((staff_id, shift["week"]), 0)
+        if week_minutes + shift["minutes"] > self._weekly_cap(staff_id):
+            return "Exceeds the weekly hours cap"
+        
+        # Overlaps always block; shifts within the rest gap block unless
+        # either side is a sleepover
+        if shift["sleepover"]:
+            return "Overlaps another shift" if self.index.overlaps(staff_id, interval.start, interval.end) else None
+        nearby = self.index.overlaps(
+            staff_id,
+            interval.start - self.min_rest_minutes,
+            interval.end + self.min_rest_minutes
+        )
+        for other in nearby:
+            if other.end > interval.start and other.start < interval.end:
+                return "Overlaps another shift"
+            if not self.sleepovers.get(other.entry_id):
+                return "Rest gap to another shift is too short"
+        return None
+    
+    def _added_cost(self, staff_id: str, shift: Dict[str, Any]) -> float:
+        minutes = shift["minutes"]
+        current = self.minutes[staff_id]
+        balance = BALANCE_WEIGHT * (2 * current * minutes + minutes * minutes) / MINUTES_PER_HOUR ** 2
+        
+        week_minutes = self.weekly_minutes.get((staff_id, shift["week"]), 0)
+        overtime = max(0, week_minutes + minutes - self.weekly_minutes_cap) - max(0, week_minutes - self.weekly_minutes_cap)
+        return balance + overtime / MINUTES_PER_HOUR * shift["hourly_pay"] * OVERTIME_PREMIUM
+    
+    def _assign(self, staff_id: str, shift: Dict[str, Any]):
+        self.index.add(staff_id, shift["interval"])
+        self.sleepovers[shift["id"]] = shift["sleepover"]
+        self.minutes[staff_id] += shift["minutes"]
+        week_key = (staff_id, shift["week"])
+        self.weekly_minutes[week_key] = self.weekly_minutes.get(week_key, 0) + shift["minutes"]
+    
+    def _unassign(self, staff_id: str, shift: Dict[str, Any]):
+        self.index.remove(shift["id"])
+        self.minutes[staff_id] -= shift["minutes"]
+        self.weekly_minutes[(staff_id, shift["week"])] -= shift["minutes"]
+    
+    def _weekly_cap(self, staff_id: str) -> float:
+        """Most minutes a staff member may be given in a week
+        
+        A staff member's preferred maximum always applies; the award cap only
+        applies when overtime is not allowed.
+        """
+        cap = self.weekly_minutes_caps.get(staff_id, float("inf"))
+        if not self.allow_overtime:
+            cap = min(cap, self.weekly_minutes_cap)
+        return cap
+    
+    def _overtime_minutes(self) -> int:
+        return sum(max(0, minutes - self.weekly_minutes_cap) for minutes in self.weekly_minutes.values())
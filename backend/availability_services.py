@@ -0,0 +1,140 @@
+"""
+Availability Services for Workforce Management System
+Staff leave and unavailability lookups
+"""
+
+from typing import List, Dict, Any, Iterable, Tuple
+from datetime import datetime, date
+import numpy as np
+
+from scheduling_services import MINUTES_PER_DAY, format_absolute_minutes
+
+# Staff members are laid end to end on one number line for the month-wide
+# lookup; every absolute minute up to the year 4000 fits inside one span
+STAFF_MINUTE_SPAN = 1 << 31
+
+
+def parse_availability_time(value: str, is_end: bool = False) -> int:
+    """Absolute minutes for 'YYYY-MM-DD HH:MM' (or 'T' separated) or a bare date
+    
+    A bare end date covers that whole day, so leave entered as 2025-01-06 to
+    2025-01-10 runs until midnight at the end of the 10th.
+    """
+    value = value.strip()
+    if len(value) == 10:
+        day = date.fromisoformat(value).toordinal() + (1 if is_end else 0)
+        return day * MINUTES_PER_DAY
+    
+    moment = datetime.strptime(value.replace("T", " "), "%Y-%m-%d %H:%M")
+    return moment.date().toordinal() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort intervals and merge the ones that overlap or touch"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def describe_interval(interval: Dict[str, Any]) -> Dict[str, Any]:
+    """Readable form of a stored availability interval"""
+    return {
+        "id": interval["id"],
+        "start": format_absolute_minutes(interval["start"]),
+        "end": format_absolute_minutes(interval["end"]),
+        "reason": interval.get("reason")
+    }
+
+
+class AvailabilityIndex:
+    """Unavailable time per staff member as merged, sorted interval arrays
+    
+    Merged intervals never overlap, so both the start and end arrays are
+    sorted and a single binary search on the ends answers "is this range free".
+    """
+    
+    def __init__(self):
+        self._starts: Dict[str, np.ndarray] = {}
+        self._ends: Dict[str, np.ndarray] = {}
+        self.max_weekly_hours: Dict[str, float] = {}
+    
+    @classmethod
+    def from_documents(cls, documents: Iterable[Dict[str, Any]]) -> "AvailabilityIndex":
+        """Build from staff_availability documents"""
+        index = cls()
+        for document in documents:
+            index.set_intervals(
+                document["staff_id"],
+                [(interval["start"], interval["end"]) for interval in document.get("unavailable", [])]
+            )
+            if document.get("max_weekly_hours") is not None:
+                index.max_weekly_hours[document["staff_id"]] = document["max_weekly_hours"]
+        return index
+    
+    def set_intervals(self, staff_id: str, intervals: Iterable[Tuple[int, int]]):
+        merged = merge_intervals(intervals)
+        self._starts[staff_id] = np.array([start for start, _ in merged], dtype=np.int64)
+        self._ends[staff_id] = np.array([end for _, end in merged], dtype=np.int64)
+    
+    def add_intervals(self, staff_id: str, intervals: Iterable[Tuple[int, int]]):
+        """Mark more time unavailable, e.g. shifts the staff member already works"""
+        existing = zip(self._starts.get(staff_id, []), self._ends.get(staff_id, []))
+        self.set_intervals(staff_id, [(int(start), int(end)) for start, end in existing] + list(intervals))
+    
+    def is_available(self, staff_id: str, start: int, end: int) -> bool:
+        """Whether a staff member has no unavailable time inside [start, end)"""
+        ends = self._ends.get(staff_id)
+        if ends is None or not len(ends):
+            return True
+        
+        # First interval ending after the range starts is the only candidate
+        position = int(np.searchsorted(ends, start, side="right"))
+        return position == len(ends) or self._starts[staff_id][position] >= end
+    
+    def free_matrix(self, staff_ids: List[str], starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Availability of every staff member for every range, as a bool matrix
+        
+        Each staff member's intervals are shifted onto their own span of one
+        number line, so the whole staff x shift grid is a single searchsorted
+        over the combined end array.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        
+        interval_starts = []
+        interval_ends = []
+        for rank, staff_id in enumerate(staff_ids):
+            if staff_id in self._ends:
+                offset = rank * STAFF_MINUTE_SPAN
+                interval_starts.append(self._starts[staff_id] + offset)
+                interval_ends.append(self._ends[staff_id] + offset)
+        
+        if not interval_ends:
+            return np.ones((len(staff_ids), len(starts)), dtype=bool)
+        
+        all_starts = np.concatenate(interval_starts)
+        all_ends = np.concatenate(interval_ends)
+        
+        offsets = (np.arange(len(staff_ids), dtype=np.int64) * STAFF_MINUTE_SPAN)[:, None]
+        query_starts = offsets + starts[None, :]
+        query_ends = offsets + ends[None, :]
+        
+        # An interval from another staff member's span always starts at or
+        # after the next span, beyond any query end in this one
+        positions = np.searchsorted(all_ends, query_starts, side="right")
+        candidate_starts = np.append(all_starts, np.iinfo(np.int64).max)[positions]
+        return candidate_starts >= query_ends
+    
+    def free_staff(self, staff_ids: List[str], ranges: List[Tuple[int, int]]) -> List[List[str]]:
+        """Staff members free for each range, in ``staff_ids`` order"""
+        if not ranges:
+            return []
+        starts, ends = zip(*ranges)
+        free = self.free_matrix(staff_ids, np.array(starts), np.array(ends))
+        staff_array = np.array(staff_ids, dtype=object)
+        return [staff_array[free[:, column]].tolist() for column in range(len(ranges))]
@@ -3,10 +3,12 @@ Export Services for Workforce Management System
 Handles PDF, Excel, and CSV export functionality
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Set
 from datetime import date, datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import pandas as pd
+import numpy as np
+import asyncio
 import io
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
@@ -14,9 +16,88 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 import logging
+from scheduling_services import weekly_overtime_minutes
+from pay_services import BUCKETS, cents_to_dollars, entry_bucket_minutes, entry_cents, minutes_to_hours
 
 logger = logging.getLogger(__name__)
 
+# Export column kinds. Columns are classified once by name suffix, so date
+# columns such as "pay_period_start" never reach the currency formatter.
+CURRENCY_COLUMN = "currency"
+HOURS_COLUMN = "hours"
+CURRENCY_COLUMN_SUFFIXES = ("pay", "rate", "allowance", "deductions")
+HOURS_COLUMN_SUFFIXES = ("hours", "hours_worked")
+
+# Roster documents per Parquet row group when streaming columnar exports
+PARQUET_BATCH_SIZE = 10000
+
+# Roster fields weekly overtime is worked out from
+OVERTIME_FIELDS = ["id", "date", "start_time", "end_time", "staff_name", "is_sleepover", "manual_sleepover", "wake_hours"]
+
+EXPORT_TEXT_FORMATS = {
+    CURRENCY_COLUMN: "${:.2f}",
+    HOURS_COLUMN: "{:.1f}",
+}
+EXPORT_EXCEL_FORMATS = {
+    CURRENCY_COLUMN: '"$"0.00',
+    HOURS_COLUMN: "0.0",
+}
+
+
+def get_export_column_kind(column: str) -> Optional[str]:
+    """Classify an export column as currency, hours or plain"""
+    name = str(column).lower()
+    if name.endswith(HOURS_COLUMN_SUFFIXES):
+        return HOURS_COLUMN
+    if name.endswith(CURRENCY_COLUMN_SUFFIXES):
+        return CURRENCY_COLUMN
+    return None
+
+
+def get_export_schema(df: pd.DataFrame) -> Dict[str, str]:
+    """Map each formatted column of a frame to its kind"""
+    schema = {}
+    for col in df.columns:
+        kind = get_export_column_kind(col)
+        if kind:
+            schema[col] = kind
+    return schema
+
+
+def format_export_column(values: pd.Series, kind: str) -> pd.Series:
+    """Format a numeric column as display strings
+    
+    Each distinct amount is formatted once and broadcast back through the
+    inverse index, so the cost follows the number of distinct values (a
+    handful of shift shapes) rather than the number of rows.
+    """
+    numeric = pd.to_numeric(values, errors="coerce").fillna(0).to_numpy(dtype=float)
+    codes, uniques = pd.factorize(numeric)
+    pattern = EXPORT_TEXT_FORMATS[kind]
+    formatted = np.array([pattern.format(value) for value in uniques], dtype=object)
+    # dtype=object skips pandas' per-row string dtype inference
+    return pd.Series(formatted.take(codes), index=values.index, dtype=object)
+
+
+def format_export_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a copy of the frame with currency and hours columns formatted"""
+    df = df.copy()
+    for col, kind in get_export_schema(df).items():
+        df[col] = format_export_column(df[col], kind)
+    return df
+
+
+def _column_display_width(values: pd.Series, kind: Optional[str]) -> int:
+    """Longest rendered cell in a column, measured over distinct values only"""
+    if values.empty:
+        return 0
+    if kind:
+        uniques = pd.unique(values)
+        pattern = EXPORT_TEXT_FORMATS[kind]
+        return max(len(pattern.format(value)) for value in uniques)
+    uniques = pd.unique(values.astype(str))
+    return max(len(value) for value in uniques)
+
 
 class ExportService:
     """Service class for handling export data operations"""
@@ -24,63 +105,141 @@ class ExportService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
     
+    async def _fetch_roster_entries(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        staff_names: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Read roster entries for an optional date range in a single pass
+        
+        ``fields`` limits the read to those fields instead of whole documents.
+        """
+        query = {}
+        
+        if start_date or end_date:
+            date_filter = {}
+            if start_date:
+                date_filter["$gte"] = start_date.isoformat()
+            if end_date:
+                date_filter["$lte"] = end_date.isoformat()
+            query["date"] = date_filter
+        
+        if staff_names is not None:
+            query["staff_name"] = {"$in": staff_names}
+        
+        projection = {"_id": 0, **{field: 1 for field in fields}} if fields else {"_id": 0}
+        cursor = self.db.roster.find(query, projection)
+        return await cursor.to_list(None)
+    
+    async def _fetch_pay_period_entries(
+        self,
+        pay_period_start: Optional[date] = None,
+        pay_period_end: Optional[date] = None,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Roster entries of the whole ISO weeks a pay period touches, for weekly overtime"""
+        week_start = pay_period_start - timedelta(days=pay_period_start.weekday()) if pay_period_start else None
+        week_end = pay_period_end + timedelta(days=6 - pay_period_end.weekday()) if pay_period_end else None
+        return await self._fetch_roster_entries(week_start, week_end, fields=fields)
+    
+    async def _aggregate_staff_pay(
+        self,
+        pay_period_start: Optional[date] = None,
+        pay_period_end: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """Per staff member minute bucket, pay cent and shift totals of assigned shifts in a period
+        
+        Summed in the database; documents from before minutes and cents were
+        stored fall back to their hour and dollar fields.
+        """
+        query: Dict[str, Any] = {"staff_name": {"$nin": [None, ""]}}
+        if pay_period_start or pay_period_end:
+            date_filter = {}
+            if pay_period_start:
+                date_filter["$gte"] = pay_period_start.isoformat()
+            if pay_period_end:
+                date_filter["$lte"] = pay_period_end.isoformat()
+            query["date"] = date_filter
+        
+        def stored(field: str, fallback: str, scale: int) -> Dict[str, Any]:
+            return {"$ifNull": [f"${field}", {"$round": [{"$multiply": [{"$ifNull": [f"${fallback}", 0]}, scale]}, 0]}]}
+        
+        pipeline = [
+            {"$match": query},
+            {"$group": {
+                "_id": "$staff_name",
+                **{f"{bucket}_minutes": {"$sum": stored(f"{bucket}_minutes", f"{bucket}_hours", 60)} for bucket in BUCKETS},
+                "total_pay_cents": {"$sum": stored("total_pay_cents", "total_pay", 100)},
+                "shift_count": {"$sum": 1}
+            }},
+            {"$sort": {"_id": 1}}
+        ]
+        return await self.db.roster.aggregate(pipeline).to_list(None)
+    
+    async def _fetch_staff_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """Load all staff once, keyed by name, for enriching roster rows"""
+        cursor = self.db.staff.find({}, {"_id": 0})
+        staff_list = await cursor.to_list(None)
+        return {staff["name"]: staff for staff in staff_list if staff.get("name")}
+    
     async def get_shift_roster_data(
         self, 
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-        department: Optional[str] = None
+        department: Optional[str] = None,
+        roster_data: Optional[List[Dict[str, Any]]] = None,
+        staff_by_name: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
-        """Retrieve shift roster data with optional filters"""
+        """Retrieve shift roster data with optional filters
+        
+        ``roster_data`` and ``staff_by_name`` may be passed in when the caller
+        has already read them, so several sheets can share one roster pass.
+        """
         try:
-            # Build query filters
-            query = {}
-            
-            if start_date or end_date:
-                date_filter = {}
-                if start_date:
-                    date_filter["$gte"] = start_date.isoformat()
-                if end_date:
-                    date_filter["$lte"] = end_date.isoformat()
-                query["shift_date"] = date_filter
+            if staff_by_name is None:
+                staff_by_name = await self._fetch_staff_by_name()
             
+            staff_names = None
             if department:
                 # Find staff in the specified department first
-                staff_cursor = self.db.staff.find({"department": department})
-                staff_list = await staff_cursor.to_list(None)
-                staff_names = [staff["name"] for staff in staff_list]
-                if staff_names:
-                    query["staff_member"] = {"$in": staff_names}
-                else:
+                staff_names = [
+                    name for name, staff in staff_by_name.items()
+                    if staff.get("department") == department
+                ]
+                if not staff_names:
                     # No staff in department, return empty
                     return []
             
             # Fetch roster data
-            cursor = self.db.roster.find(query)
-            roster_data = await cursor.to_list(None)
+            if roster_data is None:
+                roster_data = await self._fetch_roster_entries(start_date, end_date, staff_names)
+            elif staff_names is not None:
+                allowed = set(staff_names)
+                roster_data = [entry for entry in roster_data if entry.get("staff_name") in allowed]
             
             # Enrich with staff details
             enriched_data = []
             for entry in roster_data:
                 # Get staff details
-                staff = await self.db.staff.find_one({"name": entry.get("staff_member")})
+                staff = staff_by_name.get(entry.get("staff_name"))
                 
                 enriched_entry = {
                     "employee_id": staff.get("id", "") if staff else "",
-                    "employee_name": entry.get("staff_member", ""),
-                    "shift_date": entry.get("shift_date", ""),
+                    "employee_name": entry.get("staff_name") or "",
+                    "shift_date": entry.get("date", ""),
                     "start_time": entry.get("start_time", ""),
                     "end_time": entry.get("end_time", ""),
                     "position": staff.get("position", "") if staff else "",
                     "department": staff.get("department", "") if staff else "",
                     "status": "completed",  # Default status
-                    "hours_worked": entry.get("total_hours", 0),
+                    "hours_worked": entry.get("hours_worked", 0),
                     "shift_type": entry.get("shift_type", ""),
-                    "regular_hours": entry.get("regular_hours", 0),
-                    "evening_hours": entry.get("evening_hours", 0),
-                    "night_hours": entry.get("night_hours", 0),
-                    "saturday_hours": entry.get("saturday_hours", 0),
-                    "sunday_hours": entry.get("sunday_hours", 0),
-                    "public_holiday_hours": entry.get("public_holiday_hours", 0),
+                    **{
+                        f"{bucket}_hours": minutes_to_hours(entry_bucket_minutes(entry, bucket))
+                        for bucket in BUCKETS
+                    },
                     "sleepover_allowance": entry.get("sleepover_allowance", 0),
                     "total_pay": entry.get("total_pay", 0)
                 }
@@ -95,82 +254,76 @@ class ExportService:
     async def get_pay_summary_data(
         self,
         pay_period_start: Optional[date] = None,
-        pay_period_end: Optional[date] = None
+        pay_period_end: Optional[date] = None,
+        roster_data: Optional[List[Dict[str, Any]]] = None,
+        staff_by_name: Optional[Dict[str, Dict[str, Any]]] = None,
+        staff_totals: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
-        """Retrieve pay summary data with optional filters"""
+        """Retrieve pay summary data with optional filters
+        
+        Unassigned shifts are left out. Hours and pay are summed per staff
+        member in the database over the pay period itself. Overtime needs whole
+        ISO weeks, so ``roster_data`` should cover the weeks around the pay
+        period (see ``_fetch_pay_period_entries``); only the fields in
+        ``OVERTIME_FIELDS`` are read for it. Callers that already started the
+        reads pass their results in, and only the missing ones are fetched.
+        """
         try:
-            # Build query filters
-            query = {}
-            
-            if pay_period_start or pay_period_end:
-                date_filter = {}
-                if pay_period_start:
-                    date_filter["$gte"] = pay_period_start.isoformat()
-                if pay_period_end:
-                    date_filter["$lte"] = pay_period_end.isoformat()
-                query["shift_date"] = date_filter
-            
-            # Fetch roster data and aggregate by staff member
-            cursor = self.db.roster.find(query)
-            roster_data = await cursor.to_list(None)
+            # Fetch whatever the caller has not, concurrently
+            missing = {}
+            if roster_data is None:
+                missing["roster_data"] = self._fetch_pay_period_entries(
+                    pay_period_start, pay_period_end, fields=OVERTIME_FIELDS
+                )
+            if staff_by_name is None:
+                missing["staff_by_name"] = self._fetch_staff_by_name()
+            if staff_totals is None:
+                missing["staff_totals"] = self._aggregate_staff_pay(pay_period_start, pay_period_end)
+            fetched = dict(zip(missing, await asyncio.gather(*missing.values())))
+            roster_data = fetched.get("roster_data", roster_data)
+            staff_by_name = fetched.get("staff_by_name", staff_by_name)
+            staff_totals = fetched.get("staff_totals", staff_totals)
             
-            # Group by staff member and calculate totals
-            staff_totals = {}
+            count_from = pay_period_start.isoformat() if pay_period_start else None
+            count_to = pay_period_end.isoformat() if pay_period_end else None
             
+            staff_entries = {}
             for entry in roster_data:
-                staff_name = entry.get("staff_member", "")
-                if staff_name not in staff_totals:
-                    staff_totals[staff_name] = {
-                        "regular_hours": 0,
-                        "overtime_hours": 0,  # We don't track overtime separately yet
-                        "evening_hours": 0,
-                        "night_hours": 0,
-                        "saturday_hours": 0,
-                        "sunday_hours": 0,
-                        "public_holiday_hours": 0,
-                        "total_pay": 0,
-                        "shift_count": 0
-                    }
-                
-                staff_totals[staff_name]["regular_hours"] += entry.get("regular_hours", 0)
-                staff_totals[staff_name]["evening_hours"] += entry.get("evening_hours", 0)
-                staff_totals[staff_name]["night_hours"] += entry.get("night_hours", 0)
-                staff_totals[staff_name]["saturday_hours"] += entry.get("saturday_hours", 0)
-                staff_totals[staff_name]["sunday_hours"] += entry.get("sunday_hours", 0)
-                staff_totals[staff_name]["public_holiday_hours"] += entry.get("public_holiday_hours", 0)
-                staff_totals[staff_name]["total_pay"] += entry.get("total_pay", 0)
-                staff_totals[staff_name]["shift_count"] += 1
+                if entry.get("staff_name"):
+                    staff_entries.setdefault(entry["staff_name"], []).append(entry)
             
             # Format pay summary data
             pay_summary = []
-            for staff_name, totals in staff_totals.items():
+            for totals in staff_totals:
+                staff_name = totals["_id"]
                 # Get staff details
-                staff = await self.db.staff.find_one({"name": staff_name})
+                staff = staff_by_name.get(staff_name)
                 
-                total_hours = (
-                    totals["regular_hours"] + totals["evening_hours"] + 
-                    totals["night_hours"] + totals["saturday_hours"] + 
-                    totals["sunday_hours"] + totals["public_holiday_hours"]
-                )
+                bucket_minutes = {bucket: int(totals[f"{bucket}_minutes"]) for bucket in BUCKETS}
+                
+                # Assume 15% deductions, rounded half up to the cent
+                gross_cents = int(totals["total_pay_cents"])
+                deduction_cents = (gross_cents * 15 + 50) // 100
                 
                 pay_entry = {
                     "employee_id": staff.get("id", "") if staff else "",
                     "employee_name": staff_name,
                     "pay_period_start": pay_period_start.isoformat() if pay_period_start else "",
                     "pay_period_end": pay_period_end.isoformat() if pay_period_end else "",
-                    "regular_hours": totals["regular_hours"],
-                    "evening_hours": totals["evening_hours"],
-                    "night_hours": totals["night_hours"],
-                    "saturday_hours": totals["saturday_hours"],
-                    "sunday_hours": totals["sunday_hours"],
-                    "public_holiday_hours": totals["public_holiday_hours"],
-                    "total_hours": total_hours,
-                    "overtime_hours": max(0, total_hours - 38),  # Assume 38 hour standard week
+                    **{
+                        f"{bucket}_hours": round(minutes_to_hours(minutes), 2)
+                        for bucket, minutes in bucket_minutes.items()
+                    },
+                    "total_hours": round(minutes_to_hours(sum(bucket_minutes.values())), 2),
+                    # Hours above 38 in each ISO week, counted on the shifts within the period
+                    "overtime_hours": round(minutes_to_hours(weekly_overtime_minutes(
+                        staff_entries.get(staff_name, []), count_from=count_from, count_to=count_to
+                    )), 2),
                     "regular_rate": 42.00,  # Base SCHADS rate
                     "overtime_rate": 63.00,  # 1.5x overtime rate
-                    "gross_pay": totals["total_pay"],
-                    "deductions": totals["total_pay"] * 0.15,  # Assume 15% deductions
-                    "net_pay": totals["total_pay"] * 0.85,  # Net after deductions
+                    "gross_pay": cents_to_dollars(gross_cents),
+                    "deductions": cents_to_dollars(deduction_cents),
+                    "net_pay": cents_to_dollars(gross_cents - deduction_cents),  # Net after deductions
                     "shift_count": totals["shift_count"]
                 }
                 pay_summary.append(pay_entry)
@@ -210,20 +363,64 @@ class ExportService:
             logger.error(f"Error retrieving workforce data: {str(e)}")
             raise
     
+    async def get_workforce_export_data(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Build all workforce export sheets from one concurrent round of reads
+        
+        The roster, staff lookup, per staff pay totals and employee list are
+        fetched concurrently, then the shift and pay sheets are both derived
+        from the same roster read, so the export takes roughly as long as the
+        slowest query.
+        """
+        try:
+            week_roster_data, staff_by_name, staff_totals, employee_data = await asyncio.gather(
+                self._fetch_pay_period_entries(start_date, end_date),
+                self._fetch_staff_by_name(),
+                self._aggregate_staff_pay(start_date, end_date),
+                self.get_workforce_data()
+            )
+            
+            # The pay sheet reads whole ISO weeks for overtime; the shift sheet only the period
+            roster_data = [
+                entry for entry in week_roster_data
+                if (not start_date or entry["date"] >= start_date.isoformat())
+                and (not end_date or entry["date"] <= end_date.isoformat())
+            ]
+            
+            shift_data = await self.get_shift_roster_data(
+                start_date=start_date,
+                end_date=end_date,
+                roster_data=roster_data,
+                staff_by_name=staff_by_name
+            )
+            pay_data = await self.get_pay_summary_data(
+                pay_period_start=start_date,
+                pay_period_end=end_date,
+                roster_data=week_roster_data,
+                staff_by_name=staff_by_name,
+                staff_totals=staff_totals
+            )
+            
+            return {
+                "Shift Roster": shift_data,
+                "Pay Summary": pay_data,
+                "Employee Data": employee_data
+            }
+            
+        except Exception as e:
+            logger.error(f"Error retrieving workforce export data: {str(e)}")
+            raise
+    
     def generate_csv_content(self, data: List[Dict[str, Any]]) -> str:
         """Generate CSV content from data"""
         if not data:
             return ""
         
         try:
-            df = pd.DataFrame(data)
-            
-            # Format currency and numeric columns
-            for col in df.columns:
-                if 'pay' in col.lower() or 'rate' in col.lower() or 'deduction' in col.lower():
-                    df[col] = df[col].apply(lambda x: f"${x:.2f}" if pd.notna(x) and x != "" else "$0.00")
-                elif 'hours' in col.lower():
-                    df[col] = df[col].apply(lambda x: f"{x:.1f}" if pd.notna(x) and x != "" else "0.0")
+            df = format_export_frame(pd.DataFrame(data))
             
             return df.to_csv(index=False)
             
@@ -232,53 +429,50 @@ class ExportService:
             raise
     
     def generate_excel_content(self, data_sheets: Dict[str, List[Dict[str, Any]]]) -> bytes:
-        """Generate Excel content with multiple sheets"""
+        """Generate Excel content with multiple sheets
+        
+        Currency and hours columns are written as numbers with native Excel
+        number formats applied per column, so no cell is string-formatted.
+        """
         try:
             buffer = io.BytesIO()
             
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+            with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+                workbook = writer.book
+                header_format = workbook.add_format({
+                    "bold": True,
+                    "font_color": "#FFFFFF",
+                    "bg_color": "#366092"
+                })
+                column_formats = {
+                    kind: workbook.add_format({"num_format": num_format})
+                    for kind, num_format in EXPORT_EXCEL_FORMATS.items()
+                }
+                
                 for sheet_name, data in data_sheets.items():
                     if not data:
                         continue
                     
                     df = pd.DataFrame(data)
+                    schema = get_export_schema(df)
                     
-                    # Format currency and numeric columns
-                    for col in df.columns:
-                        if 'pay' in col.lower() or 'rate' in col.lower() or 'deduction' in col.lower():
-                            df[col] = df[col].apply(lambda x: f"${x:.2f}" if pd.notna(x) and x != "" else "$0.00")
-                        elif 'hours' in col.lower():
-                            df[col] = df[col].apply(lambda x: f"{x:.1f}" if pd.notna(x) and x != "" else "0.0")
+                    # Keep currency and numeric columns numeric for Excel
+                    for col in schema:
+                        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
                     
                     df.to_excel(writer, sheet_name=sheet_name, index=False)
+                    worksheet = writer.sheets[sheet_name]
                     
-                    # Apply formatting
-                    workbook = writer.book
-                    worksheet = workbook[sheet_name]
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
+                    for idx, col in enumerate(df.columns):
+                        kind = schema.get(col)
                         
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except:
-                                pass
+                        # Style headers
+                        worksheet.write(0, idx, col, header_format)
                         
+                        # Auto-adjust column widths
+                        max_length = max(len(str(col)), _column_display_width(df[col], kind))
                         adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                    
-                    # Style headers
-                    from openpyxl.styles import Font, PatternFill
-                    header_font = Font(bold=True, color="FFFFFF")
-                    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                    
-                    for cell in worksheet[1]:
-                        cell.font = header_font
-                        cell.fill = header_fill
+                        worksheet.set_column(idx, idx, adjusted_width, column_formats.get(kind))
             
             buffer.seek(0)
             return buffer.getvalue()
@@ -368,6 +562,185 @@ class ExportService:
             logger.error(f"Error generating PDF content: {str(e)}")
             raise
 
+    async def stream_shift_roster_parquet(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        department: Optional[str] = None,
+        batch_size: int = PARQUET_BATCH_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream the shift roster as a typed, compressed Parquet file
+        
+        Roster entries are read from the cursor in batches and each batch is
+        written as its own row group, so the whole export is never held in
+        memory. Dates are date32, money is int64 cents and low-cardinality
+        text (staff, times, shift type) is dictionary encoded.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        staff_by_name = await self._fetch_staff_by_name()
+        staff_names = None
+        if department:
+            staff_names = [
+                name for name, staff in staff_by_name.items()
+                if staff.get("department") == department
+            ]
+        
+        query = {}
+        if start_date or end_date:
+            date_filter = {}
+            if start_date:
+                date_filter["$gte"] = start_date.isoformat()
+            if end_date:
+                date_filter["$lte"] = end_date.isoformat()
+            query["date"] = date_filter
+        if staff_names is not None:
+            query["staff_name"] = {"$in": staff_names}
+        
+        schema = shift_roster_arrow_schema()
+        sink = _ParquetChunkSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+        try:
+            batch = []
+            cursor = self.db.roster.find(query, {"_id": 0}).sort("date", 1).batch_size(batch_size)
+            async for entry in cursor:
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    writer.write_batch(_shift_roster_record_batch(batch, staff_by_name, schema))
+                    batch = []
+                    yield sink.drain()
+            if batch:
+                writer.write_batch(_shift_roster_record_batch(batch, staff_by_name, schema))
+        finally:
+            writer.close()
+        yield sink.drain()
+    
+    async def generate_pay_summary_parquet(
+        self,
+        pay_period_start: Optional[date] = None,
+        pay_period_end: Optional[date] = None
+    ) -> bytes:
+        """Generate the pay summary as a typed, compressed Parquet file"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        pay_data = await self.get_pay_summary_data(pay_period_start, pay_period_end)
+        
+        def column(name):
+            return [row[name] for row in pay_data]
+        
+        def cents(name):
+            return [int(round(row[name] * 100)) for row in pay_data]
+        
+        table = pa.table({
+            "employee_id": pa.array(column("employee_id"), pa.string()),
+            "employee_name": pa.array(column("employee_name"), pa.string()),
+            "pay_period_start": pa.array([pay_period_start] * len(pay_data), pa.date32()),
+            "pay_period_end": pa.array([pay_period_end] * len(pay_data), pa.date32()),
+            **{
+                name: pa.array(column(name), pa.float64())
+                for name in (
+                    "regular_hours", "evening_hours", "night_hours", "saturday_hours",
+                    "sunday_hours", "public_holiday_hours", "total_hours", "overtime_hours"
+                )
+            },
+            **{
+                f"{name}_cents": pa.array(cents(name), pa.int64())
+                for name in ("regular_rate", "overtime_rate", "gross_pay", "deductions", "net_pay")
+            },
+            "shift_count": pa.array(column("shift_count"), pa.int32()),
+        })
+        
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression="zstd")
+        return buffer.getvalue()
+
+
+def shift_roster_arrow_schema():
+    """Arrow schema for the columnar shift roster export"""
+    import pyarrow as pa
+    
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("entry_id", pa.string()),
+        ("shift_date", pa.date32()),
+        ("employee_id", pa.string()),
+        ("employee_name", category),
+        ("department", category),
+        ("start_time", category),
+        ("end_time", category),
+        ("shift_type", category),
+        ("is_sleepover", pa.bool_()),
+        ("is_public_holiday", pa.bool_()),
+        ("hours_worked", pa.float64()),
+        ("base_pay_cents", pa.int64()),
+        ("sleepover_allowance_cents", pa.int64()),
+        ("total_pay_cents", pa.int64()),
+    ])
+
+
+def _shift_roster_record_batch(entries: List[Dict[str, Any]], staff_by_name: Dict[str, Dict[str, Any]], schema):
+    """Convert a batch of roster documents into an Arrow record batch"""
+    import pyarrow as pa
+    
+    def cents(name):
+        return [entry_cents(entry, name) for entry in entries]
+    
+    staff = [staff_by_name.get(entry.get("staff_name")) or {} for entry in entries]
+    columns = {
+        "entry_id": [entry.get("id") for entry in entries],
+        "shift_date": [date.fromisoformat(entry["date"]) for entry in entries],
+        "employee_id": [member.get("id") for member in staff],
+        "employee_name": [entry.get("staff_name") for entry in entries],
+        "department": [member.get("department") for member in staff],
+        "start_time": [entry.get("start_time") for entry in entries],
+        "end_time": [entry.get("end_time") for entry in entries],
+        "shift_type": [entry.get("shift_type") or entry.get("manual_shift_type") for entry in entries],
+        "is_sleepover": [bool(entry.get("is_sleepover")) for entry in entries],
+        "is_public_holiday": [bool(entry.get("is_public_holiday")) for entry in entries],
+        "hours_worked": [float(entry.get("hours_worked") or 0) for entry in entries],
+        "base_pay_cents": cents("base_pay"),
+        "sleepover_allowance_cents": cents("sleepover_allowance"),
+        "total_pay_cents": cents("total_pay"),
+    }
+    arrays = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(columns[field.name], pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(columns[field.name], field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ParquetChunkSink(io.RawIOBase):
+    """Write-only sink that hands back written bytes in chunks
+    
+    The Parquet writer records absolute offsets in the file footer, so the
+    position keeps counting after buffered chunks are drained to the client.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
 
 class HolidayService:
     """Service for Queensland public holiday detection"""
@@ -404,6 +777,22 @@ class HolidayService:
             logger.error(f"Error getting holiday name: {str(e)}")
             return ""
     
+    def get_holiday_dates(self, start_date: date, end_date: date, location: str = "QLD") -> Set[date]:
+        """Public holiday dates in a range, read from the yearly holiday tables
+        
+        Much cheaper than checking every day when the range spans years.
+        """
+        import holidays
+        try:
+            table = holidays.Australia(subdiv='QLD', years=range(start_date.year, end_date.year + 1))
+            return {
+                holiday_date for holiday_date in table
+                if start_date <= holiday_date <= end_date and self.is_public_holiday(holiday_date, location)
+            }
+        except Exception as e:
+            logger.error(f"Error getting holiday dates: {str(e)}")
+            return set()
+    
     def get_holidays_in_range(self, start_date: date, end_date: date, location: str = "QLD") -> List[Dict[str, Any]]:
         """Get all holidays in a date range"""
         try:
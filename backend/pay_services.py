@@ -0,0 +1,295 @@
+"""
+Pay Services for Workforce Management System
+Time-segmented penalty rates priced against a weekly rate timeline
+"""
+
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+import hashlib
+import json
+
+from scheduling_services import MINUTES_PER_DAY, MINUTES_PER_HOUR
+
+# Rate bands of each day as (start minute, rate key), starting at midnight.
+# Weekdays follow the SCHADS spans: night before 06:00, day to 20:00 and
+# evening to midnight; weekends and public holidays are one band all day.
+WEEKDAY_BANDS = [(0, "weekday_night"), (6 * 60, "weekday_day"), (20 * 60, "weekday_evening")]
+SCHADS_WEEKLY_BANDS = [WEEKDAY_BANDS] * 5 + [[(0, "saturday")], [(0, "sunday")]]
+PUBLIC_HOLIDAY_BANDS = [(0, "public_holiday")]
+
+# Day timeline used for a public holiday, whatever its weekday
+HOLIDAY_DAY = 7
+
+# Time bucket that a rate band's time is reported under. Buckets are stored
+# as ``<bucket>_minutes`` with ``<bucket>_hours`` display copies.
+RATE_BUCKETS = {
+    "weekday_day": "regular",
+    "weekday_evening": "evening",
+    "weekday_night": "night",
+    "saturday": "saturday",
+    "sunday": "sunday",
+    "public_holiday": "public_holiday",
+}
+BUCKETS = list(RATE_BUCKETS.values())
+MINUTE_BUCKET_FIELDS = [f"{bucket}_minutes" for bucket in BUCKETS]
+HOUR_BUCKET_FIELDS = [f"{bucket}_hours" for bucket in BUCKETS]
+
+# Money is held in integer cents and time in integer minutes; dollars and
+# hours only appear when values are serialized for display
+CENTS_PER_DOLLAR = 100
+
+# Flat sleepover allowance, which includes the first two wake hours
+SLEEPOVER_ALLOWANCE_CENTS = 17500
+
+
+def to_cents(amount: Optional[float]) -> int:
+    """Whole cents for a dollar amount"""
+    return int(round((amount or 0) * CENTS_PER_DOLLAR))
+
+
+def cents_to_dollars(cents: int) -> float:
+    return cents / CENTS_PER_DOLLAR
+
+
+def minutes_to_hours(minutes: int) -> float:
+    return minutes / MINUTES_PER_HOUR
+
+
+def pay_cents(minutes: int, rate_cents: int) -> int:
+    """Pay for ``minutes`` at an hourly rate in cents, rounded half up to the cent"""
+    return (minutes * rate_cents + MINUTES_PER_HOUR // 2) // MINUTES_PER_HOUR
+
+
+def minute_buckets(rate_minutes: Dict[str, int]) -> Dict[str, int]:
+    """Minute bucket fields for paid minutes per rate key; every bucket is present"""
+    buckets = dict.fromkeys(MINUTE_BUCKET_FIELDS, 0)
+    for rate_key, minutes in rate_minutes.items():
+        buckets[f"{RATE_BUCKETS[rate_key]}_minutes"] += minutes
+    return buckets
+
+
+def hour_buckets(minutes_by_bucket: Dict[str, int]) -> Dict[str, float]:
+    """Hour display copies of minute bucket fields"""
+    return {f"{bucket}_hours": minutes_to_hours(minutes_by_bucket.get(f"{bucket}_minutes", 0)) for bucket in BUCKETS}
+
+
+def entry_cents(entry: Dict[str, Any], field: str) -> int:
+    """Stored ``<field>_cents`` of a roster document, or its dollar field for older documents"""
+    cents = entry.get(f"{field}_cents")
+    return cents if cents is not None else to_cents(entry.get(field))
+
+
+def entry_minutes(entry: Dict[str, Any]) -> int:
+    """Stored minutes worked of a roster document, or its hours for older documents"""
+    minutes = entry.get("minutes_worked")
+    return minutes if minutes is not None else int(round((entry.get("hours_worked") or 0) * MINUTES_PER_HOUR))
+
+
+def entry_bucket_minutes(entry: Dict[str, Any], bucket: str) -> int:
+    """Stored ``<bucket>_minutes`` of a roster document, or its hours for older documents"""
+    minutes = entry.get(f"{bucket}_minutes")
+    return minutes if minutes is not None else int(round((entry.get(f"{bucket}_hours") or 0) * MINUTES_PER_HOUR))
+
+
+def summarize_roster_pay(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Counts, hours and pay of roster documents per day and shift type
+    
+    Totals are summed in minutes and cents and converted for the response.
+    """
+    by_day: Dict[str, Dict[str, Any]] = {}
+    by_shift_type: Dict[str, Dict[str, Any]] = {}
+    total_minutes, total_cents = 0, 0
+    for entry in entries:
+        minutes, cents = entry_minutes(entry), entry_cents(entry, "total_pay")
+        total_minutes, total_cents = total_minutes + minutes, total_cents + cents
+        for totals in (
+            by_day.setdefault(entry["date"], {"date": entry["date"], "shifts": 0, "hours": 0, "pay": 0}),
+            by_shift_type.setdefault(entry.get("shift_type"), {"shifts": 0, "hours": 0, "pay": 0})
+        ):
+            totals["shifts"] += 1
+            totals["hours"] += minutes
+            totals["pay"] += cents
+    
+    for totals in list(by_day.values()) + list(by_shift_type.values()):
+        totals["hours"] = round(minutes_to_hours(totals["hours"]), 2)
+        totals["pay"] = cents_to_dollars(totals["pay"])
+    
+    return {
+        "entries_generated": len(entries),
+        "total_hours": round(minutes_to_hours(total_minutes), 2),
+        "total_pay": cents_to_dollars(total_cents),
+        "by_day": sorted(by_day.values(), key=lambda totals: totals["date"]),
+        "by_shift_type": by_shift_type
+    }
+
+
+class RateTimeline:
+    """Per-day rate boundaries with cumulative cost at each boundary
+    
+    Days 0-6 are Monday to Sunday and day 7 is a public holiday. The cost of
+    any span within a day is the difference of two cumulative costs, each
+    found with one bisect, so a shift is priced without walking its minutes.
+    Costs are kept in exact integer rate-cents x minutes.
+    """
+    
+    def __init__(
+        self,
+        rates: Dict[str, float],
+        weekly_bands: List[List[Tuple[int, str]]] = SCHADS_WEEKLY_BANDS,
+        holiday_bands: List[Tuple[int, str]] = PUBLIC_HOLIDAY_BANDS
+    ):
+        self.boundaries: List[List[int]] = []
+        self.rate_keys: List[List[str]] = []
+        self.rates: List[List[int]] = []
+        self.cumulative: List[List[int]] = []
+        
+        for bands in list(weekly_bands) + [holiday_bands]:
+            boundaries = [start for start, _ in bands]
+            day_rates = [to_cents(rates[key]) for _, key in bands]
+            
+            # Cost of the day from midnight up to each boundary, in rate cents x minutes
+            cumulative = [0]
+            for index in range(1, len(boundaries)):
+                cumulative.append(cumulative[-1] + day_rates[index - 1] * (boundaries[index] - boundaries[index - 1]))
+            
+            self.boundaries.append(boundaries)
+            self.rate_keys.append([key for _, key in bands])
+            self.rates.append(day_rates)
+            self.cumulative.append(cumulative)
+    
+    def _cost_until(self, day: int, minute: int) -> int:
+        boundaries = self.boundaries[day]
+        index = bisect_right(boundaries, minute) - 1
+        return self.cumulative[day][index] + self.rates[day][index] * (minute - boundaries[index])
+    
+    def _day_pieces(
+        self,
+        weekday: int,
+        start_minute: int,
+        end_minute: int,
+        is_public_holiday: bool,
+        next_day_public_holiday: bool
+    ) -> List[Tuple[int, int, int]]:
+        """(day timeline, start, end) pieces of a shift; overnight shifts give two"""
+        today = HOLIDAY_DAY if is_public_holiday else weekday
+        if end_minute <= MINUTES_PER_DAY:
+            return [(today, start_minute, end_minute)]
+        
+        tomorrow = HOLIDAY_DAY if next_day_public_holiday else (weekday + 1) % 7
+        return [(today, start_minute, MINUTES_PER_DAY), (tomorrow, 0, end_minute - MINUTES_PER_DAY)]
+    
+    def price(
+        self,
+        weekday: int,
+        start_minute: int,
+        end_minute: int,
+        is_public_holiday: bool = False,
+        next_day_public_holiday: bool = False
+    ) -> int:
+        """Pay in cents for a shift from ``start_minute`` to ``end_minute`` past midnight of its weekday
+        
+        ``end_minute`` runs past 1440 for shifts that finish the next day.
+        The exact cost is rounded to the cent once, for the whole shift.
+        """
+        cost = 0
+        for day, start, end in self._day_pieces(weekday, start_minute, end_minute, is_public_holiday, next_day_public_holiday):
+            cost += self._cost_until(day, end) - self._cost_until(day, start)
+        return pay_cents(cost, 1)
+    
+    def segment_minutes(
+        self,
+        weekday: int,
+        start_minute: int,
+        end_minute: int,
+        is_public_holiday: bool = False,
+        next_day_public_holiday: bool = False
+    ) -> Dict[str, int]:
+        """Minutes of a shift falling in each rate band, keyed by rate key"""
+        minutes: Dict[str, int] = {}
+        for day, start, end in self._day_pieces(weekday, start_minute, end_minute, is_public_holiday, next_day_public_holiday):
+            boundaries = self.boundaries[day]
+            index = bisect_right(boundaries, start) - 1
+            while index < len(boundaries) and boundaries[index] < end:
+                band_end = boundaries[index + 1] if index + 1 < len(boundaries) else MINUTES_PER_DAY
+                overlap = min(end, band_end) - max(start, boundaries[index])
+                if overlap > 0:
+                    key = self.rate_keys[day][index]
+                    minutes[key] = minutes.get(key, 0) + overlap
+                index += 1
+        return minutes
+
+
+@lru_cache(maxsize=32)
+def _cached_timeline(rate_items: Tuple[Tuple[str, float], ...]) -> RateTimeline:
+    return RateTimeline(dict(rate_items))
+
+
+def rate_timeline(rates: Dict[str, float]) -> RateTimeline:
+    """Shared SCHADS timeline for a rate table, built once per distinct table"""
+    return _cached_timeline(tuple(sorted(rates.items())))
+
+
+def rate_version_key(effective_from: Optional[str], rates: Dict[str, float], pay_mode: str = "default") -> str:
+    """Identity of a rate table version; it changes whenever the rates or the pay mode change"""
+    digest = hashlib.sha1(json.dumps(rates, sort_keys=True).encode()).hexdigest()[:10]
+    return f"{effective_from or 'base'}:{pay_mode}:{digest}"
+
+
+class RateSchedule:
+    """Rate tables by effective date, found with a bisect on the shift date
+    
+    Version 0 is the base rate table, used before the first effective date;
+    from its ``effective_from`` date each version overrides the rates that
+    were in force before it. The pay mode is part of every version key, as
+    switching it changes pay under the same rates.
+    """
+    
+    def __init__(self, base_rates: Dict[str, float], versions: Iterable[Dict[str, Any]] = (), pay_mode: str = "default"):
+        versions = sorted(versions, key=lambda version: version["effective_from"])
+        self.effective_dates: List[str] = [version["effective_from"] for version in versions]
+        self.rate_tables: List[Dict[str, float]] = [dict(base_rates)]
+        for version in versions:
+            self.rate_tables.append({**self.rate_tables[-1], **version["rates"]})
+        self.version_keys: List[str] = [
+            rate_version_key(effective_from, rates, pay_mode)
+            for effective_from, rates in zip([None] + self.effective_dates, self.rate_tables)
+        ]
+    
+    def version_index(self, date_str: str) -> int:
+        """Index of the rate table in force on a YYYY-MM-DD date"""
+        return bisect_right(self.effective_dates, date_str)
+    
+    def rates_for(self, date_str: str) -> Dict[str, float]:
+        return self.rate_tables[self.version_index(date_str)]
+    
+    def version_key_for(self, date_str: str) -> str:
+        return self.version_keys[self.version_index(date_str)]
+    
+    def periods(self, start: str, end: str) -> List[Tuple[str, str, int]]:
+        """(first date, last date, version index) spans of [start, end] with one rate table each"""
+        periods = []
+        first = start
+        index = self.version_index(start)
+        while index < len(self.effective_dates) and self.effective_dates[index] <= end:
+            last = (date.fromisoformat(self.effective_dates[index]) - timedelta(days=1)).isoformat()
+            periods.append((first, last, index))
+            first = self.effective_dates[index]
+            index += 1
+        periods.append((first, end, index))
+        return periods
+    
+    def stale_queries(self, start: str, end: str, force: bool = False) -> List[Tuple[str, str, str, Dict[str, Any]]]:
+        """(first date, last date, version key, roster query) of each period to reprice
+        
+        The query matches the period's entries priced under any other version,
+        or all of them when ``force`` is set.
+        """
+        plans = []
+        for first, last, index in self.periods(start, end):
+            query: Dict[str, Any] = {"date": {"$gte": first, "$lte": last}}
+            if not force:
+                query["rate_version"] = {"$ne": self.version_keys[index]}
+            plans.append((first, last, self.version_keys[index], query))
+        return plans
@@ -0,0 +1,252 @@
+"""
+Recurrence Services for Workforce Management System
+Multi-week rotating shift patterns compiled for fast date-range expansion,
+weekly template patterns and their cost forecasts
+"""
+
+from typing import List, Dict, Any, Callable, Set, Tuple
+from datetime import date, timedelta
+import numpy as np
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Fields that identify a template shift pattern
+TEMPLATE_SHIFT_FIELDS = [
+    "day_of_week", "start_time", "end_time", "is_sleepover",
+    "manual_shift_type", "manual_hourly_rate", "manual_sleepover", "wake_hours"
+]
+
+# Prices one weekday's shifts on a date: (date, is public holiday, next day
+# is public holiday) -> (shifts, minutes, pay cents)
+DayPricer = Callable[[str, bool, bool], Tuple[int, int, int]]
+
+
+class CompiledRotation:
+    """A rotation rule compiled into a flat cycle table
+    
+    Shifts are stored grouped by cycle day, with per-day offsets and counts,
+    so expanding any date range is modular arithmetic on day ordinals plus
+    a couple of numpy repeats; no per-day Python loop is needed.
+    """
+    
+    def __init__(
+        self,
+        cycle_length_days: int,
+        anchor_date: str,
+        shifts: List[Dict[str, Any]],
+        exceptions: List[Dict[str, Any]] = None
+    ):
+        if cycle_length_days < 1:
+            raise ValueError("Cycle length must be at least one day")
+        
+        self.cycle_length = cycle_length_days
+        self.anchor_ordinal = date.fromisoformat(anchor_date).toordinal()
+        
+        # Flat cycle table: shifts sorted by cycle day, indexed by offset/count per day
+        by_day: List[List[Dict[str, Any]]] = [[] for _ in range(cycle_length_days)]
+        for shift in shifts:
+            cycle_day = shift["cycle_day"]
+            if not 0 <= cycle_day < cycle_length_days:
+                raise ValueError(f"Cycle day {cycle_day} is outside a {cycle_length_days}-day cycle")
+            by_day[cycle_day].extend([shift] * shift.get("shifts_per_day", 1))
+        
+        self.shifts = [shift for day_shifts in by_day for shift in day_shifts]
+        self.day_counts = np.array([len(day_shifts) for day_shifts in by_day], dtype=np.int64)
+        self.day_offsets = np.concatenate(([0], np.cumsum(self.day_counts)[:-1])).astype(np.int64)
+        
+        # Exception dates replace the cycle's shifts for that day (none = day off)
+        self.exceptions: Dict[int, List[Dict[str, Any]]] = {
+            date.fromisoformat(exception["date"]).toordinal(): exception.get("shifts", [])
+            for exception in (exceptions or [])
+        }
+    
+    @classmethod
+    def from_template(cls, template: Dict[str, Any]) -> "CompiledRotation":
+        return cls(
+            template["cycle_length_days"],
+            template["anchor_date"],
+            template["shifts"],
+            template.get("exceptions", [])
+        )
+    
+    def expand_arrays(self, start: date, end: date) -> Tuple[np.ndarray, np.ndarray]:
+        """Day ordinals and cycle table indexes of every shift in [start, end]
+        
+        Exception dates are left out; ``expand`` adds their replacements.
+        """
+        ordinals = np.arange(start.toordinal(), end.toordinal() + 1, dtype=np.int64)
+        if self.exceptions:
+            ordinals = ordinals[~np.isin(ordinals, np.fromiter(self.exceptions, dtype=np.int64))]
+        
+        cycle_days = (ordinals - self.anchor_ordinal) % self.cycle_length
+        counts = self.day_counts[cycle_days]
+        total = int(counts.sum())
+        
+        shift_ordinals = np.repeat(ordinals, counts)
+        # Position of each shift within its day, added to that day's table offset
+        day_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        within_day = np.arange(total, dtype=np.int64) - day_starts
+        shift_indexes = np.repeat(self.day_offsets[cycle_days], counts) + within_day
+        return shift_ordinals, shift_indexes
+    
+    def expand(self, start: date, end: date) -> List[Tuple[str, Dict[str, Any]]]:
+        """(YYYY-MM-DD, shift) pairs for the rotation over [start, end], in date order"""
+        ordinals, indexes = self.expand_arrays(start, end)
+        expanded = [
+            (ordinal, self.shifts[index])
+            for ordinal, index in zip(ordinals.tolist(), indexes.tolist())
+        ]
+        
+        start_ordinal, end_ordinal = start.toordinal(), end.toordinal()
+        for ordinal, shifts in self.exceptions.items():
+            if start_ordinal <= ordinal <= end_ordinal:
+                expanded.extend((ordinal, shift) for shift in shifts)
+        
+        expanded.sort(key=lambda item: item[0])
+        return [(date.fromordinal(ordinal).isoformat(), shift) for ordinal, shift in expanded]
+    
+    def cycle_summary(self) -> Dict[str, int]:
+        """Shifts per cycle day, labelled by week and weekday of the anchored cycle"""
+        anchor_weekday = date.fromordinal(self.anchor_ordinal).weekday()
+        return {
+            f"Week {cycle_day // 7 + 1} {DAY_NAMES[(anchor_weekday + cycle_day) % 7]}": int(count)
+            for cycle_day, count in enumerate(self.day_counts)
+            if count
+        }
+
+
+def compile_template_weekday_table(shifts: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Expand template shift patterns into the shifts created on each weekday (0=Monday)
+    
+    Templates saved before patterns were deduplicated hold one config per
+    source roster entry; identical configs there are collapsed so each is
+    generated once per day.
+    """
+    table = [[] for _ in range(7)]
+    seen = set()
+    for shift in shifts:
+        if "shifts_per_day" in shift:
+            copies = shift["shifts_per_day"]
+        else:
+            key = tuple(shift.get(field) for field in TEMPLATE_SHIFT_FIELDS)
+            if key in seen:
+                continue
+            seen.add(key)
+            copies = 1
+        table[shift["day_of_week"]].extend([shift] * copies)
+    return table
+
+
+def template_pattern_summary(shifts: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Shifts generated on each weekday, keyed by day name"""
+    return {
+        DAY_NAMES[day_of_week]: len(day_shifts)
+        for day_of_week, day_shifts in enumerate(compile_template_weekday_table(shifts))
+        if day_shifts
+    }
+
+
+def template_shifts_by_date(template: Dict[str, Any], start: date, end: date) -> List[Tuple[str, Dict[str, Any]]]:
+    """(YYYY-MM-DD, shift) pairs a saved template generates over [start, end]"""
+    if template.get("pattern_type") == "rotation":
+        return CompiledRotation.from_template(template).expand(start, end)
+    
+    weekday_table = compile_template_weekday_table(template["shifts"])
+    dated_shifts = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        dated_shifts.extend((day.isoformat(), shift) for shift in weekday_table[day.weekday()])
+    return dated_shifts
+
+
+def weekday_counts(start: date, days: int) -> List[int]:
+    """How many of each weekday (0=Monday) fall in ``days`` days from ``start``"""
+    full_weeks, remainder = divmod(days, 7)
+    first = start.weekday()
+    return [full_weeks + (1 if (weekday - first) % 7 < remainder else 0) for weekday in range(7)]
+
+
+def weekday_day_kinds(start: date, end: date, holiday_dates: Set[date]) -> List[Dict[Tuple[bool, bool], int]]:
+    """Days of [start, end] per weekday (0=Monday), counted by kind of day
+    
+    A kind is (is a public holiday, next day is a public holiday); the day
+    before a holiday matters for overnight shifts. ``holiday_dates`` should
+    reach the day after ``end``.
+    """
+    day_kinds = [{(False, False): day_count} for day_count in weekday_counts(start, (end - start).days + 1)]
+    for special in {
+        day for holiday_date in holiday_dates for day in (holiday_date - timedelta(days=1), holiday_date)
+        if start <= day <= end
+    }:
+        kinds = day_kinds[special.weekday()]
+        kind = (special in holiday_dates, special + timedelta(days=1) in holiday_dates)
+        kinds[(False, False)] -= 1
+        kinds[kind] = kinds.get(kind, 0) + 1
+    return day_kinds
+
+
+def month_spans(start: date, end: date) -> List[Tuple[date, date]]:
+    """(first, last) dates of each calendar month within [start, end]"""
+    spans = []
+    month_start = start
+    while month_start <= end:
+        next_month = (month_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        month_end = min(end, next_month - timedelta(days=1))
+        spans.append((month_start, month_end))
+        month_start = month_end + timedelta(days=1)
+    return spans
+
+
+def empty_forecast_totals(start: date, end: date) -> Tuple[Dict[str, Dict[str, int]], List[Dict[str, Any]]]:
+    """Zeroed per weekday and per month forecast totals for [start, end]"""
+    by_weekday = {name: {"days": 0, "public_holidays": 0, "shifts": 0, "hours": 0, "pay": 0} for name in DAY_NAMES}
+    months = [
+        {"month": month_start.strftime("%Y-%m"), "shifts": 0, "hours": 0, "pay": 0}
+        for month_start, _ in month_spans(start, end)
+    ]
+    return by_weekday, months
+
+
+def forecast_weekly_pattern(
+    start: date,
+    end: date,
+    holiday_dates: Set[date],
+    rate_schedule: Any,
+    price_day: DayPricer
+) -> Tuple[Dict[str, Dict[str, int]], List[Dict[str, Any]]]:
+    """Per weekday and per month totals of a weekly pattern over [start, end]
+    
+    Each weekday is priced once per rate period and kind of day it occurs as
+    (see ``weekday_day_kinds``), on any of its dates within the period, and
+    multiplied by how often it occurs; cost grows with the number of months
+    and rate periods, not the number of days. Hours and pay are summed in
+    minutes and cents.
+    """
+    by_weekday, months = empty_forecast_totals(start, end)
+    day_totals: Dict[Tuple[int, int, bool, bool], Tuple[int, int, int]] = {}
+    
+    for month, (month_start, month_end) in zip(months, month_spans(start, end)):
+        for first, last, version in rate_schedule.periods(month_start.isoformat(), month_end.isoformat()):
+            period_start = date.fromisoformat(first)
+            day_kinds = weekday_day_kinds(period_start, date.fromisoformat(last), holiday_dates)
+            
+            for weekday in range(7):
+                summary = by_weekday[DAY_NAMES[weekday]]
+                for (is_holiday, next_day_holiday), day_count in day_kinds[weekday].items():
+                    summary["days"] += day_count
+                    if is_holiday:
+                        summary["public_holidays"] += day_count
+                    if not day_count:
+                        continue
+                    
+                    key = (version, weekday, is_holiday, next_day_holiday)
+                    if key not in day_totals:
+                        reference_date = period_start + timedelta(days=(weekday - period_start.weekday()) % 7)
+                        day_totals[key] = price_day(reference_date.isoformat(), is_holiday, next_day_holiday)
+                    shifts, minutes, cents = day_totals[key]
+                    for totals in (month, summary):
+                        totals["shifts"] += shifts * day_count
+                        totals["hours"] += minutes * day_count
+                        totals["pay"] += cents * day_count
+    
+    return by_weekday, months
@@ -0,0 +1,255 @@
+"""
+Roster Event Broadcasting
+Pushes compact roster change events to connected clients (Server-Sent Events)
+and reads the change feed they catch up from
+"""
+
+from typing import Any, Dict, List, Optional, Set
+from datetime import datetime, timedelta
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fields that change on every write and carry no information for clients
+VOLATILE_FIELDS = {"_id", "updated_seq", "updated_at", "created_seq"}
+
+
+class RosterEventBroker:
+    """In-process pub/sub for roster change events
+    
+    Each subscriber gets a bounded queue. A subscriber that falls too far
+    behind has its backlog replaced by a single "resync" event, telling the
+    client to catch up through the change feed instead.
+    """
+    
+    def __init__(self, queue_size: int = 1000):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Attach the event loop that owns the subscriber queues"""
+        self._loop = loop
+    
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+    
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+    
+    def publish(self, event: Dict[str, Any]):
+        """Publish an event to every subscriber
+        
+        Safe to call from sync endpoints running in the threadpool; delivery
+        is handed to the owning event loop in that case.
+        """
+        if not self._subscribers or self._loop is None:
+            return
+        
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        
+        if running_loop is self._loop:
+            self._dispatch(event)
+        else:
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+    
+    def _dispatch(self, event: Dict[str, Any]):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"op": "resync", "seq": event.get("seq")})
+
+
+def build_upsert_event(entry: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """Build a compact insert/update event for a roster entry
+    
+    Inserts carry the whole entry; updates carry only the fields that differ
+    from ``previous``. Returns None when nothing visible changed.
+    """
+    if previous is None:
+        return _entry_event("insert", entry, _visible_fields(entry))
+    
+    fields = {
+        key: value for key, value in entry.items()
+        if key not in VOLATILE_FIELDS and previous.get(key) != value
+    }
+    return _entry_event("update", entry, fields) if fields else None
+
+
+def build_replay_event(entry: Dict[str, Any], since: int) -> Dict[str, Any]:
+    """Build the event replaying a roster entry to a client that last saw ``since``
+    
+    Entries created after ``since`` are inserts. Anything else was updated;
+    the client's old copy is unknown, so the update carries every field.
+    """
+    created_seq = entry.get("created_seq")
+    op = "insert" if created_seq is not None and created_seq > since else "update"
+    return _entry_event(op, entry, _visible_fields(entry))
+
+
+def _visible_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in entry.items() if key not in VOLATILE_FIELDS}
+
+
+def _entry_event(op: str, entry: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "op": op,
+        "seq": entry.get("updated_seq"),
+        "id": entry.get("id"),
+        "date": entry.get("date"),
+        "fields": fields,
+        "total_pay": entry.get("total_pay")
+    }
+
+
+def build_delete_event(tombstone: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a delete event from a roster tombstone"""
+    return {
+        "op": "delete",
+        "seq": tombstone.get("updated_seq"),
+        "id": tombstone.get("id"),
+        "date": tombstone.get("date")
+    }
+
+
+def build_bulk_event(entries: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Summarise a bulk write as one event; clients pull details from the change feed"""
+    if not entries:
+        return None
+    
+    seqs = [entry["updated_seq"] for entry in entries]
+    dates = [entry["date"] for entry in entries]
+    return {
+        "op": "bulk",
+        "seq": max(seqs),
+        "first_seq": min(seqs),
+        "count": len(entries),
+        "start_date": min(dates),
+        "end_date": max(dates)
+    }
+
+
+def committed_seq_limit(counters, reservations, timeout_seconds: float, now: Optional[datetime] = None) -> int:
+    """First change sequence the change feed must not read past yet
+    
+    Every sequence below it has been written. The counter is read before the
+    reservations, so a write that reserves in between is above the limit.
+    Reservations older than ``timeout_seconds`` belong to writers that died
+    and no longer hold the feed back.
+    """
+    counter = counters.find_one({"_id": "roster_seq"}) or {"seq": 0}
+    cutoff = (now or datetime.now()) - timedelta(seconds=timeout_seconds)
+    pending = reservations.find_one({"reserved_at": {"$gte": cutoff}}, sort=[("floor", 1)])
+    limit = counter["seq"] + 1
+    return min(limit, pending["floor"]) if pending else limit
+
+
+def collect_roster_changes(roster, tombstones, since: int, limit: int, seq_limit: int) -> Dict[str, Any]:
+    """Collect roster upserts and deletes after a change sequence, in order
+    
+    Changes at or above ``seq_limit`` (see ``committed_seq_limit``) are held
+    back, so a later write committing first cannot make a client skip it.
+    """
+    seq_filter = {"updated_seq": {"$gt": since, "$lt": seq_limit}}
+    updated = list(roster.find(seq_filter, {"_id": 0}).sort("updated_seq", 1).limit(limit))
+    deleted = list(tombstones.find(seq_filter, {"_id": 0}).sort("updated_seq", 1).limit(limit))
+    
+    changes = [{"op": "upsert", "seq": entry["updated_seq"], "entry": entry} for entry in updated]
+    changes += [{"op": "delete", "seq": tombstone["updated_seq"], "id": tombstone["id"], "date": tombstone.get("date")} for tombstone in deleted]
+    changes.sort(key=lambda change: change["seq"])
+    
+    has_more = len(changes) > limit or len(updated) == limit or len(deleted) == limit
+    changes = changes[:limit]
+    
+    return {
+        "since": since,
+        "latest_seq": changes[-1]["seq"] if changes else since,
+        "has_more": has_more,
+        "changes": changes
+    }
+
+
+def roster_entries_after(last_date: str, last_id: str) -> Dict[str, Any]:
+    """Query for the roster entries after (last_date, last_id) in (date, id) order"""
+    return {"$or": [
+        {"date": {"$gt": last_date}},
+        {"date": last_date, "id": {"$gt": last_id}}
+    ]}
+
+
+def parse_roster_resume_token(resume_token: str) -> Dict[str, Any]:
+    """Build the query that continues a roster feed after a "<date>|<id>" token
+    
+    Raises ValueError for a token without a separator or a YYYY-MM-DD date;
+    dates are compared as strings, so "2025-1-6" is rejected too.
+    """
+    last_date, separator, last_id = resume_token.partition("|")
+    if not separator:
+        raise ValueError(f"Resume token {resume_token!r} has no '|' separator")
+    if datetime.strptime(last_date, "%Y-%m-%d").strftime("%Y-%m-%d") != last_date:
+        raise ValueError(f"Resume token date {last_date!r} is not YYYY-MM-DD")
+    return roster_entries_after(last_date, last_id)
+
+
+async def watch_roster_change_stream(db, broker: RosterEventBroker):
+    """Feed the broker from a MongoDB change stream
+    
+    Used instead of in-process publishing when several API workers share
+    one database, so every worker sees every other worker's writes. Needs a
+    replica set or sharded cluster.
+    """
+    pipeline = [{"$match": {"ns.coll": {"$in": ["roster", "roster_tombstones"]}}}]
+    
+    while True:
+        try:
+            async with db.watch(pipeline, full_document="updateLookup") as stream:
+                async for change in stream:
+                    event = _change_to_event(change)
+                    if event:
+                        broker.publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Roster change stream interrupted: {str(e)}")
+            await asyncio.sleep(5)
+
+
+def _change_to_event(change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    collection = change["ns"]["coll"]
+    operation = change["operationType"]
+    document = change.get("fullDocument")
+    
+    if collection == "roster_tombstones":
+        return build_delete_event(document) if operation == "insert" and document else None
+    
+    if not document:
+        return None
+    
+    if operation == "insert":
+        return build_upsert_event(document)
+    
+    # A replaced document existed before, so it is an update carrying every field
+    if operation == "replace":
+        return _entry_event("update", document, _visible_fields(document))
+    
+    if operation == "update":
+        fields = {
+            key: value for key, value in change["updateDescription"]["updatedFields"].items()
+            if key not in VOLATILE_FIELDS
+        }
+        return _entry_event("update", document, fields) if fields else None
+    
+    return None
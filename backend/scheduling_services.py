@@ -0,0 +1,347 @@
+"""
+Scheduling Services for Workforce Management System
+Shift interval indexing and double-booking detection
+"""
+
+from typing import List, Optional, Dict, Any, Iterable, NamedTuple, Tuple
+from datetime import date
+from bisect import bisect_left, insort
+import heapq
+
+MINUTES_PER_HOUR = 60
+MINUTES_PER_DAY = 24 * MINUTES_PER_HOUR
+
+# Shifts never run longer than a day (overnight shifts wrap at most once), so
+# any shift overlapping a range must start less than a day before it ends
+MAX_SHIFT_MINUTES = MINUTES_PER_DAY
+
+
+class ShiftInterval(NamedTuple):
+    start: int  # Absolute minutes since 0001-01-01
+    end: int
+    entry_id: str
+
+
+def parse_time_minutes(time_str: str) -> int:
+    """Minutes past midnight for an HH:MM time"""
+    hour, minute = map(int, time_str.split(":"))
+    return hour * 60 + minute
+
+
+def shift_interval(date_str: str, start_time: str, end_time: str) -> Tuple[int, int]:
+    """Absolute minute range of a shift; overnight shifts end on the next day"""
+    day_start = date.fromisoformat(date_str).toordinal() * MINUTES_PER_DAY
+    start = parse_time_minutes(start_time)
+    end = parse_time_minutes(end_time)
+    
+    # Handle overnight shifts
+    if end <= start:
+        end += MINUTES_PER_DAY
+    
+    return day_start + start, day_start + end
+
+
+def format_absolute_minutes(minutes: int) -> str:
+    """Render absolute minutes as 'YYYY-MM-DD HH:MM'"""
+    day, minute_of_day = divmod(minutes, MINUTES_PER_DAY)
+    return f"{date.fromordinal(day).isoformat()} {minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+
+def entry_interval(entry: Dict[str, Any]) -> ShiftInterval:
+    start, end = shift_interval(entry["date"], entry["start_time"], entry["end_time"])
+    return ShiftInterval(start, end, entry["id"])
+
+
+class StaffIntervalIndex:
+    """Sorted shift intervals per staff member
+    
+    Intervals are kept ordered by start minute, so checking a new assignment
+    is a bisect over one staff member's shifts plus a scan of the few shifts
+    that start within a day of it.
+    """
+    
+    def __init__(self):
+        self._intervals: Dict[str, List[ShiftInterval]] = {}
+        self._entries: Dict[str, Tuple[str, ShiftInterval]] = {}
+    
+    @classmethod
+    def from_entries(cls, entries: Iterable[Dict[str, Any]]) -> "StaffIntervalIndex":
+        index = cls()
+        for entry in entries:
+            index.add_entry(entry)
+        return index
+    
+    def add_entry(self, entry: Dict[str, Any]) -> bool:
+        """Index a roster entry; unassigned entries are ignored"""
+        staff_id = entry.get("staff_id")
+        if not staff_id:
+            return False
+        self.add(staff_id, entry_interval(entry))
+        return True
+    
+    def add(self, staff_id: str, interval: ShiftInterval):
+        self.remove(interval.entry_id)
+        insort(self._intervals.setdefault(staff_id, []), interval)
+        self._entries[interval.entry_id] = (staff_id, interval)
+    
+    def remove(self, entry_id: str) -> bool:
+        indexed = self._entries.pop(entry_id, None)
+        if indexed is None:
+            return False
+        staff_id, interval = indexed
+        intervals = self._intervals[staff_id]
+        del intervals[bisect_left(intervals, interval)]
+        return True
+    
+    def staff_intervals(self, staff_id: str) -> List[ShiftInterval]:
+        """All indexed shifts of a staff member in start order"""
+        return list(self._intervals.get(staff_id, []))
+    
+    def overlaps(
+        self,
+        staff_id: str,
+        start: int,
+        end: int,
+        exclude_id: Optional[str] = None
+    ) -> List[ShiftInterval]:
+        """Shifts of a staff member that overlap [start, end)"""
+        intervals = self._intervals.get(staff_id)
+        if not intervals:
+            return []
+        
+        lo = bisect_left(intervals, (start - MAX_SHIFT_MINUTES,))
+        hi = bisect_left(intervals, (end,))
+        return [
+            interval for interval in intervals[lo:hi]
+            if interval.end > start and interval.entry_id != exclude_id
+        ]
+    
+    def entry_overlaps(self, entry: Dict[str, Any]) -> List[ShiftInterval]:
+        """Other shifts that overlap a roster entry's assignment"""
+        if not entry.get("staff_id"):
+            return []
+        interval = entry_interval(entry)
+        return self.overlaps(entry["staff_id"], interval.start, interval.end, exclude_id=entry["id"])
+
+
+def describe_overlap(entry: Dict[str, Any], other: ShiftInterval) -> Dict[str, Any]:
+    """Conflict record for an entry that overlaps another indexed shift"""
+    interval = entry_interval(entry)
+    return {
+        "staff_id": entry.get("staff_id"),
+        "staff_name": entry.get("staff_name"),
+        "entry_id": entry["id"],
+        "date": entry["date"],
+        "conflicting_entry_id": other.entry_id,
+        "overlap_start": format_absolute_minutes(max(interval.start, other.start)),
+        "overlap_end": format_absolute_minutes(min(interval.end, other.end)),
+        "overlap_minutes": min(interval.end, other.end) - max(interval.start, other.start)
+    }
+
+
+def find_roster_conflicts(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Find every pair of overlapping shifts assigned to the same staff member
+    
+    Each staff member's shifts are swept once in start order while a heap
+    holds the shifts still running, so the report costs O(n log n) plus the
+    number of conflicts found.
+    """
+    by_staff: Dict[str, List[Tuple[ShiftInterval, Dict[str, Any]]]] = {}
+    for entry in entries:
+        if entry.get("staff_id"):
+            by_staff.setdefault(entry["staff_id"], []).append((entry_interval(entry), entry))
+    
+    conflicts = []
+    for staff_id, shifts in by_staff.items():
+        shifts.sort(key=lambda shift: shift[0])
+        running = []  # heap of (end, position)
+        for position, (interval, entry) in enumerate(shifts):
+            while running and running[0][0] <= interval.start:
+                heapq.heappop(running)
+            for _, other_position in running:
+                other_interval, other_entry = shifts[other_position]
+                conflict = describe_overlap(other_entry, interval)
+                conflict["conflicting_date"] = entry["date"]
+                conflicts.append(conflict)
+            heapq.heappush(running, (interval.end, position))
+    
+    conflicts.sort(key=lambda conflict: (conflict["overlap_start"], conflict["staff_id"]))
+    return conflicts
+
+
+def find_new_shift_conflicts(
+    new_entries: Iterable[Dict[str, Any]],
+    existing_entries: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Double bookings that adding ``new_entries`` to ``existing_entries`` would create
+    
+    Pass the existing shifts that will remain, including the days either
+    side of the new shifts so overnight shifts are seen. Conflicts only
+    between existing shifts are left out.
+    """
+    new_entries = list(new_entries)
+    new_ids = {entry["id"] for entry in new_entries}
+    return [
+        conflict for conflict in find_roster_conflicts(new_entries + list(existing_entries))
+        if conflict["entry_id"] in new_ids or conflict["conflicting_entry_id"] in new_ids
+    ]
+
+
+# Award compliance defaults: minimum break between shifts and ordinary hours per ISO week
+MIN_REST_GAP_HOURS = 10
+WEEKLY_ORDINARY_HOURS_CAP = 38
+
+
+def iso_week_key(date_str: str) -> str:
+    """ISO week label such as '2025-W02' for a YYYY-MM-DD date"""
+    year, week, _ = date.fromisoformat(date_str).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _is_sleepover(entry: Dict[str, Any]) -> bool:
+    """Sleepover status, honouring the manual override"""
+    if entry.get("manual_sleepover") is not None:
+        return entry["manual_sleepover"]
+    return entry.get("is_sleepover", False)
+
+
+def ordinary_minutes(entry: Dict[str, Any], interval: Optional[ShiftInterval] = None) -> int:
+    """Minutes a shift counts towards the weekly cap
+    
+    Sleepovers only count their wake time beyond the two hours covered by
+    the allowance; every other shift counts its full length.
+    """
+    if _is_sleepover(entry):
+        wake_minutes = int(round((entry.get("wake_hours") or 0) * MINUTES_PER_HOUR))
+        return max(0, wake_minutes - 2 * MINUTES_PER_HOUR)
+    
+    interval = interval or entry_interval(entry)
+    return interval.end - interval.start
+
+
+def cap_minutes(hours_cap: float) -> int:
+    """Whole minutes of an hours cap"""
+    return int(round(hours_cap * MINUTES_PER_HOUR))
+
+
+def display_hours(minutes: int) -> float:
+    """Hours for display, rounded to two places"""
+    return round(minutes / MINUTES_PER_HOUR, 2)
+
+
+def evaluate_staff_compliance(
+    entries: Iterable[Dict[str, Any]],
+    min_rest_hours: float = MIN_REST_GAP_HOURS,
+    weekly_hours_cap: float = WEEKLY_ORDINARY_HOURS_CAP,
+    count_from: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Check rest gaps and weekly hours for every staff member in one pass
+    
+    Each staff member's shifts are sorted once and swept in order: the gap
+    to the latest finishing earlier shift gives the rest break, and hours
+    are bucketed by the ISO week the shift starts in. Breaks next to a
+    sleepover are exempt, matching the calendar's break warnings.
+    
+    Shifts dated before ``count_from`` only provide the previous shift for
+    the first rest gap; they are not counted or reported themselves. Time is
+    summed in whole minutes and reported in hours.
+    """
+    min_rest_minutes = cap_minutes(min_rest_hours)
+    weekly_minutes_cap = cap_minutes(weekly_hours_cap)
+    
+    by_staff: Dict[str, List[Tuple[ShiftInterval, Dict[str, Any]]]] = {}
+    for entry in entries:
+        if entry.get("staff_id"):
+            by_staff.setdefault(entry["staff_id"], []).append((entry_interval(entry), entry))
+    
+    report = {}
+    for staff_id, shifts in by_staff.items():
+        shifts.sort(key=lambda shift: shift[0])
+        
+        weekly_minutes: Dict[str, int] = {}
+        rest_violations = []
+        previous = None  # (interval, entry) of the shift finishing last so far
+        
+        shift_count = 0
+        for interval, entry in shifts:
+            if count_from and entry["date"] < count_from:
+                if previous is None or interval.end >= previous[0].end:
+                    previous = (interval, entry)
+                continue
+            
+            shift_count += 1
+            week = iso_week_key(entry["date"])
+            weekly_minutes[week] = weekly_minutes.get(week, 0) + ordinary_minutes(entry, interval)
+            
+            if previous is not None:
+                previous_interval, previous_entry = previous
+                gap = interval.start - previous_interval.end
+                if 0 <= gap < min_rest_minutes and not (_is_sleepover(entry) or _is_sleepover(previous_entry)):
+                    rest_violations.append({
+                        "entry_id": entry["id"],
+                        "previous_entry_id": previous_entry["id"],
+                        "date": entry["date"],
+                        "previous_end": format_absolute_minutes(previous_interval.end),
+                        "next_start": format_absolute_minutes(interval.start),
+                        "rest_hours": display_hours(gap)
+                    })
+            
+            if previous is None or interval.end >= previous[0].end:
+                previous = (interval, entry)
+        
+        overtime_minutes = {
+            week: minutes - weekly_minutes_cap
+            for week, minutes in weekly_minutes.items()
+            if minutes > weekly_minutes_cap
+        }
+        weekly_violations = [
+            {
+                "week": week,
+                "hours": display_hours(weekly_minutes[week]),
+                "overtime_hours": display_hours(minutes)
+            }
+            for week, minutes in sorted(overtime_minutes.items())
+        ]
+        
+        if not shift_count:
+            continue
+        
+        report[staff_id] = {
+            "staff_id": staff_id,
+            "staff_name": shifts[-1][1].get("staff_name"),
+            "shift_count": shift_count,
+            "ordinary_hours": display_hours(sum(weekly_minutes.values())),
+            "overtime_hours": display_hours(sum(overtime_minutes.values())),
+            "weekly_hours": {week: display_hours(minutes) for week, minutes in sorted(weekly_minutes.items())},
+            "rest_gap_violations": rest_violations,
+            "weekly_cap_violations": weekly_violations
+        }
+    
+    return report
+
+
+def weekly_overtime_minutes(
+    entries: Iterable[Dict[str, Any]],
+    weekly_hours_cap: float = WEEKLY_ORDINARY_HOURS_CAP,
+    count_from: Optional[str] = None,
+    count_to: Optional[str] = None
+) -> int:
+    """Overtime for one person's shifts: minutes above the cap in each ISO week
+    
+    Pass whole ISO weeks of shifts. Minutes are taken in shift order, and
+    overtime only counts when it falls on shifts dated within
+    [``count_from``, ``count_to``]. Shifts outside that range still count
+    towards their week's cap, so a pay period that cuts through a week gets
+    that week's overtime only once.
+    """
+    weekly_minutes_cap = cap_minutes(weekly_hours_cap)
+    weekly_minutes: Dict[str, int] = {}
+    overtime = 0
+    for interval, entry in sorted(((entry_interval(entry), entry) for entry in entries), key=lambda shift: shift[0]):
+        week = iso_week_key(entry["date"])
+        before = weekly_minutes.get(week, 0)
+        weekly_minutes[week] = before + ordinary_minutes(entry, interval)
+        if (count_from and entry["date"] < count_from) or (count_to and entry["date"] > count_to):
+            continue
+        overtime += max(0, weekly_minutes[week] - max(before, weekly_minutes_cap))
+    return overtime
@@ -1,16 +1,75 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple, Union
 from datetime import datetime, time, timedelta, date
 import os
 import uuid
 from enum import Enum
 import io
+import json
+import asyncio
+from contextlib import contextmanager
 from export_services import ExportService, HolidayService
+from assignment_services import ShiftAssignmentSolver
+from availability_services import AvailabilityIndex, describe_interval, parse_availability_time
+from analytics_services import PRICING_FIELDS, simulate_rate_change
+from pay_services import (
+    HOUR_BUCKET_FIELDS,
+    MINUTE_BUCKET_FIELDS,
+    SLEEPOVER_ALLOWANCE_CENTS,
+    RateSchedule,
+    cents_to_dollars,
+    entry_cents,
+    entry_minutes,
+    hour_buckets,
+    minute_buckets,
+    minutes_to_hours,
+    pay_cents,
+    rate_timeline,
+    summarize_roster_pay,
+    to_cents
+)
+from recurrence_services import (
+    DAY_NAMES,
+    TEMPLATE_SHIFT_FIELDS,
+    CompiledRotation,
+    compile_template_weekday_table,
+    empty_forecast_totals,
+    forecast_weekly_pattern,
+    template_pattern_summary,
+    template_shifts_by_date,
+    weekday_counts
+)
+from scheduling_services import (
+    MINUTES_PER_DAY,
+    MIN_REST_GAP_HOURS,
+    WEEKLY_ORDINARY_HOURS_CAP,
+    StaffIntervalIndex,
+    describe_overlap,
+    entry_interval,
+    evaluate_staff_compliance,
+    find_new_shift_conflicts,
+    find_roster_conflicts,
+    iso_week_key,
+    parse_time_minutes
+)
+from roster_events import (
+    RosterEventBroker,
+    build_bulk_event,
+    build_delete_event,
+    build_replay_event,
+    build_upsert_event,
+    collect_roster_changes,
+    committed_seq_limit,
+    parse_roster_resume_token,
+    roster_entries_after,
+    watch_roster_change_stream
+)
 
 # Database setup
 MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
@@ -23,12 +82,43 @@ db = client[DB_NAME]
 motor_client = AsyncIOMotorClient(MONGO_URL)
 motor_db = motor_client[DB_NAME]
 
+# Roster change events: "local" publishes from this process's write handlers,
+# "change_stream" follows MongoDB so every worker sees every write
+ROSTER_EVENTS_SOURCE = os.environ.get("ROSTER_EVENTS_SOURCE", "local")
+
 # Initialize services
 export_service = ExportService(motor_db)
 holiday_service = HolidayService()
+roster_event_broker = RosterEventBroker()
 
 app = FastAPI(title="Shift Roster & Pay Calculator")
 
+# Largest number of operations accepted by POST /api/roster/batch
+MAX_ROSTER_BATCH_OPERATIONS = 5000
+
+# Roster entries per chunk written by the NDJSON roster feed
+ROSTER_STREAM_CHUNK_SIZE = 500
+
+# Range generation: longest range accepted and roster entries per insert_many
+MAX_GENERATION_RANGE_DAYS = 731
+ROSTER_INSERT_CHUNK_SIZE = 5000
+
+# Server-Sent Events: idle keep-alive interval and how many missed changes a
+# reconnecting client is replayed before being told to resync instead
+ROSTER_EVENTS_KEEPALIVE_SECONDS = 15
+ROSTER_EVENTS_REPLAY_LIMIT = 1000
+
+# Change feed: a sequence reserved longer ago than this is treated as
+# abandoned by a failed writer, and deletions are kept this many days
+ROSTER_SEQ_RESERVATION_TIMEOUT_SECONDS = 300
+ROSTER_TOMBSTONE_RETENTION_DAYS = 90
+
+# Roster entries with nobody assigned; matches the partial index on open shifts
+UNFILLED_SHIFT_FILTER = {"staff_id": {"$type": "null"}}
+
+# Coverage report bands by shift start time: (band, first start time in band)
+COVERAGE_TIME_BANDS = [("night", "00:00"), ("day", "06:00"), ("evening", "20:00")]
+
 # CORS setup
 app.add_middleware(
     CORSMiddleware,
@@ -43,6 +133,11 @@ class PayMode(str, Enum):
     DEFAULT = "default"
     SCHADS = "schads"
 
+class RosterBatchOp(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
 class ShiftType(str, Enum):
     WEEKDAY_DAY = "weekday_day"
     WEEKDAY_EVENING = "weekday_evening"
@@ -59,6 +154,16 @@ class Staff(BaseModel):
     active: bool = True
     created_at: datetime = None
 
+class AvailabilityInterval(BaseModel):
+    id: Optional[str] = None
+    start: str  # YYYY-MM-DD HH:MM, or YYYY-MM-DD for whole days
+    end: str  # YYYY-MM-DD HH:MM, or YYYY-MM-DD to include that whole day
+    reason: str = "leave"  # leave, unavailable, ...
+
+class StaffAvailability(BaseModel):
+    unavailable: List[AvailabilityInterval] = []
+    max_weekly_hours: Optional[float] = None  # Preferred most hours per ISO week
+
 class ShiftTemplate(BaseModel):
     id: str
     name: str
@@ -73,7 +178,7 @@ class RosterTemplate(BaseModel):
     description: Optional[str] = None
     shifts: List[Dict[str, Any]]  # List of shift configurations for the month
     created_at: datetime = None
-    
+
 class RosterTemplateShift(BaseModel):
     day_of_week: int  # 0=Monday, 1=Tuesday, ..., 6=Sunday
     start_time: str
@@ -84,6 +189,31 @@ class RosterTemplateShift(BaseModel):
     manual_sleepover: Optional[bool] = None
     wake_hours: Optional[float] = None
 
+class RecurringShift(BaseModel):
+    start_time: str
+    end_time: str
+    is_sleepover: bool = False
+    manual_shift_type: Optional[str] = None
+    manual_hourly_rate: Optional[float] = None
+    manual_sleepover: Optional[bool] = None
+    wake_hours: Optional[float] = None
+
+class RotationShift(RecurringShift):
+    cycle_day: int  # 0 = the anchor date, up to cycle_length_days - 1
+    shifts_per_day: int = 1
+
+class RotationException(BaseModel):
+    date: str  # YYYY-MM-DD
+    shifts: List[RecurringShift] = []  # Replaces the cycle's shifts that day; empty = no shifts
+
+class RotationTemplate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    cycle_length_days: int  # e.g. 14 for a fortnightly rotation
+    anchor_date: str  # YYYY-MM-DD that is day 0 of the cycle
+    shifts: List[RotationShift]
+    exceptions: List[RotationException] = []
+
 class RosterEntry(BaseModel):
     id: str
     date: str  # YYYY-MM-DD
@@ -98,10 +228,41 @@ class RosterEntry(BaseModel):
     manual_hourly_rate: Optional[float] = None  # Manual override for hourly rate
     manual_sleepover: Optional[bool] = None  # Manual override for sleepover status
     wake_hours: Optional[float] = None  # Additional wake hours beyond 2 hours
+    rate_version: Optional[str] = None  # Rate table version the pay was calculated with
     hours_worked: float = 0.0
     base_pay: float = 0.0
     sleepover_allowance: float = 0.0
     total_pay: float = 0.0
+    # Exact amounts the pay is calculated and summed in; the hour and dollar
+    # fields above are display copies derived from them
+    minutes_worked: int = 0
+    base_pay_cents: int = 0
+    sleepover_allowance_cents: int = 0
+    total_pay_cents: int = 0
+    # Pay classification and paid minutes per rate band, stored when the pay
+    # is calculated so reports aggregate them instead of reclassifying
+    # shifts; the hour fields are display copies
+    shift_type: Optional[str] = None
+    regular_minutes: int = 0
+    evening_minutes: int = 0
+    night_minutes: int = 0
+    saturday_minutes: int = 0
+    sunday_minutes: int = 0
+    public_holiday_minutes: int = 0
+    regular_hours: float = 0.0
+    evening_hours: float = 0.0
+    night_hours: float = 0.0
+    saturday_hours: float = 0.0
+    sunday_hours: float = 0.0
+    public_holiday_hours: float = 0.0
+    updated_seq: Optional[int] = None  # Change feed sequence, stamped on every write
+    created_seq: Optional[int] = None  # Change feed sequence of the write that created the entry
+    updated_at: Optional[datetime] = None
+
+class RateVersion(BaseModel):
+    effective_from: str  # YYYY-MM-DD the rates apply from
+    rates: Dict[str, float]  # Overrides of the rates in force before this date
+    note: Optional[str] = None
 
 class Settings(BaseModel):
     pay_mode: PayMode = PayMode.DEFAULT
@@ -115,6 +276,73 @@ class Settings(BaseModel):
         "sleepover_default": 175.00,
         "sleepover_schads": 60.02
     }
+    rate_versions: List[RateVersion] = []  # Effective-dated rate changes, sorted by date
+    
+    def rate_schedule(self) -> RateSchedule:
+        """Base rates plus dated versions, for looking up the rates of a shift date"""
+        return RateSchedule(self.rates, [version.dict() for version in self.rate_versions], self.pay_mode.value)
+
+class RosterEntryPatch(BaseModel):
+    """Partial roster entry update; only fields present in the request are applied"""
+    date: Optional[str] = None
+    shift_template_id: Optional[str] = None
+    staff_id: Optional[str] = None
+    staff_name: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    is_sleepover: Optional[bool] = None
+    is_public_holiday: Optional[bool] = None
+    manual_shift_type: Optional[str] = None
+    manual_hourly_rate: Optional[float] = None
+    manual_sleepover: Optional[bool] = None
+    wake_hours: Optional[float] = None
+
+# Roster fields that feed calculate_pay; changing any other field keeps the stored pay
+PAY_AFFECTING_FIELDS = {
+    "date", "start_time", "end_time", "is_sleepover", "is_public_holiday",
+    "manual_shift_type", "manual_hourly_rate", "manual_sleepover", "wake_hours"
+}
+# Roster fields that place a shift on a staff member's timeline
+SCHEDULE_FIELDS = {"staff_id", "date", "start_time", "end_time"}
+# Pay classification stored alongside the pay
+PAY_BREAKDOWN_FIELDS = ["shift_type"] + MINUTE_BUCKET_FIELDS + HOUR_BUCKET_FIELDS
+PAY_RESULT_FIELDS = [
+    "is_public_holiday", "rate_version", "hours_worked", "base_pay", "sleepover_allowance", "total_pay",
+    "minutes_worked", "base_pay_cents", "sleepover_allowance_cents", "total_pay_cents"
+] + PAY_BREAKDOWN_FIELDS
+
+class RosterBatchOperation(BaseModel):
+    op: RosterBatchOp
+    id: Optional[str] = None  # Target entry for update/delete
+    entry: Optional[Dict[str, Any]] = None  # RosterEntry fields for create/update
+
+class RosterBatchRequest(BaseModel):
+    operations: List[RosterBatchOperation]
+    ordered: bool = True  # Stop at the first failing operation, like an ordered bulk write
+    allow_overlap: bool = False  # Skip the double-booking check
+
+class RateSimulationRequest(BaseModel):
+    start: str  # YYYY-MM-DD
+    end: str  # YYYY-MM-DD
+    rates: Dict[str, float]  # Candidate rates; missing keys keep the current rate
+
+class AutoAssignRequest(BaseModel):
+    start: str  # YYYY-MM-DD
+    end: str  # YYYY-MM-DD
+    min_rest_hours: float = MIN_REST_GAP_HOURS
+    weekly_hours_cap: float = WEEKLY_ORDINARY_HOURS_CAP
+    allow_overtime: bool = False  # Treat the weekly cap as a cost instead of a hard limit
+    time_limit_seconds: float = 2.0  # Budget for the local search after the greedy pass
+
+class ShiftAssignment(BaseModel):
+    entry_id: str
+    staff_id: str
+
+class AutoAssignCommitRequest(BaseModel):
+    assignments: List[ShiftAssignment]
+    min_rest_hours: float = MIN_REST_GAP_HOURS  # Same constraints as the preview
+    weekly_hours_cap: float = WEEKLY_ORDINARY_HOURS_CAP
+    allow_overtime: bool = False
 
 # Pay calculation functions
 def determine_shift_type(date_str: str, start_time: str, end_time: str, is_public_holiday: bool) -> ShiftType:
@@ -173,13 +401,101 @@ def calculate_hours_worked(start_time: str, end_time: str) -> float:
     total_minutes = end_minutes - start_minutes
     return total_minutes / 60.0
 
-def calculate_pay(roster_entry: RosterEntry, settings: Settings) -> RosterEntry:
-    """Calculate pay for a roster entry with sleepover logic and Queensland public holiday detection"""
-    hours = calculate_hours_worked(roster_entry.start_time, roster_entry.end_time)
-    roster_entry.hours_worked = hours
+def shift_minutes(start_time: str, end_time: str) -> Tuple[int, int]:
+    """Start and end minutes past midnight; overnight shifts end after 1440"""
+    start_minutes = parse_time_minutes(start_time)
+    end_minutes = parse_time_minutes(end_time)
+    if end_minutes <= start_minutes:
+        end_minutes += MINUTES_PER_DAY
+    return start_minutes, end_minutes
+
+def crosses_midnight(roster_entry: RosterEntry) -> bool:
+    return shift_minutes(roster_entry.start_time, roster_entry.end_time)[1] > MINUTES_PER_DAY
+
+def next_day_is_public_holiday(roster_entry: RosterEntry) -> bool:
+    """Whether an overnight shift runs into a Queensland public holiday"""
+    if not crosses_midnight(roster_entry):
+        return False
+    try:
+        next_day = datetime.strptime(roster_entry.date, "%Y-%m-%d").date() + timedelta(days=1)
+        return holiday_service.is_public_holiday(next_day, "QLD")
+    except Exception as e:
+        print(f"Error checking public holiday after {roster_entry.date}: {e}")
+        return False
+
+def segmented_base_pay(roster_entry: RosterEntry, rates: Dict[str, float], next_day_public_holiday: bool) -> int:
+    """Pay in cents, each part of the shift at the rate of the band it falls in (SCHADS pay mode)"""
+    start_minutes, end_minutes = shift_minutes(roster_entry.start_time, roster_entry.end_time)
+    return rate_timeline(rates).price(
+        datetime.strptime(roster_entry.date, "%Y-%m-%d").weekday(),
+        start_minutes,
+        end_minutes,
+        roster_entry.is_public_holiday,
+        next_day_public_holiday
+    )
+
+def segmented_rate_minutes(roster_entry: RosterEntry, rates: Dict[str, float], next_day_public_holiday: bool) -> Dict[str, int]:
+    """Minutes of a shift in each SCHADS rate band, matching segmented_base_pay"""
+    start_minutes, end_minutes = shift_minutes(roster_entry.start_time, roster_entry.end_time)
+    return rate_timeline(rates).segment_minutes(
+        datetime.strptime(roster_entry.date, "%Y-%m-%d").weekday(),
+        start_minutes,
+        end_minutes,
+        roster_entry.is_public_holiday,
+        next_day_public_holiday
+    )
+
+def apply_pay_breakdown(roster_entry: RosterEntry, rate_minutes: Dict[str, int]):
+    """Store the shift type and the paid minutes per rate band, with their hour copies, on an entry"""
+    roster_entry.shift_type = roster_entry_shift_type(roster_entry)
+    buckets = minute_buckets(rate_minutes)
+    for field, value in {**buckets, **hour_buckets(buckets)}.items():
+        setattr(roster_entry, field, value)
+
+def apply_pay_amounts(roster_entry: RosterEntry, minutes_worked: int, base_pay_cents: int, sleepover_allowance_cents: int):
+    """Store exact pay amounts on an entry along with their hour and dollar display copies"""
+    roster_entry.minutes_worked = minutes_worked
+    roster_entry.base_pay_cents = base_pay_cents
+    roster_entry.sleepover_allowance_cents = sleepover_allowance_cents
+    roster_entry.total_pay_cents = base_pay_cents + sleepover_allowance_cents
+    
+    roster_entry.hours_worked = minutes_to_hours(minutes_worked)
+    roster_entry.base_pay = cents_to_dollars(base_pay_cents)
+    roster_entry.sleepover_allowance = cents_to_dollars(sleepover_allowance_cents)
+    roster_entry.total_pay = cents_to_dollars(roster_entry.total_pay_cents)
+
+def calculate_pay(
+    roster_entry: RosterEntry,
+    settings: Settings,
+    detect_public_holiday: bool = True,
+    next_day_public_holiday: Optional[bool] = None,
+    rate_schedule: Optional[RateSchedule] = None
+) -> RosterEntry:
+    """Calculate pay for a roster entry with sleepover logic and Queensland public holiday detection
+    
+    Callers that have already resolved ``is_public_holiday`` pass
+    ``detect_public_holiday=False`` to keep their flag. In SCHADS pay mode
+    ordinary shifts are split across rate bands, and overnight shifts need
+    to know whether the next day is a public holiday; it is looked up when
+    ``next_day_public_holiday`` is not given.
+    
+    Rates come from the rate table version in force on the shift date, and
+    that version is recorded on the entry. Bulk callers pass a prebuilt
+    ``rate_schedule``.
+    
+    Pay is worked out in whole minutes and cents, rounded once per amount.
+    The shift type and paid hours per rate band are stored with it.
+    """
+    start_minutes, end_minutes = shift_minutes(roster_entry.start_time, roster_entry.end_time)
+    minutes_worked = end_minutes - start_minutes
+    
+    rate_schedule = rate_schedule or settings.rate_schedule()
+    version = rate_schedule.version_index(roster_entry.date)
+    rates = rate_schedule.rate_tables[version]
+    roster_entry.rate_version = rate_schedule.version_keys[version]
     
     # Check if this date is a Queensland public holiday (unless manually overridden)
-    if not roster_entry.manual_shift_type and not roster_entry.is_public_holiday:
+    if detect_public_holiday and not roster_entry.manual_shift_type and not roster_entry.is_public_holiday:
         try:
             date_obj = datetime.strptime(roster_entry.date, "%Y-%m-%d").date()
             # Default to QLD for now - could be enhanced with staff location data
@@ -193,13 +509,13 @@ def calculate_pay(roster_entry: RosterEntry, settings: Settings) -> RosterEntry:
     
     if is_sleepover:
         # Sleepover calculation: $175 flat rate includes 2 hours
-        roster_entry.sleepover_allowance = 175.00  # Fixed $175 per night
+        sleepover_allowance_cents = SLEEPOVER_ALLOWANCE_CENTS  # Fixed $175 per night
         
         # Additional wake hours beyond 2 hours at applicable hourly rate
-        wake_hours = roster_entry.wake_hours if roster_entry.wake_hours else 0
-        extra_wake_hours = max(0, wake_hours - 2) if wake_hours > 2 else 0
+        wake_minutes = int(round((roster_entry.wake_hours or 0) * 60))
+        extra_wake_minutes = max(0, wake_minutes - 2 * 60)
         
-        if extra_wake_hours > 0:
+        if extra_wake_minutes > 0:
             # Get applicable hourly rate for extra wake time
             if roster_entry.manual_hourly_rate:
                 hourly_rate = roster_entry.manual_hourly_rate
@@ -225,69 +541,197 @@ def calculate_pay(roster_entry: RosterEntry, settings: Settings) -> RosterEntry:
                 
                 # Get hourly rate based on shift type
                 if shift_type == ShiftType.PUBLIC_HOLIDAY:
-                    hourly_rate = settings.rates["public_holiday"]
+                    hourly_rate = rates["public_holiday"]
                 elif shift_type == ShiftType.SATURDAY:
-                    hourly_rate = settings.rates["saturday"]
+                    hourly_rate = rates["saturday"]
                 elif shift_type == ShiftType.SUNDAY:
-                    hourly_rate = settings.rates["sunday"]
+                    hourly_rate = rates["sunday"]
                 elif shift_type == ShiftType.WEEKDAY_EVENING:
-                    hourly_rate = settings.rates["weekday_evening"]
+                    hourly_rate = rates["weekday_evening"]
                 elif shift_type == ShiftType.WEEKDAY_NIGHT:
-                    hourly_rate = settings.rates["weekday_night"]
+                    hourly_rate = rates["weekday_night"]
                 else:
-                    hourly_rate = settings.rates["weekday_day"]
+                    hourly_rate = rates["weekday_day"]
             
-            roster_entry.base_pay = extra_wake_hours * hourly_rate
+            base_pay_cents = pay_cents(extra_wake_minutes, to_cents(hourly_rate))
+            rate_minutes = {rate_shift_type(roster_entry): extra_wake_minutes}
         else:
-            roster_entry.base_pay = 0  # Only sleepover allowance
-            
+            base_pay_cents = 0  # Only sleepover allowance
+            rate_minutes = {}
+    
     else:
         # Regular shift calculation
-        roster_entry.sleepover_allowance = 0
+        sleepover_allowance_cents = 0
         
-        # Use manual hourly rate if provided
-        if roster_entry.manual_hourly_rate:
-            hourly_rate = roster_entry.manual_hourly_rate
+        if settings.pay_mode == PayMode.SCHADS and not roster_entry.manual_hourly_rate and not roster_entry.manual_shift_type:
+            if next_day_public_holiday is None:
+                next_day_public_holiday = next_day_is_public_holiday(roster_entry) if detect_public_holiday else False
+            base_pay_cents = segmented_base_pay(roster_entry, rates, next_day_public_holiday)
+            rate_minutes = segmented_rate_minutes(roster_entry, rates, next_day_public_holiday)
         else:
-            # Use manual shift type if provided, otherwise determine automatically
-            if roster_entry.manual_shift_type:
-                shift_type_map = {
-                    "weekday_day": ShiftType.WEEKDAY_DAY,
-                    "weekday_evening": ShiftType.WEEKDAY_EVENING,
-                    "weekday_night": ShiftType.WEEKDAY_NIGHT,
-                    "saturday": ShiftType.SATURDAY,
-                    "sunday": ShiftType.SUNDAY,
-                    "public_holiday": ShiftType.PUBLIC_HOLIDAY
-                }
-                shift_type = shift_type_map.get(roster_entry.manual_shift_type, ShiftType.WEEKDAY_DAY)
+            # Use manual hourly rate if provided
+            if roster_entry.manual_hourly_rate:
+                hourly_rate = roster_entry.manual_hourly_rate
             else:
-                # Determine shift type automatically
-                shift_type = determine_shift_type(
-                    roster_entry.date, 
-                    roster_entry.start_time, 
-                    roster_entry.end_time,
-                    roster_entry.is_public_holiday
-                )
+                # Use manual shift type if provided, otherwise determine automatically
+                if roster_entry.manual_shift_type:
+                    shift_type_map = {
+                        "weekday_day": ShiftType.WEEKDAY_DAY,
+                        "weekday_evening": ShiftType.WEEKDAY_EVENING,
+                        "weekday_night": ShiftType.WEEKDAY_NIGHT,
+                        "saturday": ShiftType.SATURDAY,
+                        "sunday": ShiftType.SUNDAY,
+                        "public_holiday": ShiftType.PUBLIC_HOLIDAY
+                    }
+                    shift_type = shift_type_map.get(roster_entry.manual_shift_type, ShiftType.WEEKDAY_DAY)
+                else:
+                    # Determine shift type automatically
+                    shift_type = determine_shift_type(
+                        roster_entry.date, 
+                        roster_entry.start_time, 
+                        roster_entry.end_time,
+                        roster_entry.is_public_holiday
+                    )
+                
+                # Get hourly rate based on shift type - Queensland public holiday integration
+                if shift_type == ShiftType.PUBLIC_HOLIDAY:
+                    hourly_rate = rates["public_holiday"]  # $88.50/hr for QLD public holidays
+                elif shift_type == ShiftType.SATURDAY:
+                    hourly_rate = rates["saturday"]
+                elif shift_type == ShiftType.SUNDAY:
+                    hourly_rate = rates["sunday"]
+                elif shift_type == ShiftType.WEEKDAY_EVENING:
+                    hourly_rate = rates["weekday_evening"]
+                elif shift_type == ShiftType.WEEKDAY_NIGHT:
+                    hourly_rate = rates["weekday_night"]
+                else:
+                    hourly_rate = rates["weekday_day"]
             
-            # Get hourly rate based on shift type - Queensland public holiday integration
-            if shift_type == ShiftType.PUBLIC_HOLIDAY:
-                hourly_rate = settings.rates["public_holiday"]  # $88.50/hr for QLD public holidays
-            elif shift_type == ShiftType.SATURDAY:
-                hourly_rate = settings.rates["saturday"]
-            elif shift_type == ShiftType.SUNDAY:
-                hourly_rate = settings.rates["sunday"]
-            elif shift_type == ShiftType.WEEKDAY_EVENING:
-                hourly_rate = settings.rates["weekday_evening"]
-            elif shift_type == ShiftType.WEEKDAY_NIGHT:
-                hourly_rate = settings.rates["weekday_night"]
-            else:
-                hourly_rate = settings.rates["weekday_day"]
-        
-        roster_entry.base_pay = hours * hourly_rate
+            base_pay_cents = pay_cents(minutes_worked, to_cents(hourly_rate))
+            rate_minutes = {rate_shift_type(roster_entry): minutes_worked}
     
-    roster_entry.total_pay = roster_entry.base_pay + roster_entry.sleepover_allowance
+    apply_pay_amounts(roster_entry, minutes_worked, base_pay_cents, sleepover_allowance_cents)
+    apply_pay_breakdown(roster_entry, rate_minutes)
     return roster_entry
 
+def roster_entry_shift_type(roster_entry: RosterEntry) -> str:
+    """Shift type a roster entry is paid as, with sleepovers reported separately"""
+    is_sleepover = roster_entry.manual_sleepover if roster_entry.manual_sleepover is not None else roster_entry.is_sleepover
+    if is_sleepover:
+        return ShiftType.SLEEPOVER.value
+    return rate_shift_type(roster_entry)
+
+def rate_shift_type(roster_entry: RosterEntry) -> str:
+    """Rate key the hours of a roster entry are classified under"""
+    if roster_entry.manual_shift_type:
+        valid_types = {shift_type.value for shift_type in ShiftType}
+        return roster_entry.manual_shift_type if roster_entry.manual_shift_type in valid_types else ShiftType.WEEKDAY_DAY.value
+    
+    return determine_shift_type(
+        roster_entry.date,
+        roster_entry.start_time,
+        roster_entry.end_time,
+        roster_entry.is_public_holiday
+    ).value
+
+class CachedPayCalculator:
+    """Calculate roster pay once per distinct shift shape
+    
+    Pay only depends on the weekday, the public holiday flag, the shift times
+    and the manual overrides (plus, for overnight shifts in SCHADS pay mode,
+    whether the next day is a holiday), so entries sharing those reuse one
+    result.
+    Used by bulk paths that price many entries against the same settings.
+    
+    ``holiday_dates`` (YYYY-MM-DD strings) replaces per-date holiday lookups
+    when the caller already knows the holidays for its whole range. The rate
+    version in force on the date is part of the key.
+    """
+    
+    def __init__(self, settings: Settings, holiday_dates: Optional[Set[str]] = None):
+        self.settings = settings
+        self.rate_schedule = settings.rate_schedule()
+        self.holiday_dates = holiday_dates
+        self._holidays: Dict[str, bool] = {}
+        self._results: Dict[tuple, tuple] = {}  # key -> (rate version, minutes, base cents, allowance cents, breakdown)
+    
+    @property
+    def calculations(self) -> int:
+        """Number of distinct shift shapes actually priced"""
+        return len(self._results)
+    
+    def is_public_holiday(self, date_str: str) -> bool:
+        if self.holiday_dates is not None:
+            return date_str in self.holiday_dates
+        if date_str not in self._holidays:
+            try:
+                date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
+                self._holidays[date_str] = holiday_service.is_public_holiday(date_obj, "QLD")
+            except Exception as e:
+                print(f"Error checking public holiday for {date_str}: {e}")
+                self._holidays[date_str] = False
+        return self._holidays[date_str]
+    
+    def calculate(
+        self,
+        roster_entry: RosterEntry,
+        is_public_holiday: Optional[bool] = None,
+        next_day_public_holiday: Optional[bool] = None
+    ) -> RosterEntry:
+        """Price an entry, reusing the result of an identical shift shape
+        
+        ``is_public_holiday`` and ``next_day_public_holiday`` price the entry
+        as if its date (or the day after) were or were not a public holiday,
+        for callers pricing hypothetical days.
+        """
+        if is_public_holiday is not None:
+            roster_entry.is_public_holiday = is_public_holiday
+        elif not roster_entry.manual_shift_type and not roster_entry.is_public_holiday:
+            roster_entry.is_public_holiday = self.is_public_holiday(roster_entry.date)
+        
+        # Only segmented pay splits overnight shifts at midnight
+        if self.settings.pay_mode != PayMode.SCHADS or not crosses_midnight(roster_entry):
+            next_day_public_holiday = False
+        elif next_day_public_holiday is None:
+            next_day = datetime.strptime(roster_entry.date, "%Y-%m-%d").date() + timedelta(days=1)
+            next_day_public_holiday = self.is_public_holiday(next_day.isoformat())
+        
+        key = (
+            self.rate_schedule.version_index(roster_entry.date),
+            datetime.strptime(roster_entry.date, "%Y-%m-%d").weekday(),
+            roster_entry.is_public_holiday,
+            next_day_public_holiday,
+            roster_entry.start_time,
+            roster_entry.end_time,
+            roster_entry.is_sleepover,
+            roster_entry.manual_shift_type,
+            roster_entry.manual_hourly_rate,
+            roster_entry.manual_sleepover,
+            roster_entry.wake_hours
+        )
+        if key not in self._results:
+            priced = calculate_pay(
+                roster_entry.copy(),
+                self.settings,
+                detect_public_holiday=False,
+                next_day_public_holiday=next_day_public_holiday,
+                rate_schedule=self.rate_schedule
+            )
+            self._results[key] = (
+                priced.rate_version,
+                priced.minutes_worked,
+                priced.base_pay_cents,
+                priced.sleepover_allowance_cents,
+                {field: getattr(priced, field) for field in PAY_BREAKDOWN_FIELDS}
+            )
+        
+        rate_version, minutes_worked, base_pay_cents, sleepover_allowance_cents, breakdown = self._results[key]
+        roster_entry.rate_version = rate_version
+        apply_pay_amounts(roster_entry, minutes_worked, base_pay_cents, sleepover_allowance_cents)
+        for field, value in breakdown.items():
+            setattr(roster_entry, field, value)
+        return roster_entry
+
 # Initialize default data
 def initialize_default_data():
     """Initialize default staff and shift templates"""
@@ -370,11 +814,162 @@ def initialize_default_data():
         settings = Settings()
         db.settings.insert_one(settings.dict())
 
+def ensure_indexes():
+    """Create the indexes the roster queries rely on"""
+    # Date-ordered roster reads (month views, streaming feed with resume)
+    db.roster.create_index([("date", 1), ("id", 1)])
+    # One employee's shifts over a period
+    db.roster.create_index([("staff_id", 1), ("date", 1)])
+    # Change feed reads
+    db.roster.create_index("updated_seq")
+    db.roster_tombstones.create_index("updated_seq")
+    # Tombstones only need to outlive the clients that sync from the change feed
+    db.roster_tombstones.create_index(
+        "updated_at",
+        name="tombstone_retention",
+        expireAfterSeconds=ROSTER_TOMBSTONE_RETENTION_DAYS * 24 * 60 * 60
+    )
+    # Open shifts only, so the unfilled report reads a small index
+    db.roster.create_index(
+        [("date", 1), ("start_time", 1)],
+        name="unfilled_shifts",
+        partialFilterExpression=UNFILLED_SHIFT_FILTER
+    )
+    # One availability document per staff member
+    db.staff_availability.create_index("staff_id", unique=True)
+
+# Roster change tracking
+def next_roster_seq(count: int = 1) -> int:
+    """Reserve ``count`` consecutive change sequence numbers and return the first"""
+    counter = db.counters.find_one_and_update(
+        {"_id": "roster_seq"},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"] - count + 1
+
+@contextmanager
+def reserved_roster_seqs(count: int = 1):
+    """Reserve ``count`` change sequences for a write, held back from the change feed until it finishes
+    
+    Sequences are reserved before the write commits, so concurrent writers
+    can commit them out of order. The reservation is recorded, with a floor
+    no higher than its first sequence, before the counter moves; the change
+    feed only reads below the lowest open reservation.
+    """
+    reservation_id = str(uuid.uuid4())
+    counter = db.counters.find_one({"_id": "roster_seq"}) or {"seq": 0}
+    db.roster_seq_reservations.insert_one({
+        "_id": reservation_id,
+        "floor": counter["seq"] + 1,
+        "reserved_at": datetime.now()
+    })
+    try:
+        yield next_roster_seq(count)
+    finally:
+        db.roster_seq_reservations.delete_one({"_id": reservation_id})
+
+def committed_roster_seq_limit() -> int:
+    """First change sequence the change feed must not read past yet (see ``committed_seq_limit``)"""
+    return committed_seq_limit(db.counters, db.roster_seq_reservations, ROSTER_SEQ_RESERVATION_TIMEOUT_SECONDS)
+
+def stamp_roster_entry(entry: RosterEntry, seq: int, created: bool = False) -> RosterEntry:
+    """Stamp a roster entry with its change sequence before it is written"""
+    entry.updated_seq = seq
+    if created:
+        entry.created_seq = seq
+    entry.updated_at = datetime.now()
+    return entry
+
+def delete_roster_entries(query: Dict[str, Any]) -> int:
+    """Delete matching roster entries, leaving tombstones for the change feed"""
+    deleted = list(db.roster.find(query, {"_id": 0, "id": 1, "date": 1}))
+    if not deleted:
+        return 0
+    
+    with reserved_roster_seqs(len(deleted)) as first_seq:
+        now = datetime.now()
+        tombstones = [
+            {
+                "id": entry["id"],
+                "date": entry.get("date"),
+                "deleted": True,
+                "updated_seq": first_seq + offset,
+                "updated_at": now
+            }
+            for offset, entry in enumerate(deleted)
+        ]
+        db.roster_tombstones.insert_many([dict(tombstone) for tombstone in tombstones])
+        
+        result = db.roster.delete_many({"id": {"$in": [entry["id"] for entry in deleted]}})
+    for tombstone in tombstones:
+        publish_roster_event(build_delete_event(tombstone))
+    return result.deleted_count
+
+def load_staff_interval_index(staff_ids: List[str], start_date: str, end_date: str) -> StaffIntervalIndex:
+    """Index the assigned shifts of some staff members around a date range
+    
+    The range is widened by a day on each side so overnight shifts that
+    cross into it are included.
+    """
+    start = (date.fromisoformat(start_date) - timedelta(days=1)).isoformat()
+    end = (date.fromisoformat(end_date) + timedelta(days=1)).isoformat()
+    entries = db.roster.find(
+        {"staff_id": {"$in": staff_ids}, "date": {"$gte": start, "$lte": end}},
+        {"_id": 0, "id": 1, "date": 1, "start_time": 1, "end_time": 1, "staff_id": 1}
+    )
+    return StaffIntervalIndex.from_entries(entries)
+
+def load_availability_index(staff_ids: Optional[List[str]] = None) -> AvailabilityIndex:
+    """Load staff leave and unavailability into a sorted in-memory index"""
+    query = {"staff_id": {"$in": staff_ids}} if staff_ids is not None else {}
+    return AvailabilityIndex.from_documents(db.staff_availability.find(query, {"_id": 0}))
+
+def stored_availability_interval(interval: AvailabilityInterval) -> Dict[str, Any]:
+    """Convert an availability interval to the stored form in absolute minutes"""
+    try:
+        start = parse_availability_time(interval.start)
+        end = parse_availability_time(interval.end, is_end=True)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid time format. Use YYYY-MM-DD or YYYY-MM-DD HH:MM")
+    if end <= start:
+        raise HTTPException(status_code=400, detail="Unavailable period must end after it starts")
+    
+    return {"id": interval.id or str(uuid.uuid4()), "start": start, "end": end, "reason": interval.reason}
+
+def check_roster_overlaps(entry: Dict[str, Any]):
+    """Reject an assignment that double-books its staff member"""
+    if not entry.get("staff_id"):
+        return
+    
+    index = load_staff_interval_index([entry["staff_id"]], entry["date"], entry["date"])
+    overlaps = index.entry_overlaps(entry)
+    if overlaps:
+        raise HTTPException(status_code=409, detail={
+            "message": f"{entry.get('staff_name') or 'Staff member'} is already rostered on an overlapping shift",
+            "conflicts": [describe_overlap(entry, other) for other in overlaps]
+        })
+
+def publish_roster_event(event: Optional[Dict[str, Any]]):
+    """Publish a roster change event from a write handler
+    
+    Skipped when events come from the MongoDB change stream instead, which
+    would otherwise deliver every write twice.
+    """
+    if event and ROSTER_EVENTS_SOURCE == "local":
+        roster_event_broker.publish(event)
+
 # API Endpoints
 
 @app.on_event("startup")
 async def startup_event():
     initialize_default_data()
+    ensure_indexes()
+    
+    roster_event_broker.bind_loop(asyncio.get_running_loop())
+    if ROSTER_EVENTS_SOURCE == "change_stream":
+        asyncio.create_task(watch_roster_change_stream(motor_db, roster_event_broker))
 
 @app.get("/api/health")
 async def health_check():
@@ -407,6 +1002,179 @@ async def delete_staff(staff_id: str):
         raise HTTPException(status_code=404, detail="Staff not found")
     return {"message": "Staff deactivated"}
 
+@app.get("/api/staff/{staff_id}/roster")
+async def get_staff_roster(
+    staff_id: str,
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)")
+):
+    """Get one staff member's shifts for a period with running hours and pay totals"""
+    try:
+        datetime.strptime(start, "%Y-%m-%d")
+        datetime.strptime(end, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    shifts = list(db.roster.find(
+        {"staff_id": staff_id, "date": {"$gte": start, "$lte": end}},
+        {"_id": 0}
+    ).sort("date", 1))
+    shifts.sort(key=lambda shift: (shift["date"], shift.get("start_time", "")))
+    
+    running_minutes = 0
+    running_cents = 0
+    for shift in shifts:
+        running_minutes += entry_minutes(shift)
+        running_cents += entry_cents(shift, "total_pay")
+        shift["running_hours"] = round(minutes_to_hours(running_minutes), 2)
+        shift["running_pay"] = cents_to_dollars(running_cents)
+    
+    return {
+        "staff_id": staff_id,
+        "start": start,
+        "end": end,
+        "shift_count": len(shifts),
+        "total_hours": round(minutes_to_hours(running_minutes), 2),
+        "total_pay": cents_to_dollars(running_cents),
+        "shifts": shifts
+    }
+
+# Staff availability endpoints
+def availability_response(staff_id: str, document: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    document = document or {}
+    return {
+        "staff_id": staff_id,
+        "max_weekly_hours": document.get("max_weekly_hours"),
+        "unavailable": [describe_interval(interval) for interval in document.get("unavailable", [])]
+    }
+
+@app.get("/api/staff/{staff_id}/availability")
+async def get_staff_availability(
+    staff_id: str,
+    start: Optional[str] = Query(None, description="Only periods ending after this date (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, description="Only periods starting on or before this date (YYYY-MM-DD)")
+):
+    """Get a staff member's leave, unavailable periods and preferred weekly hours"""
+    document = db.staff_availability.find_one({"staff_id": staff_id}, {"_id": 0})
+    if document and (start or end):
+        try:
+            range_start = parse_availability_time(start) if start else None
+            range_end = parse_availability_time(end, is_end=True) if end else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+        document["unavailable"] = [
+            interval for interval in document.get("unavailable", [])
+            if (range_start is None or interval["end"] > range_start)
+            and (range_end is None or interval["start"] < range_end)
+        ]
+    return availability_response(staff_id, document)
+
+@app.put("/api/staff/{staff_id}/availability")
+async def set_staff_availability(staff_id: str, availability: StaffAvailability):
+    """Replace a staff member's unavailable periods and preferred weekly hours"""
+    if not db.staff.find_one({"id": staff_id}):
+        raise HTTPException(status_code=404, detail="Staff not found")
+    
+    unavailable = sorted(
+        (stored_availability_interval(interval) for interval in availability.unavailable),
+        key=lambda interval: interval["start"]
+    )
+    document = db.staff_availability.find_one_and_update(
+        {"staff_id": staff_id},
+        {"$set": {
+            "unavailable": unavailable,
+            "max_weekly_hours": availability.max_weekly_hours,
+            "updated_at": datetime.now()
+        }},
+        upsert=True,
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    return availability_response(staff_id, document)
+
+@app.post("/api/staff/{staff_id}/availability/unavailable")
+async def add_staff_unavailability(staff_id: str, interval: AvailabilityInterval):
+    """Add one leave or unavailable period"""
+    if not db.staff.find_one({"id": staff_id}):
+        raise HTTPException(status_code=404, detail="Staff not found")
+    
+    stored = stored_availability_interval(interval)
+    document = db.staff_availability.find_one_and_update(
+        {"staff_id": staff_id},
+        {
+            "$push": {"unavailable": {"$each": [stored], "$sort": {"start": 1}}},
+            "$set": {"updated_at": datetime.now()}
+        },
+        upsert=True,
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    return availability_response(staff_id, document)
+
+@app.delete("/api/staff/{staff_id}/availability/unavailable/{interval_id}")
+async def delete_staff_unavailability(staff_id: str, interval_id: str):
+    result = db.staff_availability.update_one(
+        {"staff_id": staff_id, "unavailable.id": interval_id},
+        {"$pull": {"unavailable": {"id": interval_id}}, "$set": {"updated_at": datetime.now()}}
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Unavailable period not found")
+    return {"message": "Unavailable period removed"}
+
+@app.get("/api/roster/free-staff")
+async def get_free_staff(
+    month: str = Query(..., description="Month (YYYY-MM)"),
+    unfilled_only: bool = Query(False, description="Only list unassigned shifts")
+):
+    """List who is free for every shift in a month
+    
+    Free means active, not on leave or unavailable, and not already working
+    an overlapping shift. Leave and existing shifts are merged into one
+    interval index and the whole staff x shift grid is answered at once.
+    """
+    try:
+        month_start = datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
+    
+    staff = list(db.staff.find({"active": True}, {"_id": 0, "id": 1, "name": 1}))
+    staff_ids = [member["id"] for member in staff]
+    
+    month_entries = list(db.roster.find(
+        {"date": {"$regex": f"^{month}"}},
+        {"_id": 0, "id": 1, "date": 1, "start_time": 1, "end_time": 1, "staff_id": 1}
+    ))
+    month_entries.sort(key=lambda entry: (entry["date"], entry["start_time"]))
+    shifts = [entry for entry in month_entries if not unfilled_only or not entry.get("staff_id")]
+    
+    # Existing shifts from a day either side also make staff busy
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    index = load_availability_index(staff_ids)
+    busy = load_staff_interval_index(
+        staff_ids, month_start.isoformat(), (next_month - timedelta(days=1)).isoformat()
+    )
+    for staff_id in staff_ids:
+        index.add_intervals(staff_id, [(interval.start, interval.end) for interval in busy.staff_intervals(staff_id)])
+    
+    intervals = [entry_interval(entry) for entry in shifts]
+    free_staff = index.free_staff(staff_ids, [(interval.start, interval.end) for interval in intervals])
+    
+    return {
+        "month": month,
+        "staff": {member["id"]: member["name"] for member in staff},
+        "shifts": [
+            {
+                "entry_id": entry["id"],
+                "date": entry["date"],
+                "start_time": entry["start_time"],
+                "end_time": entry["end_time"],
+                "staff_id": entry.get("staff_id"),
+                "free_staff": free
+            }
+            for entry, free in zip(shifts, free_staff)
+        ]
+    }
+
 # Shift template endpoints
 @app.get("/api/shift-templates")
 async def get_shift_templates():
@@ -433,39 +1201,522 @@ async def get_roster(month: str):
     roster_entries = list(db.roster.find({"date": {"$regex": f"^{month}"}}, {"_id": 0}))
     return roster_entries
 
+async def iter_roster_ndjson(query: Dict[str, Any], chunk_size: int = ROSTER_STREAM_CHUNK_SIZE):
+    """Yield roster entries as newline-delimited JSON in (date, id) order
+    
+    The cursor is only advanced when the response asks for the next chunk,
+    so a slow client holds the read back instead of the server buffering.
+    """
+    cursor = motor_db.roster.find(query, {"_id": 0}).sort([("date", 1), ("id", 1)]).batch_size(chunk_size)
+    lines = []
+    async for entry in cursor:
+        lines.append(json.dumps(entry, default=str))
+        if len(lines) >= chunk_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+@app.get("/api/roster/stream")
+async def stream_roster(
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)"),
+    resume_token: Optional[str] = Query(None, description="Continue after '<YYYY-MM-DD>|<entry id>' of the last entry received")
+):
+    """Stream roster entries for a date range as newline-delimited JSON"""
+    try:
+        datetime.strptime(start, "%Y-%m-%d")
+        datetime.strptime(end, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    query = {"date": {"$gte": start, "$lte": end}}
+    if resume_token:
+        try:
+            query = {"$and": [query, parse_roster_resume_token(resume_token)]}
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid resume token. Use <YYYY-MM-DD>|<entry id>")
+    
+    return StreamingResponse(iter_roster_ndjson(query), media_type="application/x-ndjson")
+
+# Roster fields double-booking checks read
+CONFLICT_FIELDS = {"_id": 0, "id": 1, "date": 1, "start_time": 1, "end_time": 1, "staff_id": 1, "staff_name": 1}
+
+@app.get("/api/roster/conflicts")
+async def get_roster_conflicts(
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)")
+):
+    """Report every double-booked staff member in a date range"""
+    try:
+        # Include the previous day so overnight shifts crossing into the range are seen
+        lookback = (datetime.strptime(start, "%Y-%m-%d").date() - timedelta(days=1)).isoformat()
+        datetime.strptime(end, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    entries = db.roster.find(
+        {"date": {"$gte": lookback, "$lte": end}, "staff_id": {"$ne": None}},
+        CONFLICT_FIELDS
+    )
+    conflicts = [
+        conflict for conflict in find_roster_conflicts(entries)
+        if conflict["date"] >= start or conflict["conflicting_date"] >= start
+    ]
+    
+    return {
+        "start": start,
+        "end": end,
+        "conflict_count": len(conflicts),
+        "conflicts": conflicts
+    }
+
+@app.get("/api/roster/unfilled")
+async def get_unfilled_shifts(
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)")
+):
+    """List shifts with nobody assigned in a date range"""
+    try:
+        datetime.strptime(start, "%Y-%m-%d")
+        datetime.strptime(end, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    shifts = list(db.roster.find(
+        {"date": {"$gte": start, "$lte": end}, **UNFILLED_SHIFT_FILTER},
+        {"_id": 0}
+    ).sort([("date", 1), ("start_time", 1)]))
+    
+    return {
+        "start": start,
+        "end": end,
+        "unfilled_count": len(shifts),
+        "unfilled_hours": round(minutes_to_hours(sum(entry_minutes(shift) for shift in shifts)), 2),
+        "shifts": shifts
+    }
+
+# Minutes worked of a roster document, from its hours when it predates stored minutes
+ROSTER_MINUTES_EXPRESSION = {
+    "$ifNull": ["$minutes_worked", {"$round": [{"$multiply": [{"$ifNull": ["$hours_worked", 0]}, 60]}, 0]}]
+}
+
+def coverage_band_expression() -> Dict[str, Any]:
+    """Aggregation expression naming the coverage band a shift starts in"""
+    branches = [
+        {"case": {"$lt": ["$start_time", next_start]}, "then": band}
+        for (band, _), (_, next_start) in zip(COVERAGE_TIME_BANDS, COVERAGE_TIME_BANDS[1:])
+    ]
+    return {"$switch": {"branches": branches, "default": COVERAGE_TIME_BANDS[-1][0]}}
+
+@app.get("/api/roster/coverage")
+async def get_roster_coverage(
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)")
+):
+    """Filled and open shifts per day and time band
+    
+    Counting happens in the database, so only one row per day and band
+    comes back however long the range is.
+    """
+    try:
+        datetime.strptime(start, "%Y-%m-%d")
+        datetime.strptime(end, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    is_open = {"$eq": [{"$ifNull": ["$staff_id", None]}, None]}
+    pipeline = [
+        {"$match": {"date": {"$gte": start, "$lte": end}}},
+        {"$group": {
+            "_id": {"date": "$date", "band": coverage_band_expression()},
+            "shifts": {"$sum": 1},
+            "unfilled": {"$sum": {"$cond": [is_open, 1, 0]}},
+            "minutes": {"$sum": ROSTER_MINUTES_EXPRESSION},
+            "unfilled_minutes": {"$sum": {"$cond": [is_open, ROSTER_MINUTES_EXPRESSION, 0]}}
+        }},
+        {"$sort": {"_id.date": 1}}
+    ]
+    
+    band_names = [band for band, _ in COVERAGE_TIME_BANDS]
+    days: Dict[str, Dict[str, Any]] = {}
+    totals = {band: {"shifts": 0, "unfilled": 0, "unfilled_hours": 0} for band in band_names}
+    for row in db.roster.aggregate(pipeline):
+        day = days.setdefault(row["_id"]["date"], {
+            "date": row["_id"]["date"], "shifts": 0, "unfilled": 0, "unfilled_hours": 0, "bands": {}
+        })
+        band = row["_id"]["band"]
+        day["bands"][band] = {
+            "shifts": row["shifts"],
+            "filled": row["shifts"] - row["unfilled"],
+            "unfilled": row["unfilled"],
+            "hours": round(minutes_to_hours(row["minutes"]), 2),
+            "unfilled_hours": round(minutes_to_hours(row["unfilled_minutes"]), 2)
+        }
+        day["shifts"] += row["shifts"]
+        day["unfilled"] += row["unfilled"]
+        day["unfilled_hours"] += row["unfilled_minutes"]
+        totals[band]["shifts"] += row["shifts"]
+        totals[band]["unfilled"] += row["unfilled"]
+        totals[band]["unfilled_hours"] += row["unfilled_minutes"]
+    
+    # Unfilled time is summed in minutes and shown in hours
+    for summary in list(days.values()) + list(totals.values()):
+        summary["unfilled_hours"] = round(minutes_to_hours(summary["unfilled_hours"]), 2)
+    
+    return {
+        "start": start,
+        "end": end,
+        "bands": [{"band": band, "from": band_start} for band, band_start in COVERAGE_TIME_BANDS],
+        "unfilled_count": sum(total["unfilled"] for total in totals.values()),
+        "band_totals": totals,
+        "days": list(days.values())
+    }
+
+def roster_changes_since(since: int, limit: int) -> Dict[str, Any]:
+    """Committed roster upserts and deletes after a change sequence, in order"""
+    return collect_roster_changes(db.roster, db.roster_tombstones, since, limit, committed_roster_seq_limit())
+
+@app.get("/api/roster/changes")
+async def get_roster_changes(
+    since: int = Query(0, ge=0, description="Return changes after this sequence number"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of changes to return")
+):
+    """Get roster entries inserted, updated or deleted since a change sequence
+    
+    Clients store ``latest_seq`` from the response and pass it back as
+    ``since`` to receive only the next batch of changes. Deletions are kept
+    for ROSTER_TOMBSTONE_RETENTION_DAYS; a client that has not synced for
+    longer must reload the roster instead.
+    """
+    return roster_changes_since(since, limit)
+
+def format_sse_event(event: Dict[str, Any]) -> str:
+    """Format a roster event as a Server-Sent Events message"""
+    lines = []
+    if event.get("seq") is not None:
+        lines.append(f"id: {event['seq']}")
+    lines.append("event: roster")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+@app.get("/api/roster/events")
+async def roster_events(request: Request):
+    """Push roster change events to the client as Server-Sent Events
+    
+    Events carry the entry id, date, changed fields and new pay so calendars
+    can patch their state in place. A reconnecting client sends the standard
+    Last-Event-ID header and first receives the changes it missed.
+    """
+    queue = roster_event_broker.subscribe()
+    last_event_id = request.headers.get("last-event-id")
+    
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            
+            # Replay what a reconnecting client missed from the change feed
+            if last_event_id and last_event_id.isdigit():
+                missed = roster_changes_since(int(last_event_id), ROSTER_EVENTS_REPLAY_LIMIT)
+                if missed["has_more"]:
+                    yield format_sse_event({"op": "resync", "seq": None})
+                else:
+                    for change in missed["changes"]:
+                        if change["op"] == "upsert":
+                            yield format_sse_event(build_replay_event(change["entry"], int(last_event_id)))
+                        else:
+                            yield format_sse_event(build_delete_event({"updated_seq": change["seq"], **change}))
+            
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=ROSTER_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse_event(event)
+        finally:
+            roster_event_broker.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/roster")
-async def create_roster_entry(entry: RosterEntry):
+async def create_roster_entry(entry: RosterEntry, allow_overlap: bool = False):
+    entry.id = str(uuid.uuid4())
+    if not allow_overlap:
+        check_roster_overlaps(entry.dict())
+    
     # Get current settings for pay calculation
     settings_doc = db.settings.find_one()
     settings = Settings(**settings_doc) if settings_doc else Settings()
     
-    entry.id = str(uuid.uuid4())
     entry = calculate_pay(entry, settings)
-    
-    db.roster.insert_one(entry.dict())
+    with reserved_roster_seqs() as seq:
+        entry = stamp_roster_entry(entry, seq, created=True)
+        db.roster.insert_one(entry.dict())
+    publish_roster_event(build_upsert_event(entry.dict()))
     return entry
 
 @app.put("/api/roster/{entry_id}")
-async def update_roster_entry(entry_id: str, entry: RosterEntry):
+async def update_roster_entry(entry_id: str, entry: RosterEntry, allow_overlap: bool = False):
+    if not allow_overlap:
+        check_roster_overlaps({**entry.dict(), "id": entry_id})
+    
     # Get current settings for pay calculation
     settings_doc = db.settings.find_one()
     settings = Settings(**settings_doc) if settings_doc else Settings()
     
     entry = calculate_pay(entry, settings)
-    
-    result = db.roster.update_one({"id": entry_id}, {"$set": entry.dict()})
-    if result.matched_count == 0:
+    with reserved_roster_seqs() as seq:
+        entry = stamp_roster_entry(entry, seq)
+        previous = db.roster.find_one_and_update(
+            {"id": entry_id},
+            {"$set": entry.dict(exclude={"created_seq"})},
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE
+        )
+    if previous is None:
         raise HTTPException(status_code=404, detail="Roster entry not found")
+    entry.created_seq = previous.get("created_seq")
+    publish_roster_event(build_upsert_event(entry.dict(), previous))
     return entry
 
+@app.patch("/api/roster/{entry_id}")
+async def patch_roster_entry(entry_id: str, patch: RosterEntryPatch, allow_overlap: bool = False):
+    """Apply a partial update to a roster entry
+    
+    Only the fields that actually change are written. Pay is recalculated
+    only when a pay-affecting field changes, so assigning staff is a single
+    small ``$set`` with no settings read.
+    """
+    current = db.roster.find_one({"id": entry_id}, {"_id": 0})
+    if not current:
+        raise HTTPException(status_code=404, detail="Roster entry not found")
+    
+    delta = patch.dict(exclude_unset=True)
+    changes = {key: value for key, value in delta.items() if current.get(key) != value}
+    if not changes:
+        return current
+    
+    if not allow_overlap and SCHEDULE_FIELDS & changes.keys():
+        check_roster_overlaps({**current, **changes})
+    
+    if PAY_AFFECTING_FIELDS & changes.keys():
+        merged = {**current, **changes}
+        if "date" in changes and "is_public_holiday" not in changes:
+            # The stored flag belongs to the old date, let calculate_pay detect it again
+            merged["is_public_holiday"] = False
+        
+        settings_doc = db.settings.find_one()
+        settings = Settings(**settings_doc) if settings_doc else Settings()
+        priced = calculate_pay(RosterEntry(**merged), settings).dict()
+        
+        for field in PAY_RESULT_FIELDS:
+            if current.get(field) != priced[field]:
+                changes[field] = priced[field]
+    
+    with reserved_roster_seqs() as seq:
+        changes["updated_seq"] = seq
+        changes["updated_at"] = datetime.now()
+        updated = db.roster.find_one_and_update(
+            {"id": entry_id},
+            {"$set": changes},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Roster entry not found")
+    
+    publish_roster_event(build_upsert_event(updated, current))
+    return updated
+
 @app.delete("/api/roster/{entry_id}")
 async def delete_roster_entry(entry_id: str):
-    result = db.roster.delete_one({"id": entry_id})
-    if result.deleted_count == 0:
+    deleted_count = delete_roster_entries({"id": entry_id})
+    if deleted_count == 0:
         raise HTTPException(status_code=404, detail="Roster entry not found")
     return {"message": "Roster entry deleted"}
 
-# Settings endpoints
+class RosterOverlapError(Exception):
+    def __init__(self, conflicts: List[Dict[str, Any]]):
+        super().__init__("Overlapping shift")
+        self.conflicts = conflicts
+
+def check_batch_overlaps(index: StaffIntervalIndex, entry: Dict[str, Any], allow_overlap: bool):
+    """Check one batch operation against the batch timeline, then record it there"""
+    if not allow_overlap:
+        overlaps = index.entry_overlaps(entry)
+        if overlaps:
+            raise RosterOverlapError([describe_overlap(entry, other) for other in overlaps])
+    
+    index.remove(entry["id"])
+    index.add_entry(entry)
+
+@app.post("/api/roster/batch")
+async def batch_roster_mutations(request: RosterBatchRequest):
+    """Apply many roster create/update/delete operations in one bulk write
+    
+    Operations are validated up front, pay is calculated once per distinct
+    shift shape and everything is committed with a single ``bulk_write``.
+    The response reports a status for every operation, in request order.
+    """
+    operations = request.operations
+    if len(operations) > MAX_ROSTER_BATCH_OPERATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many operations: {len(operations)} (maximum {MAX_ROSTER_BATCH_OPERATIONS})"
+        )
+    
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    pay_calculator = CachedPayCalculator(settings)
+    
+    # One read for every entry an update or delete refers to
+    target_ids = [operation.id for operation in operations if operation.op != RosterBatchOp.CREATE and operation.id]
+    existing = {
+        doc["id"]: doc
+        for doc in db.roster.find({"id": {"$in": target_ids}}, {"_id": 0})
+    } if target_ids else {}
+    
+    results = [
+        {"index": index, "op": operation.op.value, "id": operation.id, "status": "skipped"}
+        for index, operation in enumerate(operations)
+    ]
+    
+    # Timeline of every staff member the batch touches, kept current as
+    # operations are validated so they are also checked against each other
+    interval_index = None
+    if not request.allow_overlap:
+        touched = list(existing.values()) + [operation.entry for operation in operations if operation.entry]
+        staff_ids = list({doc.get("staff_id") for doc in touched if doc.get("staff_id")})
+        dates = [doc["date"] for doc in touched if isinstance(doc.get("date"), str)]
+        if staff_ids and dates:
+            try:
+                interval_index = load_staff_interval_index(staff_ids, min(dates), max(dates))
+            except ValueError:
+                interval_index = None  # Malformed dates are reported per operation below
+    if interval_index is None:
+        interval_index = StaffIntervalIndex()
+    
+    # Validate and price every operation before writing anything
+    planned = []  # (result index, kind, document or id)
+    targeted: Dict[str, int] = {}  # entry id -> index of the operation that targets it
+    for index, operation in enumerate(operations):
+        result = results[index]
+        try:
+            if operation.op == RosterBatchOp.CREATE:
+                if not operation.entry:
+                    raise ValueError("create requires an entry")
+                entry = RosterEntry(**{**operation.entry, "id": str(uuid.uuid4())})
+                check_batch_overlaps(interval_index, entry.dict(), request.allow_overlap)
+                planned.append((index, "create", pay_calculator.calculate(entry)))
+                result["id"] = entry.id
+            else:
+                if not operation.id:
+                    raise ValueError(f"{operation.op.value} requires an id")
+                if operation.id in targeted:
+                    raise ValueError(f"Entry {operation.id} is already targeted by operation {targeted[operation.id]}")
+                targeted[operation.id] = index
+                if operation.id not in existing:
+                    result["status"] = "not_found"
+                    if request.ordered:
+                        break
+                    continue
+                if operation.op == RosterBatchOp.UPDATE:
+                    if not operation.entry:
+                        raise ValueError("update requires an entry")
+                    entry = RosterEntry(**{
+                        **operation.entry,
+                        "id": operation.id,
+                        "created_seq": existing[operation.id].get("created_seq")
+                    })
+                    check_batch_overlaps(interval_index, entry.dict(), request.allow_overlap)
+                    planned.append((index, "update", pay_calculator.calculate(entry)))
+                else:
+                    interval_index.remove(operation.id)
+                    planned.append((index, "delete", operation.id))
+        except RosterOverlapError as e:
+            result["status"] = "conflict"
+            result["conflicts"] = e.conflicts
+            if request.ordered:
+                break
+        except Exception as e:
+            result["status"] = "invalid"
+            result["error"] = str(e)
+            if request.ordered:
+                break
+    
+    # Stamp change sequences and build the bulk write
+    with reserved_roster_seqs(len(planned)) as first_seq:
+        now = datetime.now()
+        requests, written = [], []  # written[i] is (result index, document or tombstone) for requests[i]
+        for offset, (index, kind, target) in enumerate(planned):
+            seq = first_seq + offset
+            if kind == "delete":
+                requests.append(DeleteOne({"id": target}))
+                written.append((index, {
+                    "id": target,
+                    "date": existing[target].get("date"),
+                    "deleted": True,
+                    "updated_seq": seq,
+                    "updated_at": now
+                }))
+            else:
+                doc = stamp_roster_entry(target, seq, created=kind == "create").dict()
+                if kind == "create":
+                    requests.append(InsertOne(dict(doc)))
+                else:
+                    requests.append(UpdateOne({"id": doc["id"]}, {"$set": doc}))
+                written.append((index, doc))
+        
+        failed_requests = {}
+        executed = len(requests)
+        if requests:
+            try:
+                db.roster.bulk_write(requests, ordered=request.ordered)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    failed_requests[error["index"]] = error.get("errmsg", "Write failed")
+                if request.ordered and failed_requests:
+                    executed = min(failed_requests)
+        
+        statuses = {"create": "created", "update": "updated", "delete": "deleted"}
+        applied_docs, tombstones = [], []
+        for position, (index, doc) in enumerate(written):
+            if position in failed_requests:
+                results[index]["status"] = "error"
+                results[index]["error"] = failed_requests[position]
+            elif position < executed:
+                kind = planned[position][1]
+                results[index]["status"] = statuses[kind]
+                (tombstones if kind == "delete" else applied_docs).append(doc)
+        
+        # Tombstones and events only for writes that were applied
+        if tombstones:
+            db.roster_tombstones.insert_many([dict(tombstone) for tombstone in tombstones])
+    
+    publish_roster_event(build_bulk_event(applied_docs + tombstones))
+    
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    
+    return {
+        "ordered": request.ordered,
+        "requested": len(operations),
+        "created": counts.get("created", 0),
+        "updated": counts.get("updated", 0),
+        "deleted": counts.get("deleted", 0),
+        "failed": sum(counts.get(status, 0) for status in ("invalid", "not_found", "conflict", "error")),
+        "skipped": counts.get("skipped", 0),
+        "pay_calculations": pay_calculator.calculations,
+        "results": results
+    }
+
+# Settings endpoints
 @app.get("/api/settings")
 async def get_settings():
     settings_doc = db.settings.find_one({}, {"_id": 0})
@@ -473,17 +1724,319 @@ async def get_settings():
 
 @app.put("/api/settings")
 async def update_settings(settings: Settings):
-    db.settings.update_one({}, {"$set": settings.dict()}, upsert=True)
+    # Rate versions are managed through their own endpoints
+    db.settings.update_one({}, {"$set": settings.dict(exclude={"rate_versions"})}, upsert=True)
     return settings
 
+@app.get("/api/settings/rate-versions")
+async def get_rate_versions():
+    """Base rates and effective-dated rate versions, each with its version key"""
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    schedule = settings.rate_schedule()
+    
+    versions = [{"effective_from": None, "note": "Base rates", "rates": schedule.rate_tables[0], "version": schedule.version_keys[0]}]
+    for index, effective_from in enumerate(schedule.effective_dates, start=1):
+        note = next(version.note for version in settings.rate_versions if version.effective_from == effective_from)
+        versions.append({
+            "effective_from": effective_from,
+            "note": note,
+            "rates": schedule.rate_tables[index],
+            "version": schedule.version_keys[index]
+        })
+    return versions
+
+@app.post("/api/settings/rate-versions")
+async def add_rate_version(rate_version: RateVersion):
+    """Add (or replace) the rate table version starting on a date
+    
+    Existing roster pay is not changed; run a pay recalculation for the
+    affected dates to apply it.
+    """
+    try:
+        datetime.strptime(rate_version.effective_from, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    unknown = sorted(set(rate_version.rates) - set(settings.rates))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown rates: {', '.join(unknown)}")
+    
+    versions = [version for version in settings.rate_versions if version.effective_from != rate_version.effective_from]
+    versions.append(rate_version)
+    settings.rate_versions = sorted(versions, key=lambda version: version.effective_from)
+    db.settings.update_one({}, {"$set": settings.dict()}, upsert=True)
+    
+    schedule = settings.rate_schedule()
+    return {
+        "message": f"Rates effective from {rate_version.effective_from} saved",
+        "effective_from": rate_version.effective_from,
+        "version": schedule.version_key_for(rate_version.effective_from)
+    }
+
+@app.delete("/api/settings/rate-versions/{effective_from}")
+async def delete_rate_version(effective_from: str):
+    result = db.settings.update_one({}, {"$pull": {"rate_versions": {"effective_from": effective_from}}})
+    if result.modified_count == 0:
+        raise HTTPException(status_code=404, detail="Rate version not found")
+    return {"message": f"Rates effective from {effective_from} deleted"}
+
+@app.post("/api/roster/recalculate-pay")
+async def recalculate_roster_pay(
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)"),
+    force: bool = False
+):
+    """Reprice roster entries with the rate version in force on their dates
+    
+    The range is split into periods with one rate version each. Only entries
+    priced under a different version are read and repriced, so periods whose
+    rates did not change cost one empty query; ``force`` reprices everything.
+    Version keys include the pay mode, so switching it reprices every period.
+    """
+    try:
+        start_date_obj = datetime.strptime(start, "%Y-%m-%d").date()
+        end_date_obj = datetime.strptime(end, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if end_date_obj < start_date_obj:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+    
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    pay_calculator = CachedPayCalculator(settings)
+    schedule = pay_calculator.rate_schedule
+    
+    periods = []
+    changed = []
+    for first, last, version, query in schedule.stale_queries(start, end, force):
+        repriced = 0
+        for current in db.roster.find(query, {"_id": 0}):
+            priced = pay_calculator.calculate(RosterEntry(**current)).dict()
+            changes = {field: priced[field] for field in PAY_RESULT_FIELDS if current.get(field) != priced[field]}
+            repriced += 1
+            if changes:
+                changed.append((current, changes))
+        
+        periods.append({
+            "start": first,
+            "end": last,
+            "version": version,
+            "entries_repriced": repriced,
+            "skipped": repriced == 0
+        })
+    
+    if changed:
+        with reserved_roster_seqs(len(changed)) as first_seq:
+            now = datetime.now()
+            writes = []
+            for offset, (current, changes) in enumerate(changed):
+                changes["updated_seq"] = first_seq + offset
+                changes["updated_at"] = now
+                writes.append(UpdateOne({"id": current["id"]}, {"$set": changes}))
+            db.roster.bulk_write(writes, ordered=False)
+        publish_roster_event(build_bulk_event([{**current, **changes} for current, changes in changed]))
+    
+    return {
+        "start": start,
+        "end": end,
+        "entries_repriced": sum(period["entries_repriced"] for period in periods),
+        "entries_changed": len(changed),
+        "pay_calculations": pay_calculator.calculations,
+        "periods": periods
+    }
+
+@app.post("/api/roster/backfill-pay-breakdown")
+async def backfill_pay_breakdown(batch_size: int = Query(ROSTER_INSERT_CHUNK_SIZE, ge=1)):
+    """Store the shift type and minute buckets on entries priced before they were kept
+    
+    Only the breakdown fields are written, so stored pay is left as it is.
+    That is only consistent for entries priced under the rate version in
+    force now; entries priced under any other version are skipped and
+    counted, and need /api/roster/recalculate-pay instead. Entries are read
+    in (date, id) pages, and written ones no longer match, so the job can be
+    rerun after an interruption.
+    """
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    pay_calculator = CachedPayCalculator(settings)
+    schedule = pay_calculator.rate_schedule
+    
+    backfilled = 0
+    skipped = 0
+    batches = 0
+    page_query: Dict[str, Any] = {}
+    while True:
+        page = list(
+            db.roster.find({"regular_minutes": None, **page_query}, {"_id": 0})
+            .sort([("date", 1), ("id", 1)])
+            .limit(batch_size)
+        )
+        if not page:
+            break
+        page_query = roster_entries_after(page[-1]["date"], page[-1]["id"])
+        batches += 1
+        
+        batch = [
+            entry for entry in page
+            if entry.get("rate_version") == schedule.version_key_for(entry["date"])
+        ]
+        skipped += len(page) - len(batch)
+        if not batch:
+            continue
+        
+        with reserved_roster_seqs(len(batch)) as first_seq:
+            now = datetime.now()
+            writes = []
+            changed = []
+            for offset, current in enumerate(batch):
+                priced = pay_calculator.calculate(RosterEntry(**current)).dict()
+                changes = {field: priced[field] for field in PAY_BREAKDOWN_FIELDS}
+                changes["updated_seq"] = first_seq + offset
+                changes["updated_at"] = now
+                writes.append(UpdateOne({"id": current["id"]}, {"$set": changes}))
+                changed.append({**current, **changes})
+            
+            db.roster.bulk_write(writes, ordered=False)
+        publish_roster_event(build_bulk_event(changed))
+        backfilled += len(batch)
+    
+    return {
+        "entries_backfilled": backfilled,
+        "entries_skipped": skipped,
+        "batches": batches,
+        "pay_calculations": pay_calculator.calculations
+    }
+
+def generated_shift_conflicts(generated_entries: List[RosterEntry], first: date, last: date, keep_existing: bool) -> List[Dict[str, Any]]:
+    """Double bookings generated shifts would create with the assigned shifts that remain
+    
+    The days either side of [first, last] are always checked, so overnight
+    shifts crossing into or out of the range are seen; shifts within it only
+    when generation keeps them.
+    """
+    day_before = (first - timedelta(days=1)).isoformat()
+    day_after = (last + timedelta(days=1)).isoformat()
+    date_filter = {"$gte": day_before, "$lte": day_after} if keep_existing else {"$in": [day_before, day_after]}
+    remaining = db.roster.find({"date": date_filter, "staff_id": {"$ne": None}}, CONFLICT_FIELDS)
+    return [
+        {"type": "double_booking", **conflict}
+        for conflict in find_new_shift_conflicts([entry.dict() for entry in generated_entries], remaining)
+    ]
+
+# Generate roster for a date range (declared before the month route so "range" is not read as a month)
+@app.post("/api/generate-roster/range")
+def generate_roster_range(
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)"),
+    template_id: Optional[str] = None
+):
+    """Generate roster entries for every day of a date range in one pass
+    
+    Same rules as month generation: default shift templates skip shifts that
+    already exist, while a saved roster template replaces the range. Public
+    holidays are looked up once for the range, existing shifts are read once
+    and the entries are written in chunked bulk inserts.
+    """
+    try:
+        start_date_obj = datetime.strptime(start, "%Y-%m-%d").date()
+        end_date_obj = datetime.strptime(end, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if end_date_obj < start_date_obj:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+    days = (end_date_obj - start_date_obj).days + 1
+    if days > MAX_GENERATION_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range too long: {days} days (maximum {MAX_GENERATION_RANGE_DAYS})")
+    
+    started = datetime.now()
+    range_query = {"date": {"$gte": start, "$lte": end}}
+    
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    holiday_dates = holiday_service.get_holiday_dates(start_date_obj, end_date_obj, "QLD")
+    pay_calculator = CachedPayCalculator(settings, holiday_dates={holiday_date.isoformat() for holiday_date in holiday_dates})
+    
+    created_entries = []
+    skipped_existing = 0
+    entries_replaced = 0
+    if template_id:
+        template = db.roster_templates.find_one({"id": template_id}, {"_id": 0})
+        if not template:
+            raise HTTPException(status_code=404, detail="Roster template not found")
+        created_entries = [
+            pay_calculator.calculate(template_roster_entry(template_id, date_str, shift))
+            for date_str, shift in template_shifts_by_date(template, start_date_obj, end_date_obj)
+        ]
+        entries_replaced = delete_roster_entries(range_query)
+    else:
+        weekday_templates = [[] for _ in range(7)]
+        for template in db.shift_templates.find():
+            weekday_templates[template["day_of_week"]].append(template)
+        
+        existing_keys = {
+            (entry["date"], entry.get("shift_template_id"))
+            for entry in db.roster.find(range_query, {"_id": 0, "date": 1, "shift_template_id": 1})
+        }
+        
+        for offset in range(days):
+            day = start_date_obj + timedelta(days=offset)
+            date_str = day.isoformat()
+            for template in weekday_templates[day.weekday()]:
+                if (date_str, template["id"]) in existing_keys:
+                    skipped_existing += 1
+                    continue
+                entry = RosterEntry(
+                    id=str(uuid.uuid4()),
+                    date=date_str,
+                    shift_template_id=template["id"],
+                    start_time=template["start_time"],
+                    end_time=template["end_time"],
+                    is_sleepover=template["is_sleepover"]
+                )
+                created_entries.append(pay_calculator.calculate(entry))
+    
+    created_docs = []
+    if created_entries:
+        with reserved_roster_seqs(len(created_entries)) as first_seq:
+            created_docs = [
+                stamp_roster_entry(entry, first_seq + offset, created=True).dict()
+                for offset, entry in enumerate(created_entries)
+            ]
+            for chunk_start in range(0, len(created_docs), ROSTER_INSERT_CHUNK_SIZE):
+                db.roster.insert_many([dict(doc) for doc in created_docs[chunk_start:chunk_start + ROSTER_INSERT_CHUNK_SIZE]])
+    
+    publish_roster_event(build_bulk_event(created_docs))
+    
+    elapsed = (datetime.now() - started).total_seconds()
+    return {
+        "message": f"Generated {len(created_docs)} roster entries from {start} to {end}",
+        "start": start,
+        "end": end,
+        "days": days,
+        "entries_generated": len(created_docs),
+        "skipped_existing": skipped_existing,
+        "entries_replaced": entries_replaced,
+        "public_holidays": len(holiday_dates),
+        "pay_calculations": pay_calculator.calculations,
+        "elapsed_seconds": round(elapsed, 3),
+        "entries_per_second": round(len(created_docs) / elapsed) if elapsed > 0 else None
+    }
+
 # Generate monthly roster
 @app.post("/api/generate-roster/{month}")
-async def generate_monthly_roster(month: str, template_id: Optional[str] = None):
-    """Generate roster entries for a month based on shift templates or saved roster template"""
+async def generate_monthly_roster(month: str, template_id: Optional[str] = None, dry_run: bool = False):
+    """Generate roster entries for a month based on shift templates or saved roster template
+    
+    With ``dry_run`` nothing is written; the response summarises what would
+    be generated instead.
+    """
     
     # If template_id is provided, use the saved roster template
     if template_id:
-        return generate_roster_from_template(template_id, month)
+        return generate_roster_from_template(template_id, month, dry_run=dry_run)
     
     # Otherwise, use the default shift template generation
     year, month_num = map(int, month.split("-"))
@@ -495,7 +2048,19 @@ async def generate_monthly_roster(month: str, template_id: Optional[str] = None)
     from calendar import monthrange
     _, days_in_month = monthrange(year, month_num)
     
-    entries_created = 0
+    # Existing shifts are read once rather than checked per day and template
+    existing_entries = list(db.roster.find(
+        {"date": {"$regex": f"^{month}"}},
+        {"_id": 0, "id": 1, "date": 1, "shift_template_id": 1, "start_time": 1, "end_time": 1}
+    ))
+    existing_keys = {(entry["date"], entry.get("shift_template_id")) for entry in existing_entries}
+    
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    pay_calculator = CachedPayCalculator(settings)
+    
+    created_entries = []
+    skipped_existing = 0
     for day in range(1, days_in_month + 1):
         date_obj = datetime(year, month_num, day)
         date_str = date_obj.strftime("%Y-%m-%d")
@@ -505,51 +2070,83 @@ async def generate_monthly_roster(month: str, template_id: Optional[str] = None)
         day_templates = [t for t in templates if t["day_of_week"] == day_of_week]
         
         for template in day_templates:
-            # Check if entry already exists
-            existing = db.roster.find_one({
-                "date": date_str,
-                "shift_template_id": template["id"]
-            })
+            # Skip entries that already exist
+            if (date_str, template["id"]) in existing_keys:
+                skipped_existing += 1
+                continue
             
-            if not existing:
-                entry = RosterEntry(
-                    id=str(uuid.uuid4()),
-                    date=date_str,
-                    shift_template_id=template["id"],
-                    start_time=template["start_time"],
-                    end_time=template["end_time"],
-                    is_sleepover=template["is_sleepover"]
-                )
-                
-                # Calculate pay
-                settings_doc = db.settings.find_one()
-                settings = Settings(**settings_doc) if settings_doc else Settings()
-                entry = calculate_pay(entry, settings)
-                
-                db.roster.insert_one(entry.dict())
-                entries_created += 1
+            entry = RosterEntry(
+                id=str(uuid.uuid4()),
+                date=date_str,
+                shift_template_id=template["id"],
+                start_time=template["start_time"],
+                end_time=template["end_time"],
+                is_sleepover=template["is_sleepover"]
+            )
+            created_entries.append(pay_calculator.calculate(entry))
     
-    return {"message": f"Generated {entries_created} roster entries for {month} using default templates"}
+    if dry_run:
+        # Existing shifts at the same times under another template would be doubled up
+        existing_times = {(entry["date"], entry["start_time"], entry["end_time"]): entry for entry in existing_entries}
+        conflicts = [
+            {
+                "type": "duplicate_shift",
+                "date": entry.date,
+                "start_time": entry.start_time,
+                "end_time": entry.end_time,
+                "existing_entry_id": existing_times[(entry.date, entry.start_time, entry.end_time)]["id"]
+            }
+            for entry in created_entries
+            if (entry.date, entry.start_time, entry.end_time) in existing_times
+        ]
+        conflicts.extend(generated_shift_conflicts(
+            created_entries, date(year, month_num, 1), date(year, month_num, days_in_month), keep_existing=True
+        ))
+        return {
+            "dry_run": True,
+            "month": month,
+            "skipped_existing": skipped_existing,
+            **summarize_roster_pay([entry.dict() for entry in created_entries]),
+            "conflict_count": len(conflicts),
+            "conflicts": conflicts
+        }
+    
+    created_docs = []
+    if created_entries:
+        with reserved_roster_seqs(len(created_entries)) as first_seq:
+            created_docs = [
+                stamp_roster_entry(entry, first_seq + offset, created=True).dict()
+                for offset, entry in enumerate(created_entries)
+            ]
+            db.roster.insert_many([dict(doc) for doc in created_docs])
+    
+    publish_roster_event(build_bulk_event(created_docs))
+    return {"message": f"Generated {len(created_docs)} roster entries for {month} using default templates"}
 
 # Clear roster for a month
 @app.delete("/api/roster/month/{month}")
 async def clear_monthly_roster(month: str):
     """Clear all roster entries for a specific month"""
-    result = db.roster.delete_many({"date": {"$regex": f"^{month}"}})
-    return {"message": f"Deleted {result.deleted_count} roster entries for {month}"}
+    deleted_count = delete_roster_entries({"date": {"$regex": f"^{month}"}})
+    return {"message": f"Deleted {deleted_count} roster entries for {month}"}
 
 # Add individual shift to roster
 @app.post("/api/roster/add-shift")
-async def add_individual_shift(entry: RosterEntry):
+async def add_individual_shift(entry: RosterEntry, allow_overlap: bool = False):
     """Add a single shift to the roster"""
+    entry.id = str(uuid.uuid4())
+    if not allow_overlap:
+        check_roster_overlaps(entry.dict())
+    
     # Get current settings for pay calculation
     settings_doc = db.settings.find_one()
     settings = Settings(**settings_doc) if settings_doc else Settings()
     
-    entry.id = str(uuid.uuid4())
     entry = calculate_pay(entry, settings)
-    
-    db.roster.insert_one(entry.dict())
+    with reserved_roster_seqs() as seq:
+        entry = stamp_roster_entry(entry, seq, created=True)
+        db.roster.insert_one(entry.dict())
+    publish_roster_event(build_upsert_event(entry.dict()))
     return entry
 
 # ====== EXPORT ENDPOINTS ======
@@ -626,21 +2223,88 @@ async def export_pay_summary_csv(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
+@app.get("/api/export/shift-roster/parquet")
+async def export_shift_roster_parquet(
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    department: Optional[str] = Query(None, description="Department filter")
+):
+    """Export shift roster data as a typed, columnar Parquet file"""
+    try:
+        # Parse dates if provided
+        start_date_obj = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+        
+        # Stream row groups as they are built from the roster cursor
+        parquet_stream = export_service.stream_shift_roster_parquet(
+            start_date=start_date_obj,
+            end_date=end_date_obj,
+            department=department
+        )
+        
+        # Create filename with timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"shift_roster_{timestamp}.parquet"
+        
+        return StreamingResponse(
+            parquet_stream,
+            media_type="application/vnd.apache.parquet",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Access-Control-Expose-Headers": "Content-Disposition"
+            }
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+@app.get("/api/export/pay-summary/parquet")
+async def export_pay_summary_parquet(
+    pay_period_start: Optional[str] = Query(None, description="Pay period start date (YYYY-MM-DD)"),
+    pay_period_end: Optional[str] = Query(None, description="Pay period end date (YYYY-MM-DD)")
+):
+    """Export pay summary data as a typed, columnar Parquet file"""
+    try:
+        # Parse dates if provided
+        start_date_obj = datetime.strptime(pay_period_start, "%Y-%m-%d").date() if pay_period_start else None
+        end_date_obj = datetime.strptime(pay_period_end, "%Y-%m-%d").date() if pay_period_end else None
+        
+        # Generate Parquet content
+        parquet_content = await export_service.generate_pay_summary_parquet(
+            pay_period_start=start_date_obj,
+            pay_period_end=end_date_obj
+        )
+        
+        # Create filename with timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"pay_summary_{timestamp}.parquet"
+        
+        return StreamingResponse(
+            io.BytesIO(parquet_content),
+            media_type="application/vnd.apache.parquet",
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Access-Control-Expose-Headers": "Content-Disposition"
+            }
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
 @app.get("/api/export/workforce-data/excel")
-async def export_workforce_data_excel():
+async def export_workforce_data_excel(
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)")
+):
     """Export comprehensive workforce data as Excel format with multiple sheets"""
     try:
-        # Fetch all required data
-        shift_data = await export_service.get_shift_roster_data()
-        pay_data = await export_service.get_pay_summary_data()
-        employee_data = await export_service.get_workforce_data()
+        # Parse dates if provided
+        start_date_obj = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
         
-        # Prepare data sheets
-        data_sheets = {
-            "Shift Roster": shift_data,
-            "Pay Summary": pay_data,
-            "Employee Data": employee_data
-        }
+        # Fetch all required data concurrently, sharing one roster read
+        data_sheets = await export_service.get_workforce_export_data(
+            start_date=start_date_obj,
+            end_date=end_date_obj
+        )
         
         # Generate Excel content
         excel_content = export_service.generate_excel_content(data_sheets)
@@ -752,17 +2416,376 @@ async def get_holidays_in_range(
 
 # ====== END EXPORT/HOLIDAY ENDPOINTS ======
 
+# ====== COMPLIANCE ENDPOINTS ======
+
+# Roster fields the compliance engine reads
+COMPLIANCE_FIELDS = {
+    "_id": 0, "id": 1, "date": 1, "start_time": 1, "end_time": 1, "staff_id": 1, "staff_name": 1,
+    "is_sleepover": 1, "manual_sleepover": 1, "wake_hours": 1
+}
+
+def iso_week_bounds(start: date, end: date):
+    """Monday of the first and Sunday of the last ISO week touching a range"""
+    return start - timedelta(days=start.weekday()), end + timedelta(days=6 - end.weekday())
+
+@app.get("/api/compliance/report")
+async def get_compliance_report(
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)"),
+    staff_id: Optional[str] = Query(None, description="Limit the report to one staff member"),
+    min_rest_hours: float = Query(MIN_REST_GAP_HOURS, description="Minimum break between shifts"),
+    weekly_hours_cap: float = Query(WEEKLY_ORDINARY_HOURS_CAP, description="Ordinary hours per ISO week")
+):
+    """Report rest-gap breaches, weekly hours and overtime per staff member
+    
+    The range is widened to whole ISO weeks so weekly totals are complete.
+    """
+    try:
+        start_date_obj = datetime.strptime(start, "%Y-%m-%d").date()
+        end_date_obj = datetime.strptime(end, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    week_start, week_end = iso_week_bounds(start_date_obj, end_date_obj)
+    
+    # The day before the first week supplies the rest gap into its first shift
+    query = {
+        "date": {"$gte": (week_start - timedelta(days=1)).isoformat(), "$lte": week_end.isoformat()},
+        "staff_id": {"$ne": None}
+    }
+    if staff_id:
+        query["staff_id"] = staff_id
+    
+    report = evaluate_staff_compliance(
+        db.roster.find(query, COMPLIANCE_FIELDS),
+        min_rest_hours=min_rest_hours,
+        weekly_hours_cap=weekly_hours_cap,
+        count_from=week_start.isoformat()
+    )
+    staff_reports = sorted(report.values(), key=lambda staff: staff.get("staff_name") or "")
+    
+    return {
+        "start": week_start.isoformat(),
+        "end": week_end.isoformat(),
+        "min_rest_hours": min_rest_hours,
+        "weekly_hours_cap": weekly_hours_cap,
+        "staff_count": len(staff_reports),
+        "rest_gap_violation_count": sum(len(staff["rest_gap_violations"]) for staff in staff_reports),
+        "weekly_cap_violation_count": sum(len(staff["weekly_cap_violations"]) for staff in staff_reports),
+        "staff": staff_reports
+    }
+
+@app.post("/api/compliance/check")
+async def check_shift_compliance(entry: RosterEntry):
+    """Check a proposed assignment against the staff member's rest gaps and weekly hours
+    
+    Returns warnings rather than rejecting, so the calendar can ask the user
+    to approve or deny the assignment. The weekly cap is the award cap, or
+    the staff member's preferred weekly maximum when that is lower, as used
+    by the assignment solver.
+    """
+    try:
+        entry_date = datetime.strptime(entry.date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    week = iso_week_key(entry.date)
+    if not entry.staff_id:
+        return {
+            "compliant": True,
+            "week": week,
+            "weekly_hours": 0,
+            "weekly_hours_cap": WEEKLY_ORDINARY_HOURS_CAP,
+            "overtime_hours": 0,
+            "rest_gap_violations": []
+        }
+    
+    preferred_cap = load_availability_index([entry.staff_id]).max_weekly_hours.get(entry.staff_id)
+    weekly_hours_cap = min(preferred_cap, WEEKLY_ORDINARY_HOURS_CAP) if preferred_cap is not None else WEEKLY_ORDINARY_HOURS_CAP
+    week_start, week_end = iso_week_bounds(entry_date, entry_date)
+    
+    # Neighbouring days outside the week give the rest gaps either side of it
+    others = list(db.roster.find(
+        {
+            "staff_id": entry.staff_id,
+            "date": {
+                "$gte": (week_start - timedelta(days=1)).isoformat(),
+                "$lte": (week_end + timedelta(days=1)).isoformat()
+            },
+            "id": {"$ne": entry.id}
+        },
+        COMPLIANCE_FIELDS
+    ))
+    candidate = entry.dict()
+    report = evaluate_staff_compliance(
+        others + [candidate],
+        weekly_hours_cap=weekly_hours_cap,
+        count_from=week_start.isoformat()
+    )[entry.staff_id]
+    
+    rest_violations = [
+        violation for violation in report["rest_gap_violations"]
+        if entry.id in (violation["entry_id"], violation["previous_entry_id"])
+    ]
+    overtime_hours = next(
+        (violation["overtime_hours"] for violation in report["weekly_cap_violations"] if violation["week"] == week), 0
+    )
+    
+    return {
+        "compliant": not rest_violations and not overtime_hours,
+        "week": week,
+        "weekly_hours": report["weekly_hours"].get(week, 0),
+        "weekly_hours_cap": weekly_hours_cap,
+        "overtime_hours": overtime_hours,
+        "rest_gap_violations": rest_violations
+    }
+
+# ====== END COMPLIANCE ENDPOINTS ======
+
+# ====== ASSIGNMENT ENDPOINTS ======
+
+# Roster fields the assignment solver reads from unassigned shifts
+OPEN_SHIFT_FIELDS = {
+    "_id": 0, "id": 1, "date": 1, "start_time": 1, "end_time": 1,
+    "is_sleepover": 1, "manual_sleepover": 1, "wake_hours": 1, "hours_worked": 1, "total_pay": 1
+}
+
+def build_assignment_solver(
+    staff: List[Dict[str, Any]],
+    start_date_obj: date,
+    end_date_obj: date,
+    constraints: Union[AutoAssignRequest, AutoAssignCommitRequest],
+    **options
+) -> ShiftAssignmentSolver:
+    """Load the assigned shifts, availability and hours caps the solver checks against"""
+    # Whole ISO weeks for the hours cap, plus a day either side for rest gaps
+    week_start, week_end = iso_week_bounds(start_date_obj, end_date_obj)
+    assigned_entries = db.roster.find(
+        {
+            "date": {
+                "$gte": (week_start - timedelta(days=1)).isoformat(),
+                "$lte": (week_end + timedelta(days=1)).isoformat()
+            },
+            "staff_id": {"$ne": None}
+        },
+        COMPLIANCE_FIELDS
+    )
+    availability = load_availability_index([member["id"] for member in staff])
+    
+    return ShiftAssignmentSolver(
+        staff,
+        assigned_entries,
+        balance_from=start_date_obj.isoformat(),
+        balance_to=end_date_obj.isoformat(),
+        min_rest_hours=constraints.min_rest_hours,
+        weekly_hours_cap=constraints.weekly_hours_cap,
+        allow_overtime=constraints.allow_overtime,
+        availability=availability.is_available,
+        weekly_hours_caps=availability.max_weekly_hours,
+        **options
+    )
+
+@app.post("/api/roster/auto-assign")
+async def auto_assign_roster(request: AutoAssignRequest):
+    """Propose staff for every unassigned shift in a date range
+    
+    Nothing is written: the response is the proposed assignment diff, which
+    can be reviewed and then applied with /api/roster/auto-assign/commit.
+    """
+    try:
+        start_date_obj = datetime.strptime(request.start, "%Y-%m-%d").date()
+        end_date_obj = datetime.strptime(request.end, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    open_entries = list(db.roster.find(
+        {"date": {"$gte": request.start, "$lte": request.end}, **UNFILLED_SHIFT_FILTER},
+        OPEN_SHIFT_FIELDS
+    ))
+    staff = list(db.staff.find({"active": True}, {"_id": 0, "id": 1, "name": 1}))
+    
+    solver = build_assignment_solver(
+        staff, start_date_obj, end_date_obj, request,
+        time_limit_seconds=request.time_limit_seconds
+    )
+    result = solver.solve(open_entries)
+    result["start"] = request.start
+    result["end"] = request.end
+    return result
+
+@app.post("/api/roster/auto-assign/commit")
+async def commit_auto_assignments(request: AutoAssignCommitRequest):
+    """Apply a reviewed assignment diff in one bulk write
+    
+    Every assignment is re-checked against the solver's constraints (overlap,
+    rest gap, weekly cap, availability and leave). Shifts assigned by someone
+    else since the preview are left alone.
+    """
+    if not request.assignments:
+        return {"requested": 0, "assigned": 0, "skipped": []}
+    
+    entry_ids = [assignment.entry_id for assignment in request.assignments]
+    open_entries = {
+        entry["id"]: entry for entry in db.roster.find(
+            {"id": {"$in": entry_ids}, "staff_id": None},
+            OPEN_SHIFT_FIELDS
+        )
+    }
+    staff = list(db.staff.find(
+        {"id": {"$in": list({assignment.staff_id for assignment in request.assignments})}, "active": True},
+        {"_id": 0, "id": 1, "name": 1}
+    ))
+    
+    skipped = []
+    accepted = []
+    if open_entries:
+        dates = [entry["date"] for entry in open_entries.values()]
+        solver = build_assignment_solver(
+            staff,
+            datetime.strptime(min(dates), "%Y-%m-%d").date(),
+            datetime.strptime(max(dates), "%Y-%m-%d").date(),
+            request
+        )
+    for assignment in request.assignments:
+        entry = open_entries.get(assignment.entry_id)
+        if entry is None:
+            skipped.append({"entry_id": assignment.entry_id, "reason": "Shift not found or already assigned"})
+            continue
+        
+        candidate = dict(entry, staff_id=assignment.staff_id)
+        overlaps = solver.index.entry_overlaps(candidate) if assignment.staff_id in solver.staff_names else []
+        reason = solver.place(assignment.staff_id, entry)
+        if reason:
+            skip = {"entry_id": assignment.entry_id, "reason": reason}
+            if overlaps:
+                skip["conflicts"] = [describe_overlap(candidate, other) for other in overlaps]
+            skipped.append(skip)
+            continue
+        candidate["staff_name"] = solver.staff_names[assignment.staff_id]
+        accepted.append(candidate)
+    
+    if not accepted:
+        return {"requested": len(request.assignments), "assigned": 0, "skipped": skipped}
+    
+    with reserved_roster_seqs(len(accepted)) as first_seq:
+        now = datetime.now()
+        writes = []
+        for offset, entry in enumerate(accepted):
+            entry["updated_seq"] = first_seq + offset
+            writes.append(UpdateOne(
+                {"id": entry["id"], "staff_id": None},
+                {"$set": {
+                    "staff_id": entry["staff_id"],
+                    "staff_name": entry["staff_name"],
+                    "updated_seq": entry["updated_seq"],
+                    "updated_at": now
+                }}
+            ))
+        db.roster.bulk_write(writes, ordered=False)
+    
+    # The staff_id filter skips rows assigned by someone else in the meantime;
+    # only rows carrying our stamp were written
+    stamped = {entry["id"]: entry["updated_seq"] for entry in accepted}
+    applied = {
+        doc["id"] for doc in db.roster.find(
+            {"id": {"$in": list(stamped)}, "updated_seq": {"$in": list(stamped.values())}},
+            {"_id": 0, "id": 1, "updated_seq": 1}
+        )
+        if stamped[doc["id"]] == doc["updated_seq"]
+    }
+    for entry in accepted:
+        if entry["id"] not in applied:
+            skipped.append({"entry_id": entry["id"], "reason": "Shift not found or already assigned"})
+            continue
+        publish_roster_event(build_upsert_event(entry, {**entry, "staff_id": None, "staff_name": None}))
+    
+    return {
+        "requested": len(request.assignments),
+        "assigned": len(applied),
+        "skipped": skipped
+    }
+
+# ====== END ASSIGNMENT ENDPOINTS ======
+
+# ====== ANALYTICS ENDPOINTS ======
+
+@app.post("/api/analytics/rate-simulation")
+async def simulate_rates(request: RateSimulationRequest):
+    """Reprice a date range of roster history against a candidate rate table
+    
+    Returns per-staff, per-shift-type and per-month deltas against stored
+    pay. Nothing is written.
+    """
+    try:
+        start_date_obj = datetime.strptime(request.start, "%Y-%m-%d").date()
+        end_date_obj = datetime.strptime(request.end, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    rate_schedule = settings.rate_schedule()
+    
+    # Overnight shifts on the last day may run into a holiday the day after
+    holiday_dates = [
+        holiday_date.isoformat()
+        for holiday_date in holiday_service.get_holiday_dates(start_date_obj, end_date_obj + timedelta(days=1), "QLD")
+    ]
+    entries = db.roster.find(
+        {"date": {"$gte": request.start, "$lte": request.end}},
+        {"_id": 0, **{field: 1 for field in PRICING_FIELDS}}
+    )
+    simulation = simulate_rate_change(
+        entries, request.rates, settings.pay_mode == PayMode.SCHADS, holiday_dates, rate_schedule
+    )
+    
+    # Candidate rates override each rate table version in force over the range
+    periods = rate_schedule.periods(request.start, request.end)
+    return {
+        "start": request.start,
+        "end": request.end,
+        "current_rates": [
+            {"version": rate_schedule.version_keys[version], "start": first, "end": last, "rates": rate_schedule.rate_tables[version]}
+            for first, last, version in periods
+        ],
+        "candidate_rates": [
+            {"version": rate_schedule.version_keys[version], "start": first, "end": last, "rates": {**rate_schedule.rate_tables[version], **request.rates}}
+            for first, last, version in periods
+        ],
+        **simulation
+    }
+
+# ====== END ANALYTICS ENDPOINTS ======
+
 # ====== ROSTER TEMPLATE ENDPOINTS ======
 
+# Template fields returned by the listing; shifts are fetched per template on demand
+TEMPLATE_LISTING_FIELDS = {
+    "_id": 0, "id": 1, "name": 1, "description": 1, "shift_count": 1,
+    "pattern_summary": 1, "pattern_type": 1, "created_at": 1
+}
+
 @app.get("/api/roster-templates")
 def get_roster_templates():
-    """Get all saved roster templates"""
+    """Get all saved roster templates without their shift lists"""
     try:
-        templates = list(db.roster_templates.find())
+        templates = list(db.roster_templates.find({}, TEMPLATE_LISTING_FIELDS))
         
-        # Convert ObjectId to string and format dates
+        # Templates saved before summaries were stored get one computed here
+        # until /api/roster-templates/backfill-pattern-summary has stored it
+        missing_summary = [template["id"] for template in templates if "pattern_summary" not in template]
+        if missing_summary:
+            summaries = {
+                template["id"]: template_pattern_summary(template.get("shifts", []))
+                for template in db.roster_templates.find({"id": {"$in": missing_summary}}, {"_id": 0, "id": 1, "shifts": 1})
+            }
+            for template in templates:
+                if template["id"] in summaries:
+                    template["pattern_summary"] = summaries[template["id"]]
+                    template["shift_count"] = sum(summaries[template["id"]].values())
+        
+        # Format dates
         for template in templates:
-            template["_id"] = str(template["_id"])
             if template.get("created_at"):
                 template["created_at"] = template["created_at"].isoformat()
         
@@ -770,6 +2793,139 @@ def get_roster_templates():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get roster templates: {str(e)}")
 
+@app.post("/api/roster-templates/backfill-pattern-summary")
+def backfill_template_pattern_summary():
+    """Store the weekday summary on templates saved before summaries were kept
+    
+    Only templates without a summary are read and written, so the job can be
+    rerun safely.
+    """
+    backfilled = 0
+    for template in db.roster_templates.find({"pattern_summary": {"$exists": False}}, {"_id": 0, "id": 1, "shifts": 1}):
+        pattern_summary = template_pattern_summary(template.get("shifts", []))
+        db.roster_templates.update_one(
+            {"id": template["id"]},
+            {"$set": {"pattern_summary": pattern_summary, "shift_count": sum(pattern_summary.values())}}
+        )
+        backfilled += 1
+    
+    return {"templates_backfilled": backfilled}
+
+def template_pattern_pipeline(month_query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Aggregation that reduces a month of roster entries to weekday shift patterns
+    
+    Identical shifts are first counted per date, then grouped by weekday:
+    ``shifts_per_day`` is the most copies seen on one day and
+    ``occurrences`` how many entries followed the pattern in the month.
+    """
+    pattern = {
+        "start_time": "$start_time",
+        "end_time": "$end_time",
+        "is_sleepover": {"$ifNull": ["$is_sleepover", False]},
+        "manual_shift_type": "$manual_shift_type",
+        "manual_hourly_rate": "$manual_hourly_rate",
+        "manual_sleepover": "$manual_sleepover",
+        "wake_hours": "$wake_hours"
+    }
+    weekday_pattern = {field: f"$_id.{field}" for field in pattern}
+    weekday_pattern["day_of_week"] = {
+        "$subtract": [{"$isoDayOfWeek": {"$dateFromString": {"dateString": "$_id.date", "format": "%Y-%m-%d"}}}, 1]
+    }
+    return [
+        {"$match": month_query},
+        {"$group": {"_id": {"date": "$date", **pattern}, "count": {"$sum": 1}}},
+        {"$group": {
+            "_id": weekday_pattern,
+            "shifts_per_day": {"$max": "$count"},
+            "occurrences": {"$sum": "$count"}
+        }},
+        {"$sort": {"_id.day_of_week": 1, "_id.start_time": 1, "_id.end_time": 1}}
+    ]
+
+def template_roster_entry(template_id: str, date_str: str, shift: Dict[str, Any]) -> RosterEntry:
+    """Unassigned, unpriced roster entry for one template shift"""
+    return RosterEntry(
+        id=str(uuid.uuid4()),
+        date=date_str,
+        shift_template_id=f"template-{template_id}",
+        staff_id=None,  # No staff assigned
+        staff_name=None,
+        start_time=shift["start_time"],
+        end_time=shift["end_time"],
+        is_sleepover=shift.get("is_sleepover", False),
+        is_public_holiday=False,  # Will be auto-detected
+        manual_shift_type=shift.get("manual_shift_type"),
+        manual_hourly_rate=shift.get("manual_hourly_rate"),
+        manual_sleepover=shift.get("manual_sleepover"),
+        wake_hours=shift.get("wake_hours"),
+        hours_worked=0.0,
+        base_pay=0.0,
+        sleepover_allowance=0.0,
+        total_pay=0.0
+    )
+
+def rotation_template_document(rotation: RotationTemplate) -> Dict[str, Any]:
+    """Validated template fields for a rotation; raises HTTPException on a bad rule"""
+    try:
+        datetime.strptime(rotation.anchor_date, "%Y-%m-%d")
+        for exception in rotation.exceptions:
+            datetime.strptime(exception.date, "%Y-%m-%d")
+        for shift in rotation.shifts + [shift for exception in rotation.exceptions for shift in exception.shifts]:
+            datetime.strptime(shift.start_time, "%H:%M")
+            datetime.strptime(shift.end_time, "%H:%M")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date or time format. Use YYYY-MM-DD and HH:MM")
+    
+    fields = {
+        "name": rotation.name,
+        "description": rotation.description or f"{rotation.cycle_length_days}-day rotation from {rotation.anchor_date}",
+        "cycle_length_days": rotation.cycle_length_days,
+        "anchor_date": rotation.anchor_date,
+        "shifts": [shift.dict() for shift in rotation.shifts],
+        "exceptions": [exception.dict() for exception in rotation.exceptions],
+        "pattern_type": "rotation"
+    }
+    try:
+        compiled = CompiledRotation.from_template(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    fields["pattern_summary"] = compiled.cycle_summary()
+    fields["shift_count"] = len(compiled.shifts)
+    return fields
+
+@app.post("/api/roster-templates/rotation")
+def create_rotation_template(rotation: RotationTemplate):
+    """Save a multi-week rotating shift pattern as a roster template"""
+    template = {
+        "id": str(uuid.uuid4()),
+        **rotation_template_document(rotation),
+        "created_at": datetime.now()
+    }
+    db.roster_templates.insert_one(template)
+    return {
+        "message": "Rotation template saved successfully",
+        "template_id": template["id"],
+        "name": template["name"],
+        "shift_count": template["shift_count"],
+        "pattern_summary": template["pattern_summary"]
+    }
+
+@app.put("/api/roster-templates/rotation/{template_id}")
+def update_rotation_template(template_id: str, rotation: RotationTemplate):
+    """Replace the rule of a rotation template, e.g. to add exception dates"""
+    fields = rotation_template_document(rotation)
+    result = db.roster_templates.update_one({"id": template_id, "pattern_type": "rotation"}, {"$set": fields})
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Rotation template not found")
+    return {
+        "message": "Rotation template updated successfully",
+        "template_id": template_id,
+        "name": fields["name"],
+        "shift_count": fields["shift_count"],
+        "pattern_summary": fields["pattern_summary"]
+    }
+
 @app.post("/api/roster-templates")
 def save_roster_template(
     name: str,
@@ -781,42 +2937,24 @@ def save_roster_template(
         if not month:
             raise HTTPException(status_code=400, detail="Month is required (YYYY-MM format)")
         
-        # Get all roster entries for the specified month
+        # Reduce the month's roster entries to unique shift patterns per day of week
         year, month_num = month.split("-")
-        roster_entries = list(db.roster.find({
+        patterns = list(db.roster.aggregate(template_pattern_pipeline({
             "date": {"$regex": f"^{year}-{month_num.zfill(2)}"}
-        }))
+        })))
         
-        if not roster_entries:
+        if not patterns:
             raise HTTPException(status_code=404, detail="No roster entries found for the specified month")
         
-        # Group shifts by day of week instead of day of month
-        day_patterns = {}  # day_of_week -> list of shifts
-        
-        for entry in roster_entries:
-            # Parse the date to get day of week
-            entry_date = datetime.strptime(entry["date"], "%Y-%m-%d")
-            day_of_week = entry_date.weekday()  # 0=Monday, 6=Sunday
-            
-            if day_of_week not in day_patterns:
-                day_patterns[day_of_week] = []
-            
-            shift_config = {
-                "day_of_week": day_of_week,
-                "start_time": entry["start_time"],
-                "end_time": entry["end_time"],
-                "is_sleepover": entry.get("is_sleepover", False),
-                "manual_shift_type": entry.get("manual_shift_type"),
-                "manual_hourly_rate": entry.get("manual_hourly_rate"),
-                "manual_sleepover": entry.get("manual_sleepover"),
-                "wake_hours": entry.get("wake_hours")
-            }
-            day_patterns[day_of_week].append(shift_config)
-        
-        # Convert to flat list for storage
         template_shifts = []
-        for day_of_week, shifts in day_patterns.items():
-            template_shifts.extend(shifts)
+        for pattern in patterns:
+            shift_config = {field: pattern["_id"].get(field) for field in TEMPLATE_SHIFT_FIELDS}
+            shift_config["shifts_per_day"] = pattern["shifts_per_day"]
+            shift_config["occurrences"] = pattern["occurrences"]
+            template_shifts.append(shift_config)
+        
+        # Shifts generated per weekday when the template is applied
+        pattern_summary = template_pattern_summary(template_shifts)
         
         # Create template document
         template_id = str(uuid.uuid4())
@@ -826,35 +2964,38 @@ def save_roster_template(
             "description": description or f"Template saved from {month} (day-of-week pattern)",
             "shifts": template_shifts,
             "created_at": datetime.now(),
-            "shift_count": len(template_shifts),
+            "shift_count": sum(pattern_summary.values()),
+            "pattern_summary": pattern_summary,
             "pattern_type": "day_of_week"  # Mark as day-of-week based template
         }
         
         # Save to database
         db.roster_templates.insert_one(template)
         
-        # Create summary of pattern
-        day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        pattern_summary = {}
-        for day_of_week, shifts in day_patterns.items():
-            pattern_summary[day_names[day_of_week]] = len(shifts)
-        
         return {
             "message": "Roster template saved successfully (day-of-week pattern)",
             "template_id": template_id,
             "name": name,
-            "shift_count": len(template_shifts),
+            "shift_count": template["shift_count"],
             "pattern_summary": pattern_summary
         }
-        
+    
+    except HTTPException:
+        raise
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save roster template: {str(e)}")
 
 @app.post("/api/generate-roster-from-template/{template_id}/{month}")
-def generate_roster_from_template(template_id: str, month: str):
-    """Generate roster for a month using a saved template (day-of-week based)"""
+def generate_roster_from_template(template_id: str, month: str, dry_run: bool = False):
+    """Generate roster for a month using a saved template (day-of-week or rotation)
+    
+    The month is cleared and replaced. With ``dry_run`` nothing is deleted
+    or written; the response summarises the generated month and lists the
+    assigned shifts that would be removed and any double bookings the new
+    shifts would create, including with shifts just outside the month.
+    """
     try:
         # Get the template
         template = db.roster_templates.find_one({"id": template_id})
@@ -868,88 +3009,92 @@ def generate_roster_from_template(template_id: str, month: str):
             target_month = int(month_num)
         except (ValueError, IndexError):
             raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
-        
-        # Clear existing roster for the target month
-        db.roster.delete_many({
-            "date": {"$regex": f"^{year}-{month_num.zfill(2)}"}
-        })
+        month_query = {"date": {"$regex": f"^{year}-{month_num.zfill(2)}"}}
         
         # Get settings for pay calculation
         settings_doc = db.settings.find_one()
         settings = Settings(**settings_doc) if settings_doc else Settings()
+        pay_calculator = CachedPayCalculator(settings)
         
-        # Generate roster entries from template using day-of-week logic
-        generated_entries = []
-        
-        # Get the number of days in the target month
+        # Shifts for every day of the target month, from the weekday table or rotation cycle
         import calendar
         days_in_month = calendar.monthrange(target_year, target_month)[1]
+        month_first = date(target_year, target_month, 1)
+        month_last = date(target_year, target_month, days_in_month)
+        dated_shifts = template_shifts_by_date(template, month_first, month_last)
         
-        # Group template shifts by day of week for easier processing
-        shifts_by_day = {}
-        for shift in template["shifts"]:
-            day_of_week = shift["day_of_week"]
-            if day_of_week not in shifts_by_day:
-                shifts_by_day[day_of_week] = []
-            shifts_by_day[day_of_week].append(shift)
-        
-        # Iterate through each day of the target month
-        for day in range(1, days_in_month + 1):
-            target_date_obj = datetime(target_year, target_month, day)
-            target_date = target_date_obj.strftime("%Y-%m-%d")
-            day_of_week = target_date_obj.weekday()  # 0=Monday, 6=Sunday
-            
-            # Check if we have shift patterns for this day of the week
-            if day_of_week in shifts_by_day:
-                for shift in shifts_by_day[day_of_week]:
-                    # Create roster entry
-                    entry_id = str(uuid.uuid4())
-                    roster_entry = RosterEntry(
-                        id=entry_id,
-                        date=target_date,
-                        shift_template_id=f"template-{template_id}",
-                        staff_id=None,  # No staff assigned
-                        staff_name=None,
-                        start_time=shift["start_time"],
-                        end_time=shift["end_time"],
-                        is_sleepover=shift.get("is_sleepover", False),
-                        is_public_holiday=False,  # Will be auto-detected
-                        manual_shift_type=shift.get("manual_shift_type"),
-                        manual_hourly_rate=shift.get("manual_hourly_rate"),
-                        manual_sleepover=shift.get("manual_sleepover"),
-                        wake_hours=shift.get("wake_hours"),
-                        hours_worked=0.0,
-                        base_pay=0.0,
-                        sleepover_allowance=0.0,
-                        total_pay=0.0
-                    )
-                    
-                    # Calculate pay and hours
-                    roster_entry = calculate_pay(roster_entry, settings)
-                    
-                    # Save to database
-                    db.roster.insert_one(roster_entry.dict())
-                    generated_entries.append(roster_entry.dict())
+        # Calculate pay and hours
+        generated_entries = [
+            pay_calculator.calculate(template_roster_entry(template_id, target_date, shift))
+            for target_date, shift in dated_shifts
+        ]
+        
+        if dry_run:
+            # Clearing the month drops existing assignments
+            removed = list(db.roster.find(
+                {**month_query, "staff_id": {"$ne": None}},
+                CONFLICT_FIELDS
+            ).sort([("date", 1), ("start_time", 1)]))
+            conflicts = [
+                {
+                    "type": "assigned_shift_removed",
+                    "entry_id": entry["id"],
+                    "date": entry["date"],
+                    "start_time": entry["start_time"],
+                    "end_time": entry["end_time"],
+                    "staff_id": entry["staff_id"],
+                    "staff_name": entry.get("staff_name")
+                }
+                for entry in removed
+            ]
+            conflicts.extend(generated_shift_conflicts(
+                generated_entries, month_first, month_last, keep_existing=False
+            ))
+            return {
+                "dry_run": True,
+                "template_name": template["name"],
+                "month": month,
+                "entries_replaced": db.roster.count_documents(month_query),
+                **summarize_roster_pay([entry.dict() for entry in generated_entries]),
+                "conflict_count": len(conflicts),
+                "conflicts": conflicts
+            }
+        
+        # Clear existing roster for the target month
+        delete_roster_entries(month_query)
+        
+        generated_docs = []
+        if generated_entries:
+            with reserved_roster_seqs(len(generated_entries)) as first_seq:
+                generated_docs = [
+                    stamp_roster_entry(entry, first_seq + offset, created=True).dict()
+                    for offset, entry in enumerate(generated_entries)
+                ]
+                
+                # Save to database
+                db.roster.insert_many([dict(doc) for doc in generated_docs])
+        
+        publish_roster_event(build_bulk_event(generated_docs))
         
         # Create summary
-        day_names = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        generated_summary = {}
-        for day_of_week, shifts in shifts_by_day.items():
-            # Count how many days of this type exist in the target month
-            days_count = sum(1 for day in range(1, days_in_month + 1) 
-                           if datetime(target_year, target_month, day).weekday() == day_of_week)
-            generated_summary[day_names[day_of_week]] = len(shifts) * days_count
+        weekday_shifts = [0] * 7
+        for entry in generated_entries:
+            weekday_shifts[datetime.strptime(entry.date, "%Y-%m-%d").weekday()] += 1
+        generated_summary = {DAY_NAMES[day_of_week]: count for day_of_week, count in enumerate(weekday_shifts) if count}
+        pattern_type = template.get("pattern_type", "day_of_week")
         
         return {
-            "message": f"Roster generated successfully for {month} using day-of-week template '{template['name']}'",
+            "message": f"Roster generated successfully for {month} using {pattern_type.replace('_', '-')} template '{template['name']}'",
             "template_name": template["name"],
             "month": month,
-            "entries_generated": len(generated_entries),
-            "pattern_applied": "day_of_week",
+            "entries_generated": len(generated_docs),
+            "pattern_applied": pattern_type,
             "generation_summary": generated_summary,
-            "entries": generated_entries
+            "entries": generated_docs
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate roster from template: {str(e)}")
 
@@ -963,7 +3108,7 @@ def delete_roster_template(template_id: str):
             raise HTTPException(status_code=404, detail="Roster template not found")
         
         return {"message": "Roster template deleted successfully"}
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete roster template: {str(e)}")
 
@@ -982,10 +3127,141 @@ def get_roster_template(template_id: str):
             template["created_at"] = template["created_at"].isoformat()
         
         return template
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get roster template: {str(e)}")
 
+def forecast_response(
+    start: date,
+    end: date,
+    holiday_dates: Set[date],
+    by_weekday: Dict[str, Dict[str, Any]],
+    months: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Forecast totals, converting the summed minutes and cents to hours and dollars"""
+    total_minutes = sum(month["hours"] for month in months)
+    total_cents = sum(month["pay"] for month in months)
+    for totals in list(by_weekday.values()) + months:
+        totals["hours"] = round(minutes_to_hours(totals["hours"]), 2)
+        totals["pay"] = cents_to_dollars(totals["pay"])
+    
+    return {
+        "days": (end - start).days + 1,
+        "public_holidays": sorted(holiday_date.isoformat() for holiday_date in holiday_dates),
+        "total_shifts": sum(month["shifts"] for month in months),
+        "total_hours": round(minutes_to_hours(total_minutes), 2),
+        "total_pay": cents_to_dollars(total_cents),
+        "by_weekday": by_weekday,
+        "by_month": months
+    }
+
+def forecast_template_cost(template: Dict[str, Any], start: date, end: date, settings: Settings) -> Dict[str, Any]:
+    """Project hours and pay of a day-of-week template over a date range
+    
+    Each weekday's shifts are priced once per rate version and kind of day
+    (see ``forecast_weekly_pattern``), so cost grows with the number of
+    months, not the number of shifts.
+    """
+    # The day after the range is needed for overnight shifts on its last day
+    holiday_dates = holiday_service.get_holiday_dates(start, end + timedelta(days=1), "QLD")
+    calculator = CachedPayCalculator(settings, holiday_dates={holiday_date.isoformat() for holiday_date in holiday_dates})
+    weekday_table = compile_template_weekday_table(template["shifts"])
+    
+    def price_day(date_str: str, is_holiday: bool, next_day_holiday: bool) -> Tuple[int, int, int]:
+        shifts, minutes, cents = 0, 0, 0
+        for shift in weekday_table[date.fromisoformat(date_str).weekday()]:
+            priced = calculator.calculate(
+                template_roster_entry(template["id"], date_str, shift),
+                is_public_holiday=is_holiday,
+                next_day_public_holiday=next_day_holiday
+            )
+            shifts, minutes, cents = shifts + 1, minutes + priced.minutes_worked, cents + priced.total_pay_cents
+        return shifts, minutes, cents
+    
+    by_weekday, months = forecast_weekly_pattern(start, end, holiday_dates, calculator.rate_schedule, price_day)
+    return forecast_response(
+        start, end, {holiday_date for holiday_date in holiday_dates if holiday_date <= end}, by_weekday, months
+    )
+
+def forecast_rotation_cost(template: Dict[str, Any], start: date, end: date, settings: Settings) -> Dict[str, Any]:
+    """Project hours and pay of a rotation template over a date range
+    
+    A rotation does not repeat weekly, so its expansion is priced date by
+    date; the calculator still prices each distinct shift shape only once.
+    """
+    # The day after the range is needed for overnight shifts on its last day
+    holiday_dates = holiday_service.get_holiday_dates(start, end + timedelta(days=1), "QLD")
+    calculator = CachedPayCalculator(settings, holiday_dates={holiday_date.isoformat() for holiday_date in holiday_dates})
+    holiday_dates = {holiday_date for holiday_date in holiday_dates if holiday_date <= end}
+    
+    by_weekday, month_totals = empty_forecast_totals(start, end)
+    for weekday, day_count in enumerate(weekday_counts(start, (end - start).days + 1)):
+        by_weekday[DAY_NAMES[weekday]]["days"] = day_count
+    for holiday_date in holiday_dates:
+        by_weekday[DAY_NAMES[holiday_date.weekday()]]["public_holidays"] += 1
+    months = {month["month"]: month for month in month_totals}
+    
+    for date_str, shift in template_shifts_by_date(template, start, end):
+        priced = calculator.calculate(template_roster_entry(template["id"], date_str, shift))
+        for totals in (
+            by_weekday[DAY_NAMES[datetime.strptime(date_str, "%Y-%m-%d").weekday()]],
+            months[date_str[:7]]
+        ):
+            totals["shifts"] += 1
+            totals["hours"] += priced.minutes_worked
+            totals["pay"] += priced.total_pay_cents
+    
+    return forecast_response(start, end, holiday_dates, by_weekday, list(months.values()))
+
+@app.get("/api/roster-templates/{template_id}/forecast")
+def forecast_roster_template(
+    template_id: str,
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)")
+):
+    """Forecast hours and pay of rostering a template over a date range
+    
+    Uses the rate versions in force over the range and public holidays,
+    without generating or writing any roster entries.
+    """
+    try:
+        start_date_obj = datetime.strptime(start, "%Y-%m-%d").date()
+        end_date_obj = datetime.strptime(end, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if end_date_obj < start_date_obj:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+    
+    template = db.roster_templates.find_one({"id": template_id}, {"_id": 0})
+    if not template:
+        raise HTTPException(status_code=404, detail="Roster template not found")
+    
+    settings_doc = db.settings.find_one()
+    settings = Settings(**settings_doc) if settings_doc else Settings()
+    
+    if template.get("pattern_type") == "rotation":
+        forecast = forecast_rotation_cost(template, start_date_obj, end_date_obj, settings)
+    else:
+        forecast = forecast_template_cost(template, start_date_obj, end_date_obj, settings)
+    
+    rate_schedule = settings.rate_schedule()
+    return {
+        "template_id": template_id,
+        "template_name": template["name"],
+        "start": start,
+        "end": end,
+        "rate_versions": [
+            {
+                "version": rate_schedule.version_keys[version],
+                "start": first,
+                "end": last,
+                "rates": rate_schedule.rate_tables[version]
+            }
+            for first, last, version in rate_schedule.periods(start, end)
+        ],
+        **forecast
+    }
+
 # ====== END ROSTER TEMPLATE ENDPOINTS ======
 
 if __name__ == "__main__":
@@ -134,42 +134,28 @@ function App() {
 
   const generateMonthlyRoster = async (templateId = null) => {
     try {
-      const monthString = currentDate.toISOString().slice(0, 7);
-      
-      let url = `${API_BASE_URL}/api/generate-roster/${monthString}`;
-      if (templateId) {
-        url += `?template_id=${templateId}`;
-      }
-      
-      await axios.post(url);
-      
-      // Also generate roster for previous month dates if they appear in the first week
+      // Include the previous month if its dates appear in the first week
       const firstDay = new Date(currentDate.getFullYear(), currentDate.getMonth(), 1);
       const startOfWeek = new Date(firstDay);
       startOfWeek.setDate(startOfWeek.getDate() - (firstDay.getDay() + 6) % 7); // Start from Monday
+      const startMonth = startOfWeek.getMonth() !== firstDay.getMonth() ? startOfWeek : firstDay;
+      const startMonthString = `${startMonth.getFullYear()}-${String(startMonth.getMonth() + 1).padStart(2, '0')}`;
       
-      if (startOfWeek.getMonth() !== firstDay.getMonth()) {
-        const prevMonthString = startOfWeek.toISOString().slice(0, 7);
-        let prevUrl = `${API_BASE_URL}/api/generate-roster/${prevMonthString}`;
-        if (templateId) {
-          prevUrl += `?template_id=${templateId}`;
-        }
-        await axios.post(prevUrl);
-      }
-      
-      // Also generate for next month dates if they appear in the last week
+      // Include the next month if its dates appear in the last week
       const lastDay = new Date(currentDate.getFullYear(), currentDate.getMonth() + 1, 0);
       const endOfWeek = new Date(lastDay);
       endOfWeek.setDate(endOfWeek.getDate() + (6 - lastDay.getDay()));
+      const endMonth = endOfWeek.getMonth() !== lastDay.getMonth() ? endOfWeek : lastDay;
+      const endMonthString = `${endMonth.getFullYear()}-${String(endMonth.getMonth() + 1).padStart(2, '0')}`;
+      const endMonthDays = new Date(endMonth.getFullYear(), endMonth.getMonth() + 1, 0).getDate();
       
-      if (endOfWeek.getMonth() !== lastDay.getMonth()) {
-        const nextMonthString = endOfWeek.toISOString().slice(0, 7);
-        let nextUrl = `${API_BASE_URL}/api/generate-roster/${nextMonthString}`;
-        if (templateId) {
-          nextUrl += `?template_id=${templateId}`;
-        }
-        await axios.post(nextUrl);
+      // Whole months are generated in a single request
+      let url = `${API_BASE_URL}/api/generate-roster/range?start=${startMonthString}-01&end=${endMonthString}-${String(endMonthDays).padStart(2, '0')}`;
+      if (templateId) {
+        url += `&template_id=${templateId}`;
       }
+      
+      await axios.post(url);
 
       await fetchRosterData();
     } catch (error) {
@@ -245,6 +231,9 @@ function App() {
       fetchRosterData();
     } catch (error) {
       console.error('Error updating roster entry:', error);
+      if (error.response?.status === 409) {
+        alert(`❌ ${error.response.data.detail.message}`);
+      }
     }
   };
 
@@ -302,6 +291,9 @@ function App() {
       fetchRosterData();
     } catch (error) {
       console.error('Error updating shift time:', error);
+      if (error.response?.status === 409) {
+        alert(`❌ ${error.response.data.detail.message}`);
+      }
     }
   };
 
@@ -484,7 +476,7 @@ function App() {
       fetchRosterData();
     } catch (error) {
       console.error('Error adding shift:', error);
-      alert(`Error adding shift: ${error.response?.data?.detail || error.message}`);
+      alert(`Error adding shift: ${error.response?.data?.detail?.message || error.response?.data?.detail || error.message}`);
     }
   };
 
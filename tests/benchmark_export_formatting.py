@@ -0,0 +1,74 @@
+"""
+Micro-benchmark for export column formatting
+
+Compares the original per-cell lambda formatting with the schema-driven
+formatter in export_services on a synthetic 100k row shift roster.
+
+Run from the repository root:
+    python tests/benchmark_export_formatting.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from export_services import format_export_frame  # noqa: E402
+
+ROWS = 100_000
+REPEATS = 5
+
+
+def build_frame(rows: int) -> pd.DataFrame:
+    """Synthetic roster export frame with realistic shift shapes"""
+    rng = np.random.default_rng(42)
+    hours = rng.choice([5.0, 8.0, 8.0, 8.0, 2.5, 0.0], rows)
+    rates = rng.choice([42.00, 44.50, 48.50, 57.50, 74.00, 88.50], rows)
+    return pd.DataFrame({
+        "employee_name": rng.choice(["Angela", "Rose", "Nox", "Kayla"], rows),
+        "shift_date": "2025-01-01",
+        "hours_worked": hours,
+        "regular_hours": hours,
+        "evening_hours": 0.0,
+        "sleepover_allowance": rng.choice([0.0, 175.0], rows),
+        "hourly_rate": rates,
+        "total_pay": hours * rates,
+    })
+
+
+def legacy_format(df: pd.DataFrame) -> pd.DataFrame:
+    """The substring-matching, per-cell formatting the exporters used before"""
+    df = df.copy()
+    for col in df.columns:
+        if 'pay' in col.lower() or 'rate' in col.lower() or 'deduction' in col.lower() or 'allowance' in col.lower():
+            df[col] = df[col].apply(lambda x: f"${x:.2f}" if pd.notna(x) and x != "" else "$0.00")
+        elif 'hours' in col.lower():
+            df[col] = df[col].apply(lambda x: f"{x:.1f}" if pd.notna(x) and x != "" else "0.0")
+    return df
+
+
+def best_of(func, df: pd.DataFrame) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    frame = build_frame(ROWS)
+    assert legacy_format(frame).to_csv(index=False) == format_export_frame(frame).to_csv(index=False), \
+        "Formatter output differs"
+    
+    legacy = best_of(legacy_format, frame)
+    vectorized = best_of(format_export_frame, frame)
+    
+    print(f"Rows:       {ROWS:,}")
+    print(f"Legacy:     {legacy * 1000:.1f} ms")
+    print(f"Vectorized: {vectorized * 1000:.1f} ms")
+    print(f"Speedup:    {legacy / vectorized:.1f}x")
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Backend modules import each other as top-level modules (server.py runs from
+# the backend directory), so expose that directory to the tests.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
@@ -0,0 +1,85 @@
+from analytics_services import simulate_rate_change
+from pay_services import RateSchedule
+
+
+RATES = {
+    "weekday_day": 42.00,
+    "weekday_evening": 44.50,
+    "weekday_night": 48.50,
+    "saturday": 57.50,
+    "sunday": 74.00,
+    "public_holiday": 88.50,
+}
+
+
+def make_entry(entry_id, date, start, end, total_pay, **fields):
+    entry = {
+        "id": entry_id, "date": date, "start_time": start, "end_time": end,
+        "staff_id": "s1", "staff_name": "Alex", "total_pay": total_pay
+    }
+    entry.update(fields)
+    return entry
+
+
+def test_current_rates_reproduce_stored_pay():
+    entries = [
+        make_entry("day", "2025-01-06", "07:30", "15:30", 336.0),
+        make_entry("evening", "2025-01-06", "15:00", "20:30", 244.75),
+        make_entry("night", "2025-01-07", "23:30", "07:30", 388.0),
+        make_entry("saturday", "2025-01-11", "09:00", "17:00", 460.0),
+        make_entry("holiday", "2025-01-27", "09:00", "13:00", 354.0, is_public_holiday=True),
+        make_entry("manual", "2025-01-08", "09:00", "11:00", 148.0, manual_shift_type="sunday"),
+        make_entry("sleepover", "2025-01-08", "23:30", "07:30", 247.75, is_sleepover=True, wake_hours=3.5),
+    ]
+    
+    result = simulate_rate_change(entries, RATES)
+    
+    assert result["delta"] == 0
+    assert {row["shift_type"] for row in result["by_shift_type"]} == {
+        "weekday_day", "weekday_evening", "weekday_night", "saturday", "public_holiday", "sunday", "sleepover"
+    }
+
+
+def test_deltas_are_broken_down_by_type_and_month():
+    entries = [
+        make_entry("jan", "2025-01-06", "09:00", "17:00", 336.0),
+        make_entry("feb", "2025-02-03", "09:00", "17:00", 336.0, staff_id=None, staff_name=None),
+        make_entry("sunday", "2025-02-02", "09:00", "17:00", 592.0),
+    ]
+    
+    result = simulate_rate_change(entries, dict(RATES, weekday_day=45.0))
+    
+    assert result["delta"] == 48.0
+    assert {row["month"]: row["delta"] for row in result["by_month"]} == {"2025-01": 24.0, "2025-02": 24.0}
+    assert {row["staff_id"]: row["delta"] for row in result["by_staff"]} == {"s1": 24.0, "unassigned": 24.0}
+
+
+def test_segmented_pay_mode_splits_shifts_across_rate_bands():
+    entries = [
+        make_entry("evening", "2025-01-06", "15:00", "20:30", 232.25),
+        make_entry("overnight", "2025-01-07", "23:30", "07:30", 376.25),
+        make_entry("into_saturday", "2025-01-10", "22:00", "02:00", 204.0),
+        make_entry("into_holiday", "2025-01-26", "22:00", "02:00", 325.0),
+        make_entry("manual", "2025-01-08", "09:00", "11:00", 148.0, manual_shift_type="sunday"),
+    ]
+    
+    unchanged = simulate_rate_change(entries, RATES, segmented=True, holiday_dates=["2025-01-27"])
+    assert unchanged["delta"] == 0
+    
+    result = simulate_rate_change(entries, dict(RATES, weekday_night=50.5), segmented=True, holiday_dates=["2025-01-27"])
+    assert result["delta"] == 12.0
+
+
+def test_candidate_rates_override_the_version_in_force_on_each_date():
+    schedule = RateSchedule(RATES, [{"effective_from": "2025-02-01", "rates": {"weekday_day": 45.0}}])
+    entries = [
+        make_entry("jan", "2025-01-06", "09:00", "17:00", 336.0),
+        make_entry("feb", "2025-02-03", "09:00", "17:00", 360.0),
+        make_entry("feb_sunday", "2025-02-02", "09:00", "17:00", 592.0),
+    ]
+    
+    assert simulate_rate_change(entries, {}, rate_schedule=schedule)["delta"] == 0
+    
+    result = simulate_rate_change(entries, {"sunday": 75.0}, rate_schedule=schedule)
+    assert result["delta"] == 8.0
+    assert {row["month"]: row["delta"] for row in result["by_month"]} == {"2025-01": 0.0, "2025-02": 8.0}
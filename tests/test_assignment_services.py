@@ -0,0 +1,76 @@
+from assignment_services import ShiftAssignmentSolver
+
+
+STAFF = [{"id": "s1", "name": "Alex"}, {"id": "s2", "name": "Sam"}]
+
+
+def make_entry(entry_id, date, start, end, staff_id=None):
+    return {"id": entry_id, "date": date, "start_time": start, "end_time": end, "staff_id": staff_id}
+
+
+def test_solver_keeps_rest_gap_and_avoids_double_booking():
+    assigned = [make_entry("late", "2025-01-06", "15:30", "23:30", staff_id="s1")]
+    open_shifts = [
+        make_entry("early", "2025-01-07", "09:00", "17:00"),
+        make_entry("overlap", "2025-01-06", "20:00", "23:00"),
+    ]
+    
+    solver = ShiftAssignmentSolver(STAFF, assigned, "2025-01-06", "2025-01-12")
+    result = solver.solve(open_shifts)
+    
+    assert {a["entry_id"]: a["staff_id"] for a in result["assignments"]} == {"overlap": "s2", "early": "s2"}
+    assert result["unfilled"] == []
+
+
+def test_solver_balances_hours_and_respects_availability():
+    open_shifts = [make_entry(f"day{day}", f"2025-01-{day:02d}", "09:00", "17:00") for day in range(6, 10)]
+    
+    solver = ShiftAssignmentSolver(STAFF, [], "2025-01-06", "2025-01-12")
+    result = solver.solve(open_shifts)
+    assert result["staff_hours"] == {"s1": 16.0, "s2": 16.0}
+    
+    unavailable = ShiftAssignmentSolver(STAFF, [], "2025-01-06", "2025-01-12", availability=lambda staff_id, start, end: staff_id == "s1")
+    result = unavailable.solve(open_shifts)
+    assert {a["staff_id"] for a in result["assignments"]} == {"s1"}
+
+
+def test_solver_leaves_shifts_open_past_the_weekly_cap():
+    open_shifts = [make_entry(f"day{day}", f"2025-01-{day:02d}", "07:00", "19:00") for day in range(6, 10)]
+    
+    solver = ShiftAssignmentSolver(STAFF[:1], [], "2025-01-06", "2025-01-12")
+    result = solver.solve(open_shifts)
+    
+    assert result["stats"]["assigned"] == 3
+    assert [shift["entry_id"] for shift in result["unfilled"]] == ["day9"]
+
+
+def test_place_checks_a_chosen_assignment_against_every_constraint():
+    assigned = [make_entry("late", "2025-01-06", "15:30", "23:30", staff_id="s1")]
+    solver = ShiftAssignmentSolver(
+        STAFF, assigned, "2025-01-06", "2025-01-12",
+        availability=lambda staff_id, start, end: staff_id != "s2"
+    )
+    
+    assert solver.place("s1", make_entry("early", "2025-01-07", "07:00", "15:00")) == "Rest gap to another shift is too short"
+    assert solver.place("s1", make_entry("overlap", "2025-01-06", "20:00", "23:00")) == "Overlaps another shift"
+    assert solver.place("s2", make_entry("day", "2025-01-08", "09:00", "17:00")) == "Staff member is unavailable or on leave"
+    assert solver.place("s9", make_entry("day", "2025-01-08", "09:00", "17:00")) == "Staff member not found or inactive"
+    
+    assert solver.place("s1", make_entry("wed", "2025-01-08", "07:00", "19:00")) is None
+    assert solver.place("s1", make_entry("thu", "2025-01-09", "07:00", "19:00")) is None
+    assert solver.place("s1", make_entry("fri", "2025-01-10", "07:00", "19:00")) == "Exceeds the weekly hours cap"
+
+
+def test_solver_fills_the_weekly_cap_to_the_minute():
+    # 28 hours of 20-minute shifts plus 9h50m leaves exactly 10 minutes under the cap
+    assigned = [
+        make_entry(f"short{day}-{slot}", f"2025-01-{day:02d}", f"{8 + slot // 3:02d}:{slot % 3 * 20:02d}",
+                   f"{8 + (slot + 1) // 3:02d}:{(slot + 1) % 3 * 20:02d}", staff_id="s1")
+        for day in range(6, 10) for slot in range(21)
+    ] + [make_entry("long", "2025-01-10", "07:00", "16:50", staff_id="s1")]
+    
+    solver = ShiftAssignmentSolver(STAFF[:1], assigned, "2025-01-06", "2025-01-12")
+    
+    assert solver.place("s1", make_entry("over", "2025-01-12", "08:00", "08:20")) == "Exceeds the weekly hours cap"
+    assert solver.place("s1", make_entry("fits", "2025-01-12", "08:00", "08:10")) is None
+    assert solver.solve([])["staff_hours"] == {"s1": 38.0}
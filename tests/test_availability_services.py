@@ -0,0 +1,37 @@
+import random
+
+from availability_services import AvailabilityIndex, merge_intervals, parse_availability_time
+
+
+def test_bare_end_date_covers_the_whole_day():
+    start = parse_availability_time("2025-01-06")
+    end = parse_availability_time("2025-01-10", is_end=True)
+    
+    assert end - start == 5 * 24 * 60
+    assert parse_availability_time("2025-01-06 09:30") == start + 9 * 60 + 30
+
+
+def test_merge_intervals_joins_overlapping_and_touching_periods():
+    assert merge_intervals([(50, 60), (0, 10), (10, 20), (15, 30)]) == [(0, 30), (50, 60)]
+
+
+def test_free_matrix_matches_single_lookups():
+    rng = random.Random(7)
+    staff_ids = [f"s{i}" for i in range(6)]
+    index = AvailabilityIndex()
+    unavailable = {staff_id: [] for staff_id in staff_ids}
+    for staff_id in staff_ids[:-1]:
+        starts = [rng.randrange(0, 10000) for _ in range(20)]
+        unavailable[staff_id] = [(start, start + rng.randrange(1, 600)) for start in starts]
+        index.set_intervals(staff_id, unavailable[staff_id])
+    
+    ranges = [(start, start + rng.randrange(1, 600)) for start in (rng.randrange(0, 10000) for _ in range(200))]
+    free = index.free_staff(staff_ids, ranges)
+    
+    for (start, end), free_ids in zip(ranges, free):
+        expected = [
+            staff_id for staff_id in staff_ids
+            if not any(busy_start < end and busy_end > start for busy_start, busy_end in unavailable[staff_id])
+        ]
+        assert free_ids == expected
+        assert [staff_id for staff_id in staff_ids if index.is_available(staff_id, start, end)] == expected
@@ -0,0 +1,218 @@
+import asyncio
+import io
+from datetime import date
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from export_services import (
+    CURRENCY_COLUMN,
+    HOURS_COLUMN,
+    OVERTIME_FIELDS,
+    ExportService,
+    format_export_frame,
+    get_export_column_kind,
+)
+
+
+def test_column_kinds_match_on_suffix():
+    assert get_export_column_kind("total_pay") == CURRENCY_COLUMN
+    assert get_export_column_kind("hourly_rate") == CURRENCY_COLUMN
+    assert get_export_column_kind("deductions") == CURRENCY_COLUMN
+    assert get_export_column_kind("hours_worked") == HOURS_COLUMN
+    assert get_export_column_kind("overtime_hours") == HOURS_COLUMN
+    assert get_export_column_kind("pay_period_start") is None
+    assert get_export_column_kind("employee_name") is None
+
+
+def test_format_export_frame_formats_values_and_blanks():
+    df = pd.DataFrame({
+        "total_pay": [336.0, None, 222.5],
+        "hours_worked": [8, 5.25, ""],
+        "pay_period_start": ["2025-01-01"] * 3,
+    })
+    
+    formatted = format_export_frame(df)
+    
+    assert list(formatted["total_pay"]) == ["$336.00", "$0.00", "$222.50"]
+    assert list(formatted["hours_worked"]) == ["8.0", "5.2", "0.0"]
+    assert list(formatted["pay_period_start"]) == ["2025-01-01"] * 3
+
+
+def test_generate_excel_content_keeps_amounts_numeric():
+    service = ExportService(db=None)
+    content = service.generate_excel_content({
+        "Pay Summary": [
+            {"employee_name": "Angela", "pay_period_start": "2025-01-01", "gross_pay": 336.0, "total_hours": 8.0}
+        ]
+    })
+    
+    sheet = load_workbook(io.BytesIO(content))["Pay Summary"]
+    
+    assert sheet["B2"].value == "2025-01-01"
+    assert sheet["C2"].value == 336.0
+    assert sheet["C2"].number_format == '"$"0.00'
+    assert sheet["D2"].number_format == "0.0"
+    assert sheet["A1"].font.bold
+
+
+class _FakeCursor:
+    """Just enough of a Motor cursor for the export reads"""
+    
+    def __init__(self, documents):
+        self.documents = documents
+    
+    def sort(self, key, direction):
+        self.documents = sorted(self.documents, key=lambda document: document[key], reverse=direction < 0)
+        return self
+    
+    def batch_size(self, size):
+        return self
+    
+    async def to_list(self, length):
+        return list(self.documents)
+    
+    def __aiter__(self):
+        return self._iterate()
+    
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class _FakeCollection:
+    def __init__(self, documents, totals=None):
+        self.documents = documents
+        self.totals = totals or []
+        self.projections = []
+        self.aggregations = 0
+    
+    def find(self, query=None, projection=None):
+        self.projections.append(projection)
+        documents = self.documents
+        date_filter = (query or {}).get("date")
+        if date_filter:
+            documents = [
+                document for document in documents
+                if date_filter.get("$gte", "") <= document["date"] <= date_filter.get("$lte", "9999")
+            ]
+        return _FakeCursor(documents)
+
+    def aggregate(self, pipeline):
+        self.aggregations += 1
+        return _FakeCursor(self.totals)
+
+
+class _FakeDatabase:
+    def __init__(self, roster, staff, totals=None):
+        self.roster = _FakeCollection(roster, totals)
+        self.staff = _FakeCollection(staff)
+
+
+async def _collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+def _read_parquet(content):
+    import pyarrow.parquet as pq
+    
+    return pq.read_table(io.BytesIO(content))
+
+
+def test_shift_roster_parquet_round_trip():
+    import pyarrow as pa
+    
+    roster = [
+        {
+            "id": f"r{day}", "date": f"2025-01-0{day}", "staff_name": "Angela", "start_time": "09:00",
+            "end_time": "17:00", "shift_type": "weekday_day", "hours_worked": 8.0,
+            "base_pay": 336.0, "total_pay": 336.0, "total_pay_cents": 33600
+        }
+        for day in (3, 1, 2)
+    ]
+    roster.append({
+        "id": "r9", "date": "2025-02-01", "staff_name": None, "start_time": "21:00", "end_time": "07:00",
+        "is_sleepover": True, "sleepover_allowance": 175.0, "total_pay": 175.0
+    })
+    service = ExportService(_FakeDatabase(roster, [{"id": "s1", "name": "Angela", "department": "Care"}]))
+    
+    table = _read_parquet(asyncio.run(_collect(service.stream_shift_roster_parquet(
+        start_date=date(2025, 1, 1), end_date=date(2025, 1, 31), batch_size=2
+    ))))
+    
+    assert table.num_rows == 3
+    assert table.schema.field("shift_date").type == pa.date32()
+    assert table.schema.field("total_pay_cents").type == pa.int64()
+    assert pa.types.is_dictionary(table.schema.field("employee_name").type)
+    rows = table.to_pylist()
+    assert [row["entry_id"] for row in rows] == ["r1", "r2", "r3"]
+    assert rows[0]["shift_date"] == date(2025, 1, 1)
+    assert rows[0]["employee_id"] == "s1"
+    assert rows[0]["department"] == "Care"
+    assert rows[0]["total_pay_cents"] == 33600
+    assert rows[0]["base_pay_cents"] == 33600
+    assert rows[0]["hours_worked"] == 8.0
+    
+    sleepover = _read_parquet(asyncio.run(
+        _collect(service.stream_shift_roster_parquet(start_date=date(2025, 2, 1)))
+    )).to_pylist()
+    assert sleepover[0]["is_sleepover"] is True
+    assert sleepover[0]["employee_id"] is None
+    assert sleepover[0]["sleepover_allowance_cents"] == 17500
+
+
+def test_pay_summary_parquet_round_trip():
+    import pyarrow as pa
+    
+    service = ExportService(db=None)
+    
+    async def pay_summary(start, end):
+        return [{
+            "employee_id": "s1", "employee_name": "Angela",
+            "regular_hours": 30.0, "evening_hours": 4.5, "night_hours": 0.0, "saturday_hours": 0.0,
+            "sunday_hours": 0.0, "public_holiday_hours": 0.0, "total_hours": 34.5, "overtime_hours": 0.0,
+            "regular_rate": 42.00, "overtime_rate": 63.00, "gross_pay": 1460.25,
+            "deductions": 219.04, "net_pay": 1241.21, "shift_count": 5
+        }]
+    
+    service.get_pay_summary_data = pay_summary
+    table = _read_parquet(asyncio.run(service.generate_pay_summary_parquet(date(2025, 1, 1), date(2025, 1, 14))))
+    
+    assert table.schema.field("pay_period_start").type == pa.date32()
+    assert table.schema.field("gross_pay_cents").type == pa.int64()
+    assert table.schema.field("total_hours").type == pa.float64()
+    assert table.schema.field("shift_count").type == pa.int32()
+    row = table.to_pylist()[0]
+    assert row["pay_period_end"] == date(2025, 1, 14)
+    assert row["gross_pay_cents"] == 146025
+    assert row["deductions_cents"] == 21904
+    assert row["net_pay_cents"] == 124121
+    assert row["evening_hours"] == 4.5
+    assert row["shift_count"] == 5
+
+
+def test_pay_summary_reads_only_overtime_fields_and_reuses_totals():
+    # Six 8-hour days from Monday; a period starting Friday gets the 10 hours above 38
+    roster = [
+        {"id": f"r{day}", "date": f"2025-01-{day:02d}", "staff_name": "Angela", "start_time": "07:30", "end_time": "15:30"}
+        for day in range(6, 12)
+    ]
+    totals = [{
+        "_id": "Angela", "regular_minutes": 16 * 60, "evening_minutes": 0, "night_minutes": 0,
+        "saturday_minutes": 0, "sunday_minutes": 0, "public_holiday_minutes": 0,
+        "total_pay_cents": 67200, "shift_count": 2
+    }]
+    db = _FakeDatabase(roster, [{"id": "s1", "name": "Angela"}], totals)
+    service = ExportService(db)
+    
+    summary = asyncio.run(service.get_pay_summary_data(date(2025, 1, 10), date(2025, 1, 11)))
+    
+    assert set(db.roster.projections[-1]) == {"_id", *OVERTIME_FIELDS}
+    assert summary[0]["total_hours"] == 16.0
+    assert summary[0]["overtime_hours"] == 10.0
+    assert summary[0]["gross_pay"] == 672.0
+    
+    asyncio.run(service.get_pay_summary_data(
+        date(2025, 1, 10), date(2025, 1, 11), roster_data=roster, staff_by_name={}, staff_totals=totals
+    ))
+    assert db.roster.aggregations == 1
@@ -0,0 +1,197 @@
+from pay_services import (
+    RateSchedule, RateTimeline, entry_bucket_minutes, entry_cents, hour_buckets, minute_buckets, pay_cents, rate_timeline,
+    summarize_roster_pay
+)
+
+
+RATES = {
+    "weekday_day": 42.00,
+    "weekday_evening": 44.50,
+    "weekday_night": 48.50,
+    "saturday": 57.50,
+    "sunday": 74.00,
+    "public_holiday": 88.50,
+}
+
+FRIDAY, SUNDAY = 4, 6
+
+
+def test_shift_is_split_across_weekday_bands():
+    timeline = RateTimeline(RATES)
+    
+    # Monday 05:00-21:00: one hour night, 14 hours day, one hour evening
+    assert timeline.price(0, 5 * 60, 21 * 60) == 4850 + 14 * 4200 + 4450
+    assert timeline.segment_minutes(0, 5 * 60, 21 * 60) == {
+        "weekday_night": 60, "weekday_day": 14 * 60, "weekday_evening": 60
+    }
+
+
+def test_overnight_shift_is_split_at_midnight():
+    timeline = RateTimeline(RATES)
+    
+    # Friday 23:30 to Saturday 07:30
+    assert timeline.price(FRIDAY, 23 * 60 + 30, 31 * 60 + 30) == 2225 + 43125
+    # Sunday night running into a public holiday
+    assert timeline.price(SUNDAY, 22 * 60, 30 * 60, next_day_public_holiday=True) == 2 * 7400 + 6 * 8850
+    assert timeline.segment_minutes(SUNDAY, 22 * 60, 30 * 60, next_day_public_holiday=True) == {
+        "sunday": 120, "public_holiday": 360
+    }
+
+
+def test_segment_minutes_fill_minute_buckets():
+    buckets = minute_buckets(RateTimeline(RATES).segment_minutes(FRIDAY, 22 * 60, 30 * 60))
+    
+    assert buckets == {
+        "regular_minutes": 0, "evening_minutes": 120, "night_minutes": 0,
+        "saturday_minutes": 360, "sunday_minutes": 0, "public_holiday_minutes": 0
+    }
+    assert hour_buckets(buckets) == {
+        "regular_hours": 0.0, "evening_hours": 2.0, "night_hours": 0.0,
+        "saturday_hours": 6.0, "sunday_hours": 0.0, "public_holiday_hours": 0.0
+    }
+
+
+def test_entry_bucket_minutes_fall_back_to_hour_fields():
+    assert entry_bucket_minutes({"evening_minutes": 90, "evening_hours": 1.5}, "evening") == 90
+    assert entry_bucket_minutes({"evening_hours": 1.25}, "evening") == 75
+    assert entry_bucket_minutes({}, "evening") == 0
+
+
+def test_public_holiday_overrides_the_whole_day():
+    timeline = RateTimeline(RATES)
+    
+    assert timeline.price(0, 9 * 60, 17 * 60, is_public_holiday=True) == 8 * 8850
+
+
+def test_pay_is_rounded_half_up_to_the_cent():
+    # 7 minutes at $44.50 is 519.1666 cents; 3 minutes at $42.50 is exactly 212.5
+    assert pay_cents(7, 4450) == 519
+    assert pay_cents(3, 4250) == 213
+    assert RateTimeline(RATES).price(0, 20 * 60, 20 * 60 + 7) == 519
+
+
+def test_entry_cents_falls_back_to_dollar_fields():
+    assert entry_cents({"total_pay_cents": 33601, "total_pay": 336.0}, "total_pay") == 33601
+    assert entry_cents({"total_pay": 222.5}, "total_pay") == 22250
+    assert entry_cents({}, "total_pay") == 0
+
+
+def test_timeline_is_shared_per_rate_table():
+    assert rate_timeline(dict(RATES)) is rate_timeline(dict(RATES))
+    assert rate_timeline({**RATES, "saturday": 60.00}) is not rate_timeline(RATES)
+
+
+def test_rate_schedule_picks_version_by_shift_date():
+    schedule = RateSchedule(RATES, [
+        {"effective_from": "2026-01-01", "rates": {"saturday": 62.00}},
+        {"effective_from": "2025-07-01", "rates": {"weekday_day": 45.00}},
+    ])
+    
+    assert schedule.rates_for("2025-06-30")["weekday_day"] == 42.00
+    assert schedule.rates_for("2025-07-01")["weekday_day"] == 45.00
+    assert schedule.rates_for("2026-03-01")["saturday"] == 62.00
+    assert schedule.rates_for("2026-03-01")["weekday_day"] == 45.00
+    assert len(set(schedule.version_keys)) == 3
+
+
+def test_rate_schedule_periods_split_at_effective_dates():
+    schedule = RateSchedule(RATES, [{"effective_from": "2025-07-01", "rates": {"weekday_day": 45.00}}])
+    
+    assert schedule.periods("2025-01-01", "2025-12-31") == [
+        ("2025-01-01", "2025-06-30", 0), ("2025-07-01", "2025-12-31", 1)
+    ]
+    assert schedule.periods("2025-08-01", "2025-08-31") == [("2025-08-01", "2025-08-31", 1)]
+
+
+def test_version_key_follows_the_effective_rates():
+    before = RateSchedule(RATES, [{"effective_from": "2025-07-01", "rates": {"weekday_day": 45.00}}])
+    after = RateSchedule({**RATES, "weekday_day": 43.00}, [{"effective_from": "2025-07-01", "rates": {"weekday_day": 45.00}}])
+    
+    # The base table changed; the July version overrides that rate, so it did not
+    assert before.version_keys[0] != after.version_keys[0]
+    assert before.version_keys[1] == after.version_keys[1]
+
+
+def test_version_key_follows_the_pay_mode():
+    default = RateSchedule(RATES)
+    schads = RateSchedule(RATES, pay_mode="schads")
+    
+    assert default.version_keys[0] != schads.version_keys[0]
+    assert RateSchedule(dict(RATES), pay_mode="schads").version_keys == schads.version_keys
+
+
+def _matches(entry, query):
+    """Evaluate the comparison operators a stale period query uses"""
+    operators = {"$gte": lambda value, bound: value >= bound, "$lte": lambda value, bound: value <= bound,
+                 "$ne": lambda value, other: value != other}
+    return all(
+        all(operators[op](entry.get(field), operand) for op, operand in condition.items())
+        for field, condition in query.items()
+    )
+
+
+def stale_periods(schedule, entries, start, end, force=False):
+    """Periods a pay recalculation reprices, with the entries its queries read"""
+    return [
+        (first, last, sorted(entry["id"] for entry in entries if _matches(entry, query)))
+        for first, last, version, query in schedule.stale_queries(start, end, force)
+    ]
+
+
+def test_incremental_recalculation_skips_periods_priced_under_their_version():
+    priced_under = RateSchedule(RATES, [{"effective_from": "2025-07-01", "rates": {"weekday_day": 45.00}}])
+    entries = [
+        {"id": date_str, "date": date_str, "rate_version": priced_under.version_keys[priced_under.version_index(date_str)]}
+        for date_str in ["2025-03-03", "2025-07-07", "2025-10-06", "2026-01-05"]
+    ]
+    
+    assert stale_periods(priced_under, entries, "2025-01-01", "2026-01-31") == [
+        ("2025-01-01", "2025-06-30", []), ("2025-07-01", "2026-01-31", [])
+    ]
+    
+    # A later version only invalidates the entries from its effective date
+    added = RateSchedule(RATES, [
+        {"effective_from": "2025-07-01", "rates": {"weekday_day": 45.00}},
+        {"effective_from": "2025-10-01", "rates": {"saturday": 60.00}},
+    ])
+    assert stale_periods(added, entries, "2025-01-01", "2026-01-31") == [
+        ("2025-01-01", "2025-06-30", []),
+        ("2025-07-01", "2025-09-30", []),
+        ("2025-10-01", "2026-01-31", ["2025-10-06", "2026-01-05"]),
+    ]
+    
+    # Switching the pay mode invalidates every period
+    switched = RateSchedule(RATES, [{"effective_from": "2025-07-01", "rates": {"weekday_day": 45.00}}], pay_mode="schads")
+    assert stale_periods(switched, entries, "2025-01-01", "2026-01-31") == [
+        ("2025-01-01", "2025-06-30", ["2025-03-03"]),
+        ("2025-07-01", "2026-01-31", ["2025-07-07", "2025-10-06", "2026-01-05"]),
+    ]
+    
+    # Forcing reads every entry, whatever it was priced under
+    assert stale_periods(priced_under, entries, "2025-01-01", "2026-01-31", force=True) == [
+        ("2025-01-01", "2025-06-30", ["2025-03-03"]),
+        ("2025-07-01", "2026-01-31", ["2025-07-07", "2025-10-06", "2026-01-05"]),
+    ]
+
+
+def test_roster_pay_summary_totals_per_day_and_shift_type():
+    entries = [
+        {"date": "2025-01-07", "shift_type": "weekday_day", "minutes_worked": 480, "total_pay_cents": 33600},
+        {"date": "2025-01-06", "shift_type": "weekday_day", "minutes_worked": 480, "total_pay_cents": 33600},
+        {"date": "2025-01-06", "shift_type": "weekday_evening", "minutes_worked": 20, "total_pay_cents": 1483},
+        # Stored before minutes and cents were kept
+        {"date": "2025-01-06", "shift_type": "sleepover", "hours_worked": 8.0, "total_pay": 175.0},
+    ]
+    
+    summary = summarize_roster_pay(entries)
+    
+    assert summary["entries_generated"] == 4
+    assert summary["total_hours"] == 24.33
+    assert summary["total_pay"] == 861.83
+    assert summary["by_day"] == [
+        {"date": "2025-01-06", "shifts": 3, "hours": 16.33, "pay": 525.83},
+        {"date": "2025-01-07", "shifts": 1, "hours": 8.0, "pay": 336.0},
+    ]
+    assert summary["by_shift_type"]["weekday_day"] == {"shifts": 2, "hours": 16.0, "pay": 672.0}
+    assert summary["by_shift_type"]["sleepover"] == {"shifts": 1, "hours": 8.0, "pay": 175.0}
+    assert summarize_roster_pay([])["by_day"] == []
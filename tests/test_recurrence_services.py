@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+
+import pytest
+
+from pay_services import RateSchedule
+from recurrence_services import (
+    DAY_NAMES,
+    TEMPLATE_SHIFT_FIELDS,
+    CompiledRotation,
+    compile_template_weekday_table,
+    forecast_weekly_pattern,
+    template_pattern_summary,
+    template_shifts_by_date,
+    weekday_counts,
+)
+
+
+def shift(cycle_day, start="07:30", end="15:30", **fields):
+    return {"cycle_day": cycle_day, "start_time": start, "end_time": end, **fields}
+
+
+def test_expansion_follows_the_cycle_from_the_anchor():
+    rotation = CompiledRotation(
+        14, "2025-01-06",
+        [shift(0), shift(3, "22:00", "06:00"), shift(13, shifts_per_day=2)]
+    )
+    
+    expanded = rotation.expand(date(2025, 1, 1), date(2025, 1, 31))
+    
+    # Days before the anchor sit at the end of the previous cycle
+    assert [day for day, _ in expanded] == [
+        "2025-01-05", "2025-01-05", "2025-01-06", "2025-01-09",
+        "2025-01-19", "2025-01-19", "2025-01-20", "2025-01-23"
+    ]
+    assert expanded[3][1]["start_time"] == "22:00"
+
+
+def test_exceptions_replace_the_cycle_day():
+    rotation = CompiledRotation(
+        7, "2025-01-06",
+        [shift(0), shift(1)],
+        exceptions=[
+            {"date": "2025-01-06", "shifts": []},
+            {"date": "2025-01-07", "shifts": [{"start_time": "10:00", "end_time": "14:00"}]},
+        ]
+    )
+    
+    expanded = rotation.expand(date(2025, 1, 6), date(2025, 1, 14))
+    
+    assert [(day, entry["start_time"]) for day, entry in expanded] == [
+        ("2025-01-07", "10:00"), ("2025-01-13", "07:30"), ("2025-01-14", "07:30")
+    ]
+
+
+def test_vectorized_expansion_matches_day_by_day():
+    shifts = [shift(day % 21, shifts_per_day=day % 3 + 1) for day in range(0, 40, 3)]
+    rotation = CompiledRotation(21, "2024-03-13", shifts)
+    start, end = date(2024, 1, 1), date(2025, 12, 31)
+    
+    ordinals, indexes = rotation.expand_arrays(start, end)
+    
+    expected = []
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        cycle_day = (day - date(2024, 3, 13)).days % 21
+        for entry in shifts:
+            if entry["cycle_day"] == cycle_day:
+                expected.extend([(day.toordinal(), entry)] * entry["shifts_per_day"])
+    assert [(ordinal, rotation.shifts[index]) for ordinal, index in zip(ordinals.tolist(), indexes.tolist())] == expected
+
+
+def test_cycle_day_outside_cycle_is_rejected():
+    with pytest.raises(ValueError):
+        CompiledRotation(7, "2025-01-06", [shift(7)])
+
+
+def test_weekday_counts_cover_partial_weeks():
+    # 10 days from Wednesday: two of Wednesday-Friday, one of every other day
+    assert weekday_counts(date(2025, 1, 1), 10) == [1, 1, 2, 2, 2, 1, 1]
+    assert sum(weekday_counts(date(2025, 1, 1), 365)) == 365
+
+
+def test_weekly_forecast_matches_pricing_every_day():
+    # A rate version from mid-April, Good Friday to Easter Monday, Anzac Day,
+    # and a holiday the day after the range ends
+    schedule = RateSchedule({"weekday_day": 42.00}, [{"effective_from": "2025-04-10", "rates": {"weekday_day": 45.00}}])
+    holidays = {date(2025, 4, 18), date(2025, 4, 21), date(2025, 4, 25), date(2025, 5, 21)}
+    start, end = date(2025, 3, 15), date(2025, 5, 20)
+    
+    def price_day(date_str, is_holiday, next_day_holiday):
+        weekday = date.fromisoformat(date_str).weekday()
+        rate_cents = int(schedule.rates_for(date_str)["weekday_day"] * 100)
+        shifts = 1 + weekday % 2
+        cents = shifts * (rate_cents * (2 if is_holiday else 1) + (500 if next_day_holiday else 0))
+        return shifts, shifts * 480, cents
+    
+    by_weekday, months = forecast_weekly_pattern(start, end, holidays, schedule, price_day)
+    
+    expected_weekdays = {name: {"days": 0, "public_holidays": 0, "shifts": 0, "hours": 0, "pay": 0} for name in DAY_NAMES}
+    expected_months = {}
+    day = start
+    while day <= end:
+        shifts, minutes, cents = price_day(day.isoformat(), day in holidays, day + timedelta(days=1) in holidays)
+        weekday = expected_weekdays[DAY_NAMES[day.weekday()]]
+        weekday["days"] += 1
+        weekday["public_holidays"] += day in holidays
+        month = expected_months.setdefault(day.strftime("%Y-%m"), {"month": day.strftime("%Y-%m"), "shifts": 0, "hours": 0, "pay": 0})
+        for totals in (weekday, month):
+            totals["shifts"] += shifts
+            totals["hours"] += minutes
+            totals["pay"] += cents
+        day += timedelta(days=1)
+    
+    assert by_weekday == expected_weekdays
+    assert months == list(expected_months.values())
+    assert by_weekday["Friday"]["public_holidays"] == 2
+
+
+def template_shift(day_of_week, start="07:30", end="15:30", **fields):
+    return {
+        "day_of_week": day_of_week, "start_time": start, "end_time": end, "is_sleepover": False,
+        "manual_shift_type": None, "manual_hourly_rate": None, "manual_sleepover": None, "wake_hours": None,
+        **fields
+    }
+
+
+def test_legacy_template_duplicates_compile_like_the_deduplicated_template():
+    # Templates saved before deduplication hold one config per source roster entry
+    legacy = [template_shift(0)] * 4 + [template_shift(0, "15:00", "23:00")] * 4 + [template_shift(5)] * 2
+    deduplicated = [
+        template_shift(0, shifts_per_day=1, occurrences=4),
+        template_shift(0, "15:00", "23:00", shifts_per_day=1, occurrences=4),
+        template_shift(5, shifts_per_day=1, occurrences=2),
+    ]
+    
+    def fields(table):
+        return [[{field: shift[field] for field in TEMPLATE_SHIFT_FIELDS} for shift in day] for day in table]
+    
+    assert fields(compile_template_weekday_table(legacy)) == fields(compile_template_weekday_table(deduplicated))
+    assert template_pattern_summary(legacy) == template_pattern_summary(deduplicated) == {"Monday": 2, "Saturday": 1}
+
+
+def test_deduplicated_template_repeats_shifts_per_day():
+    template = {"shifts": [template_shift(0, shifts_per_day=3), template_shift(2, "22:00", "06:00", shifts_per_day=1)]}
+    
+    dated = template_shifts_by_date(template, date(2025, 1, 6), date(2025, 1, 19))
+    
+    assert [day for day, _ in dated] == [
+        "2025-01-06", "2025-01-06", "2025-01-06", "2025-01-08",
+        "2025-01-13", "2025-01-13", "2025-01-13", "2025-01-15"
+    ]
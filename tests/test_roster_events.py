@@ -0,0 +1,232 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from roster_events import (
+    RosterEventBroker,
+    _change_to_event,
+    build_bulk_event,
+    build_delete_event,
+    build_replay_event,
+    build_upsert_event,
+    collect_roster_changes,
+    committed_seq_limit,
+    parse_roster_resume_token,
+)
+
+
+ENTRY = {
+    "_id": "oid", "id": "e1", "date": "2025-01-06", "start_time": "09:00", "end_time": "17:00",
+    "staff_id": None, "total_pay": 336.0, "updated_seq": 12, "created_seq": 12, "updated_at": "now"
+}
+
+
+def test_publish_from_the_loop_and_from_another_thread():
+    broker = RosterEventBroker()
+    
+    async def scenario():
+        broker.bind_loop(asyncio.get_running_loop())
+        queue = broker.subscribe()
+        
+        broker.publish({"op": "insert", "seq": 1})
+        publisher = threading.Thread(target=broker.publish, args=({"op": "update", "seq": 2},))
+        publisher.start()
+        publisher.join()
+        
+        received = [await asyncio.wait_for(queue.get(), timeout=1) for _ in range(2)]
+        broker.unsubscribe(queue)
+        return received
+    
+    assert asyncio.run(scenario()) == [{"op": "insert", "seq": 1}, {"op": "update", "seq": 2}]
+    assert broker.subscriber_count == 0
+
+
+def test_slow_subscriber_backlog_is_replaced_by_resync():
+    broker = RosterEventBroker(queue_size=2)
+    
+    async def scenario():
+        broker.bind_loop(asyncio.get_running_loop())
+        queue = broker.subscribe()
+        for seq in range(1, 4):
+            broker.publish({"op": "update", "seq": seq})
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+    
+    assert asyncio.run(scenario()) == [{"op": "resync", "seq": 3}]
+
+
+def test_publish_without_a_bound_loop_is_dropped():
+    broker = RosterEventBroker()
+    queue = broker.subscribe()
+    
+    broker.publish({"op": "insert", "seq": 1})
+    
+    assert queue.empty()
+
+
+def test_upsert_events_carry_visible_fields():
+    inserted = build_upsert_event(ENTRY)
+    assert inserted["op"] == "insert"
+    assert inserted["seq"] == 12
+    assert set(inserted["fields"]) == {"id", "date", "start_time", "end_time", "staff_id", "total_pay"}
+    
+    updated = build_upsert_event({**ENTRY, "staff_id": "s1", "updated_seq": 13}, ENTRY)
+    assert updated == {
+        "op": "update", "seq": 13, "id": "e1", "date": "2025-01-06",
+        "fields": {"staff_id": "s1"}, "total_pay": 336.0
+    }
+    
+    assert build_upsert_event({**ENTRY, "updated_seq": 14}, ENTRY) is None
+
+
+def test_replayed_entries_are_inserts_only_when_created_after_since():
+    assert build_replay_event(ENTRY, since=11)["op"] == "insert"
+    assert build_replay_event({**ENTRY, "updated_seq": 20}, since=15)["op"] == "update"
+    assert build_replay_event({key: value for key, value in ENTRY.items() if key != "created_seq"}, since=0)["op"] == "update"
+    assert "created_seq" not in build_replay_event(ENTRY, since=0)["fields"]
+
+
+def test_delete_and_bulk_events():
+    assert build_delete_event({"id": "e1", "date": "2025-01-06", "updated_seq": 20, "deleted": True}) == {
+        "op": "delete", "seq": 20, "id": "e1", "date": "2025-01-06"
+    }
+    
+    assert build_bulk_event([]) is None
+    assert build_bulk_event([
+        {"updated_seq": 31, "date": "2025-02-01"},
+        {"updated_seq": 30, "date": "2025-01-15"},
+    ]) == {"op": "bulk", "seq": 31, "first_seq": 30, "count": 2, "start_date": "2025-01-15", "end_date": "2025-02-01"}
+
+
+def test_change_stream_operations_map_to_events():
+    def change(operation, collection="roster", **extra):
+        return {"ns": {"coll": collection}, "operationType": operation, "fullDocument": ENTRY, **extra}
+    
+    assert _change_to_event(change("insert"))["op"] == "insert"
+    
+    replaced = _change_to_event(change("replace"))
+    assert replaced["op"] == "update"
+    assert replaced["fields"]["start_time"] == "09:00"
+    
+    updated = _change_to_event(change("update", updateDescription={
+        "updatedFields": {"staff_id": "s1", "updated_seq": 13}
+    }))
+    assert updated["op"] == "update"
+    assert updated["fields"] == {"staff_id": "s1"}
+    
+    assert _change_to_event(change("update", updateDescription={"updatedFields": {"updated_at": "later"}})) is None
+    assert _change_to_event(change("insert", collection="roster_tombstones"))["op"] == "delete"
+    assert _change_to_event({"ns": {"coll": "roster"}, "operationType": "delete"}) is None
+
+
+def _matches(document, query):
+    """Evaluate the equality, comparison and $or queries the change feed uses"""
+    operators = {
+        "$gt": lambda value, bound: value is not None and value > bound,
+        "$gte": lambda value, bound: value is not None and value >= bound,
+        "$lt": lambda value, bound: value is not None and value < bound,
+    }
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(_matches(document, option) for option in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(operators[op](document.get(field), operand) for op, operand in condition.items()):
+                return False
+        elif document.get(field) != condition:
+            return False
+    return True
+
+
+class _FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+    
+    def sort(self, key, direction):
+        self.documents = sorted(self.documents, key=lambda document: document[key], reverse=direction < 0)
+        return self
+    
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+    
+    def __iter__(self):
+        return iter(self.documents)
+
+
+class _FakeCollection:
+    """Just enough of a pymongo collection for the change feed reads"""
+    
+    def __init__(self, documents):
+        self.documents = documents
+    
+    def find(self, query=None, projection=None):
+        return _FakeCursor([document for document in self.documents if _matches(document, query or {})])
+    
+    def find_one(self, query=None, sort=None):
+        cursor = self.find(query)
+        for key, direction in sort or []:
+            cursor.sort(key, direction)
+        return next(iter(cursor), None)
+
+
+def test_resume_token_continues_after_the_last_entry():
+    query = parse_roster_resume_token("2025-01-06|b")
+    entries = [
+        {"date": "2025-01-05", "id": "z"}, {"date": "2025-01-06", "id": "a"}, {"date": "2025-01-06", "id": "b"},
+        {"date": "2025-01-06", "id": "c"}, {"date": "2025-01-07", "id": "a"},
+    ]
+    
+    assert [(e["date"], e["id"]) for e in entries if _matches(e, query)] == [("2025-01-06", "c"), ("2025-01-07", "a")]
+    # Entry ids may themselves contain the separator
+    assert parse_roster_resume_token("2025-01-06|a|b")["$or"][1]["id"] == {"$gt": "a|b"}
+
+
+@pytest.mark.parametrize("token", ["", "2025-01-06", "2025-13-01|a", "2025-1-6|a", "20250106|a", "|a"])
+def test_malformed_resume_tokens_are_rejected(token):
+    with pytest.raises(ValueError):
+        parse_roster_resume_token(token)
+
+
+def test_changes_interleave_deletes_and_upserts_by_sequence():
+    roster = _FakeCollection([
+        {"id": f"e{seq}", "date": "2025-01-06", "updated_seq": seq} for seq in (2, 3, 6, 7)
+    ])
+    tombstones = _FakeCollection([
+        {"id": f"d{seq}", "date": "2025-01-06", "updated_seq": seq} for seq in (1, 4, 5)
+    ])
+    
+    feed = collect_roster_changes(roster, tombstones, since=0, limit=10, seq_limit=100)
+    assert [(change["op"], change["seq"]) for change in feed["changes"]] == [
+        ("delete", 1), ("upsert", 2), ("upsert", 3), ("delete", 4), ("delete", 5), ("upsert", 6), ("upsert", 7)
+    ]
+    assert feed["latest_seq"] == 7 and not feed["has_more"]
+    
+    # A page never skips past a change it did not return
+    first = collect_roster_changes(roster, tombstones, since=0, limit=3, seq_limit=100)
+    assert [change["seq"] for change in first["changes"]] == [1, 2, 3]
+    assert first["has_more"]
+    rest = collect_roster_changes(roster, tombstones, since=first["latest_seq"], limit=3, seq_limit=100)
+    assert [change["seq"] for change in rest["changes"]] == [4, 5, 6]
+
+
+def test_open_reservations_hold_back_the_change_feed():
+    now = datetime(2025, 1, 6, 12, 0)
+    counters = _FakeCollection([{"_id": "roster_seq", "seq": 9}])
+    reservations = _FakeCollection([
+        {"_id": "slow", "floor": 5, "reserved_at": now - timedelta(seconds=30)},
+        {"_id": "later", "floor": 8, "reserved_at": now - timedelta(seconds=10)},
+        {"_id": "dead", "floor": 2, "reserved_at": now - timedelta(seconds=600)},
+    ])
+    
+    # The abandoned reservation no longer counts; the oldest live one sets the limit
+    seq_limit = committed_seq_limit(counters, reservations, timeout_seconds=300, now=now)
+    assert seq_limit == 5
+    assert committed_seq_limit(counters, _FakeCollection([]), timeout_seconds=300, now=now) == 10
+    assert committed_seq_limit(_FakeCollection([]), _FakeCollection([]), timeout_seconds=300, now=now) == 1
+    
+    roster = _FakeCollection([{"id": f"e{seq}", "date": "2025-01-06", "updated_seq": seq} for seq in (3, 4, 6, 9)])
+    feed = collect_roster_changes(roster, _FakeCollection([]), since=0, limit=10, seq_limit=seq_limit)
+    assert [change["seq"] for change in feed["changes"]] == [3, 4]
+    assert feed["latest_seq"] == 4
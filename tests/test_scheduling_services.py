@@ -0,0 +1,141 @@
+from scheduling_services import (
+    StaffIntervalIndex,
+    evaluate_staff_compliance,
+    find_new_shift_conflicts,
+    find_roster_conflicts,
+    shift_interval,
+    weekly_overtime_minutes,
+)
+
+
+def make_entry(entry_id, date, start, end, staff_id="s1"):
+    return {"id": entry_id, "date": date, "start_time": start, "end_time": end, "staff_id": staff_id}
+
+
+def test_overnight_shift_crosses_date_boundary():
+    start, end = shift_interval("2025-01-03", "23:30", "07:30")
+    next_start, _ = shift_interval("2025-01-04", "07:00", "15:00")
+    
+    assert end - start == 8 * 60
+    assert next_start < end
+
+
+def test_index_finds_same_day_and_overnight_overlaps():
+    index = StaffIntervalIndex.from_entries([
+        make_entry("shift2", "2025-01-06", "15:00", "20:00"),
+        make_entry("sleepover", "2025-01-06", "23:30", "07:30"),
+        make_entry("other-staff", "2025-01-06", "15:30", "23:30", staff_id="s2"),
+    ])
+    
+    shift3 = make_entry("shift3", "2025-01-06", "15:30", "23:30")
+    morning = make_entry("morning", "2025-01-07", "07:00", "15:00")
+    later = make_entry("later", "2025-01-07", "07:30", "15:30")
+    
+    assert [overlap.entry_id for overlap in index.entry_overlaps(shift3)] == ["shift2"]
+    assert [overlap.entry_id for overlap in index.entry_overlaps(morning)] == ["sleepover"]
+    assert index.entry_overlaps(later) == []
+
+
+def test_index_ignores_the_entry_being_moved():
+    index = StaffIntervalIndex.from_entries([make_entry("a", "2025-01-06", "07:30", "15:30")])
+    
+    assert index.entry_overlaps(make_entry("a", "2025-01-06", "08:00", "16:00")) == []
+    
+    index.remove("a")
+    index.add_entry(make_entry("b", "2025-01-06", "09:00", "10:00"))
+    assert [o.entry_id for o in index.entry_overlaps(make_entry("c", "2025-01-06", "07:30", "15:30"))] == ["b"]
+
+
+def test_find_roster_conflicts_reports_each_pair_once():
+    conflicts = find_roster_conflicts([
+        make_entry("a", "2025-01-06", "07:30", "15:30"),
+        make_entry("b", "2025-01-06", "15:00", "20:00"),
+        make_entry("c", "2025-01-06", "15:30", "23:30"),
+        make_entry("d", "2025-01-06", "15:30", "23:30", staff_id=None),
+    ])
+    
+    pairs = {(conflict["entry_id"], conflict["conflicting_entry_id"]) for conflict in conflicts}
+    assert pairs == {("a", "b"), ("b", "c")}
+    assert {conflict["overlap_minutes"] for conflict in conflicts} == {30, 270}
+
+
+def test_new_shift_conflicts_include_shifts_outside_the_month():
+    existing = [
+        # Already double-booked among themselves; not caused by the new shifts
+        make_entry("old1", "2025-01-31", "07:30", "15:30", staff_id="s2"),
+        make_entry("old2", "2025-01-31", "15:00", "20:00", staff_id="s2"),
+        make_entry("feb", "2025-02-01", "07:00", "15:00"),
+    ]
+    new = [
+        make_entry("night", "2025-01-31", "22:00", "08:00"),
+        make_entry("open", "2025-01-31", "22:00", "08:00", staff_id=None),
+    ]
+    
+    conflicts = find_new_shift_conflicts(new, existing)
+    
+    assert [(c["entry_id"], c["conflicting_entry_id"], c["overlap_minutes"]) for c in conflicts] == [("night", "feb", 60)]
+
+
+def test_compliance_flags_short_breaks_except_around_sleepovers():
+    sleepover = make_entry("sleepover", "2025-01-07", "23:30", "07:30")
+    sleepover["is_sleepover"] = True
+    
+    report = evaluate_staff_compliance([
+        make_entry("late", "2025-01-06", "15:30", "23:30"),
+        make_entry("early", "2025-01-07", "07:30", "15:30"),
+        sleepover,
+        make_entry("after-sleepover", "2025-01-08", "07:30", "15:30"),
+    ])["s1"]
+    
+    assert [(v["previous_entry_id"], v["entry_id"], v["rest_hours"]) for v in report["rest_gap_violations"]] == [
+        ("late", "early", 8.0)
+    ]
+    assert report["ordinary_hours"] == 24.0
+
+
+def test_compliance_totals_hours_per_iso_week():
+    # Monday-Saturday of one ISO week, then the following Monday
+    week = [make_entry(f"d{day}", f"2025-01-{day:02d}", "07:30", "15:30") for day in range(6, 12)]
+    next_week = make_entry("next", "2025-01-13", "07:30", "15:30")
+    
+    report = evaluate_staff_compliance(week + [next_week])["s1"]
+    
+    assert report["weekly_hours"] == {"2025-W02": 48.0, "2025-W03": 8.0}
+    assert report["weekly_cap_violations"] == [{"week": "2025-W02", "hours": 48.0, "overtime_hours": 10.0}]
+    assert weekly_overtime_minutes(week + [next_week]) == 10 * 60
+
+
+def test_weekly_overtime_counts_only_shifts_within_the_period():
+    # 48 hours Monday-Saturday; a period starting on Friday holds the last 16 hours,
+    # of which the 10 above the cap are overtime. A period ending Wednesday holds none.
+    week = [make_entry(f"d{day}", f"2025-01-{day:02d}", "07:30", "15:30") for day in range(6, 12)]
+    
+    assert weekly_overtime_minutes(week, count_from="2025-01-10") == 10 * 60
+    assert weekly_overtime_minutes(week, count_to="2025-01-08") == 0
+    assert weekly_overtime_minutes(week, count_from="2025-01-10", count_to="2025-01-10") == 2 * 60
+
+
+def test_weekly_hours_are_summed_in_whole_minutes():
+    # 28 hours of 20-minute shifts plus a 10h10m shift is 10 minutes over the cap
+    short_shifts = [
+        make_entry(f"short{day}-{slot}", f"2025-01-{day:02d}", f"{8 + slot // 3:02d}:{slot % 3 * 20:02d}",
+                   f"{8 + (slot + 1) // 3:02d}:{(slot + 1) % 3 * 20:02d}")
+        for day in range(6, 10) for slot in range(21)
+    ]
+    long_shift = make_entry("long", "2025-01-11", "07:00", "17:10")
+    
+    report = evaluate_staff_compliance(short_shifts + [long_shift])["s1"]
+    
+    assert weekly_overtime_minutes(short_shifts + [long_shift]) == 10
+    assert report["weekly_cap_violations"] == [{"week": "2025-W02", "hours": 38.17, "overtime_hours": 0.17}]
+
+
+def test_compliance_count_from_only_uses_earlier_shifts_for_rest_gaps():
+    report = evaluate_staff_compliance([
+        make_entry("sunday-late", "2025-01-05", "15:30", "23:30"),
+        make_entry("monday-early", "2025-01-06", "07:30", "15:30"),
+    ], count_from="2025-01-06")["s1"]
+    
+    assert report["shift_count"] == 1
+    assert report["weekly_hours"] == {"2025-W02": 8.0}
+    assert report["rest_gap_violations"][0]["previous_entry_id"] == "sunday-late"